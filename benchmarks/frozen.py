@@ -0,0 +1,71 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Compares attribute reads on the live configuration tree (property calls)
+with reads on the frozen snapshot of ConfigProcessor.freeze().
+
+    python benchmarks/frozen.py [ number ]
+"""
+import os
+import sys
+import timeit
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), '..' ) )
+from saiti import ConfigProcessor, DatabaseConfig
+from saiti.flask import FlaskConfigMixin
+
+
+class ServiceConfig( ConfigProcessor, FlaskConfigMixin ):
+    """A FlaskConfigMixin based class with a nested DatabaseConfig
+    """
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'service', **kwargs )
+        FlaskConfigMixin.__init__( self, **kwargs )
+        self.__database = DatabaseConfig( **kwargs )
+        return
+
+    @property
+    def database( self ) -> DatabaseConfig:
+        return self.__database
+
+
+def main( number: int = 1000000 ):
+    live = ServiceConfig()
+    live.ParseConfig( { 'SECRET_KEY': 'secret', 'DEBUG': True,
+                        'database': { 'engine': 'postgresql', 'database': 'db', 'host': 'localhost',
+                                      'port': 5432 } } )
+    frozen = live.freeze()
+    cases = ( ( 'SECRET_KEY',       lambda cfg: cfg.SECRET_KEY ),
+              ( 'DEBUG',            lambda cfg: cfg.DEBUG ),
+              ( 'database.engine',  lambda cfg: cfg.database.engine ),
+              ( 'database.port',    lambda cfg: cfg.database.port ) )
+    print( "{0:20} {1:>10} {2:>10} {3:>8}".format( 'read', 'live nsec', 'frozen nsec', 'speedup' ) )
+    for label, read in cases:
+        assert read( live ) == read( frozen ), label
+        liveTime    = min( timeit.repeat( lambda: read( live ), number = number, repeat = 3 ) )
+        frozenTime  = min( timeit.repeat( lambda: read( frozen ), number = number, repeat = 3 ) )
+        print( "{0:20} {1:10.1f} {2:10.1f} {3:8.2f}".format( label, liveTime * 1e9 / number,
+                                                            frozenTime * 1e9 / number,
+                                                            liveTime / frozenTime ) )
+
+    freezeTime = min( timeit.repeat( live.freeze, number = 1000, repeat = 3 ) )
+    print( "freeze() {0:.1f} usec, {1} keys".format( freezeTime * 1e6 / 1000, len( frozen ) ) )
+    return
+
+
+if __name__ == '__main__':
+    main( *[ int( arg ) for arg in sys.argv[ 1: ] ] )
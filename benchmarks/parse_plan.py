@@ -0,0 +1,180 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Compares ConfigProcessor.ParseConfig using the per-class parse plan with
+the previous hasattr/getattr based implementation.
+
+    python benchmarks/parse_plan.py [ sections ]
+"""
+import os
+import sys
+import timeit
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), '..' ) )
+from saiti import ConfigProcessor, DatabaseConfig, WebHostConfig, PathList
+
+
+def legacyParseConfig( self, config: dict ) -> None:
+    """The ParseConfig implementation before the parse plan was introduced,
+    kept here as the reference for the benchmark (the import-spec branch is
+    left out as the benchmark does not use it).
+    """
+    translators = self._ConfigProcessor__translators
+    token = self._enterBreadCrum()
+    for key, value in config.items():
+        if key in translators:
+            if not hasattr( self, translators[ key ] ):
+                self._error( "{} has no attr {}".format( self.breadCrumPath(), translators[ key ] ) )
+                continue
+
+        elif not hasattr( self, key ):
+            if not self._ConfigProcessor__wildcard:
+                self._error( "{} has no attr {}".format( self.breadCrumPath(), key ) )
+                continue
+
+        if key in translators:
+            key = translators[ key ]
+
+        if hasattr( self, key ):
+            var = getattr( self, key )
+
+        else:
+            self._ConfigProcessor__wildcards[ key ] = None
+            var = self._ConfigProcessor__wildcardObject( key, **self._ConfigProcessor__wildcardKwargs )
+            setattr( self, key, var )
+
+        if type( value ) in ( bool, int, str, float ):
+            if type( value ) == type( var ) or var is None:
+                setattr( self, key, value )
+
+            else:
+                self._error( "primitive ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
+
+        elif type( value ) in ( tuple, list ):
+            if isinstance( var, list ):
+                for item in value:
+                    var.append( item )
+
+            else:
+                self._error( "array ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
+
+        elif isinstance( var, ConfigProcessor ):
+            var._throw_exception = self._throw_exception
+            legacyParseConfig( var, value )
+
+        else:
+            self._error( "unknown ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
+
+    self._leaveBreadCrum( token )
+    return
+
+
+class ServiceConfig( ConfigProcessor ):
+    def __init__( self, name = 'service', **kwargs ):
+        ConfigProcessor.__init__( self, name, **kwargs )
+        self.__debug        = False
+        self.__workers      = 1
+        self.__title        = ''
+        self.__paths        = PathList( must_exists = False )
+        self.__web          = WebHostConfig( **kwargs )
+        self.__database     = DatabaseConfig( **kwargs )
+        return
+
+    @property
+    def debug( self ) -> bool:
+        return self.__debug
+
+    @debug.setter
+    def debug( self, value: bool ):
+        self.__debug = value
+        return
+
+    @property
+    def workers( self ) -> int:
+        return self.__workers
+
+    @workers.setter
+    def workers( self, value: int ):
+        self.__workers = value
+        return
+
+    @property
+    def title( self ) -> str:
+        return self.__title
+
+    @title.setter
+    def title( self, value: str ):
+        self.__title = value
+        return
+
+    @property
+    def paths( self ) -> PathList:
+        return self.__paths
+
+    @property
+    def web( self ) -> WebHostConfig:
+        return self.__web
+
+    @property
+    def database( self ) -> DatabaseConfig:
+        return self.__database
+
+
+class ServicesConfig( ConfigProcessor ):
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'services', **kwargs )
+        self.setWildcardObject( ServiceConfig, **kwargs )
+        return
+
+
+def makeConfig( sections: int ) -> dict:
+    return { "service{}".format( idx ): { 'debug': True,
+                                          'workers': idx,
+                                          'title': 'Service {}'.format( idx ),
+                                          'paths': [ '/srv/{}'.format( idx ), '/data' ],
+                                          'web': { 'interface': '0.0.0.0', 'port': 8000 + idx },
+                                          'database': { 'engine': 'postgresql',
+                                                        'database': 'db{}'.format( idx ),
+                                                        'username': 'user',
+                                                        'password': 'secret',
+                                                        'host': 'localhost',
+                                                        'port': 5432 } }
+             for idx in range( sections ) }
+
+
+def main( sections: int = 1000, repeat: int = 5 ):
+    config = makeConfig( sections )
+    # every section holds 12 keys
+    print( "sections: {}, keys: {}".format( sections, sections * 12 ) )
+
+    def planned():
+        ServicesConfig( throw_exception = True ).ParseConfig( config )
+
+    def legacy():
+        legacyParseConfig( ServicesConfig( throw_exception = True ), config )
+
+    results = {}
+    for label, func in ( ( 'legacy', legacy ), ( 'plan', planned ) ):
+        results[ label ] = min( timeit.repeat( func, number = 1, repeat = repeat ) )
+        print( "{0:10} : {1:8.4f} sec".format( label, results[ label ] ) )
+
+    print( "{0:10} : {1:8.2f} x".format( 'speedup', results[ 'legacy' ] / results[ 'plan' ] ) )
+    return
+
+
+if __name__ == '__main__':
+    main( *[ int( arg ) for arg in sys.argv[ 1: ] ] )
@@ -0,0 +1,122 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Microbenchmarks of ConfigProcessor.props() using the property registry
+compared with the previous dir()/getattr() based implementation.
+
+    python benchmarks/props.py [ number ]
+"""
+import os
+import sys
+import timeit
+import inspect
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), '..' ) )
+from saiti import ConfigProcessor, DatabaseConfig
+from saiti.flask import FlaskConfig, FlaskConfigMixin
+from saiti.logger import LoggingStreamHandlerConfig
+
+
+def legacyProps( self ) -> dict:
+    """The props() implementation before the property registry was
+    introduced, kept here as the reference for the benchmark.
+    """
+    translators = self._ConfigProcessor__translators
+    pr = {}
+    for name in dir( self ):
+        value = getattr( self, name )
+        if not name.startswith( '_' ) and not inspect.isroutine( value ):
+            if len( translators ):
+                found = False
+                for key1, key2 in translators.items():
+                    if key2 == name:
+                        pr[ key1 ] = value
+                        found = True
+                        break
+
+                if not found:
+                    pr[ name ] = value
+
+            else:
+                pr[ name ] = value
+
+    return pr
+
+
+class ServiceConfig( ConfigProcessor, FlaskConfigMixin ):
+    """A FlaskConfigMixin based class with a nested DatabaseConfig, like the
+    CustomConfig class of the example.
+    """
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'service', **kwargs )
+        FlaskConfigMixin.__init__( self, **kwargs )
+        self.__database = DatabaseConfig( **kwargs )
+        self.__debug    = False
+        return
+
+    @property
+    def database( self ) -> DatabaseConfig:
+        return self.__database
+
+    @property
+    def debug( self ) -> bool:
+        return self.__debug
+
+    @debug.setter
+    def debug( self, value: bool ):
+        self.__debug = value
+        return
+
+
+def connectString( database, props ):
+    """DatabaseConfig.getConnectString() with the props implementation
+    passed in.
+    """
+    return '{engine}://{username}:{password}@{host}:{port}/{database}'.format( **props( database ) )
+
+
+def main( number: int = 10000 ):
+    database = DatabaseConfig()
+    database.ParseConfig( { 'engine': 'postgresql', 'database': 'db', 'username': 'user',
+                            'password': 'secret', 'host': 'localhost', 'port': 5432 } )
+    handler = LoggingStreamHandlerConfig( 'console' )
+    handler.ParseConfig( { 'class': 'logging.StreamHandler', 'level': 'DEBUG' } )
+    cases = ( ( 'FlaskConfig', FlaskConfig() ),
+              ( 'ServiceConfig', ServiceConfig() ),
+              ( 'StreamHandler', handler ),
+              ( 'DatabaseConfig', database ) )
+    print( "{0:30} {1:>12} {2:>12} {3:>8}".format( 'props() of', 'legacy usec', 'registry usec', 'speedup' ) )
+    for label, obj in cases:
+        assert legacyProps( obj ) == obj.props(), label
+        legacy      = min( timeit.repeat( lambda: legacyProps( obj ), number = number, repeat = 3 ) )
+        registry    = min( timeit.repeat( obj.props, number = number, repeat = 3 ) )
+        print( "{0:30} {1:12.2f} {2:12.2f} {3:8.1f}".format( "{} ({})".format( label, len( obj.props() ) ),
+                                                             legacy * 1e6 / number,
+                                                             registry * 1e6 / number,
+                                                             legacy / registry ) )
+
+    legacy      = min( timeit.repeat( lambda: connectString( database, legacyProps ), number = number, repeat = 3 ) )
+    registry    = min( timeit.repeat( lambda: connectString( database, ConfigProcessor.props ), number = number, repeat = 3 ) )
+    print( "{0:30} {1:12.2f} {2:12.2f} {3:8.1f}".format( 'getConnectString()',
+                                                         legacy * 1e6 / number,
+                                                         registry * 1e6 / number,
+                                                         legacy / registry ) )
+    return
+
+
+if __name__ == '__main__':
+    main( *[ int( arg ) for arg in sys.argv[ 1: ] ] )
@@ -0,0 +1,426 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Benchmark suite of loading, parsing, props(), BuildConfig() and dump()
+for synthetic configurations of 10 up to 1M keys, written as JSON to
+compare releases.
+
+Two shapes are generated, 'wide' has many wildcard sections with a
+DatabaseConfig and a LoggingConfig each, like the CustomConfig class of the
+example, 'deep' is a binary tree of ConfigProcessorList objects. The time
+of an operation is the best of the repeats, the memory is measured with
+tracemalloc in a separate run: the peak and the memory still held after
+the operation.
+
+    python benchmarks/suite.py [ --sizes 10,1000 ] [ --shapes wide,deep ]
+                               [ --output results.json ]
+                               [ --compare baseline.json [ --threshold 1.2 ] ]
+
+With --compare the results are compared with an earlier result file, the
+exit code is 1 when an operation got slower than the threshold.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import tempfile
+import datetime
+import tracemalloc
+import yaml
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), '..' ) )
+from saiti import ConfigProcessor, ConfigProcessorList, YamlConfigFile, JsonConfigFile, \
+    DatabaseConfig, LoggingConfig
+from saiti.version import __version__
+
+
+SIZES       = ( 10, 1000, 100000, 1000000 )
+SHAPES      = ( 'wide', 'deep' )
+
+
+class SectionConfig( ConfigProcessor ):
+    """A wildcard section of the 'wide' shape
+    """
+    def __init__( self, name = 'section', **kwargs ):
+        ConfigProcessor.__init__( self, name, **kwargs )
+        self.__debug        = False
+        self.__database     = DatabaseConfig( **kwargs )
+        self.__logging      = LoggingConfig( **kwargs )
+        return
+
+    @property
+    def debug( self ) -> bool:
+        return self.__debug
+
+    @debug.setter
+    def debug( self, value: bool ):
+        self.__debug = value
+        return
+
+    @property
+    def database( self ) -> DatabaseConfig:
+        return self.__database
+
+    @property
+    def logging( self ) -> LoggingConfig:
+        return self.__logging
+
+
+class NodeConfig( ConfigProcessor ):
+    """A node of the 'deep' shape
+    """
+    def __init__( self, name = 'node', **kwargs ):
+        ConfigProcessor.__init__( self, name, **kwargs )
+        self.__value        = 0
+        self.__label        = ''
+        self.__children     = NodeListConfig( **kwargs )
+        return
+
+    @property
+    def value( self ) -> int:
+        return self.__value
+
+    @value.setter
+    def value( self, value: int ):
+        self.__value = value
+        return
+
+    @property
+    def label( self ) -> str:
+        return self.__label
+
+    @label.setter
+    def label( self, value: str ):
+        self.__label = value
+        return
+
+    @property
+    def children( self ) -> 'NodeListConfig':
+        return self.__children
+
+
+class NodeListConfig( ConfigProcessorList ):
+    def __init__( self, **kwargs ):
+        ConfigProcessorList.__init__( self, 'children', **kwargs )
+        return
+
+    def newObject( self, name: str, obj: dict ) -> object:
+        return NodeConfig( name, throw_exception = self._throw_exception )
+
+
+class TreeConfigMixin( object ):
+    """The root property of the 'deep' shape
+    """
+    def __init__( self, **kwargs ):
+        self.__tree = NodeConfig( 'tree', **kwargs )
+        return
+
+    @property
+    def tree( self ) -> NodeConfig:
+        return self.__tree
+
+
+class WideYamlFile( YamlConfigFile ):
+    def __init__( self, filename: str, **kwargs ):
+        YamlConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.setWildcardObject( SectionConfig, **kwargs )
+        return
+
+
+class WideJsonFile( JsonConfigFile ):
+    def __init__( self, filename: str, **kwargs ):
+        JsonConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.setWildcardObject( SectionConfig, **kwargs )
+        return
+
+
+class DeepYamlFile( YamlConfigFile, TreeConfigMixin ):
+    def __init__( self, filename: str, **kwargs ):
+        YamlConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        TreeConfigMixin.__init__( self, **kwargs )
+        return
+
+
+class DeepJsonFile( JsonConfigFile, TreeConfigMixin ):
+    def __init__( self, filename: str, **kwargs ):
+        JsonConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        TreeConfigMixin.__init__( self, **kwargs )
+        return
+
+
+ROOT_CLASSES = {
+    'wide':     ( WideYamlFile, WideJsonFile ),
+    'deep':     ( DeepYamlFile, DeepJsonFile ),
+}
+
+
+def wideSection( index: int ) -> dict:
+    """Returns a section of the 'wide' shape, it holds 13 keys
+    """
+    return {
+        'debug':        index % 2 == 0,
+        'database':     { 'engine': 'postgresql', 'database': 'db{}'.format( index ),
+                          'username': 'user', 'password': 'secret',
+                          'host': 'host{}'.format( index ), 'port': 5432 },
+        'logging':      { 'version': 1,
+                          'handlers': { 'console': { 'class': 'logging.StreamHandler', 'level': 'DEBUG' } },
+                          'loggers': { 'app': { 'level': 'INFO', 'propagate': False,
+                                                'handlers': [ 'console' ] } } },
+    }
+
+
+def generateConfig( shape: str, keys: int ) -> dict:
+    """Generates a configuration of the shape with about the number of keys,
+    a key is a value that is not a section.
+
+    :param shape:   str:    'wide' or 'deep'
+    :param keys:    int:    the number of keys
+    :return:        dict:   the configuration
+    """
+    if shape == 'wide':
+        return { 'section{}'.format( index ): wideSection( index ) for index in range( max( 1, keys // 13 ) ) }
+
+    # a binary tree in breadth-first order, each node holds 2 keys
+    nodes = [ { 'value': 0, 'label': 'node0' } ]
+    for index in range( 1, max( 1, keys // 2 ) ):
+        node = { 'value': index, 'label': 'node{}'.format( index ) }
+        nodes[ ( index - 1 ) // 2 ].setdefault( 'children', {} )[ 'node{}'.format( index ) ] = node
+        nodes.append( node )
+
+    return { 'tree': nodes[ 0 ] }
+
+
+def countKeys( config: object ) -> int:
+    """Returns the number of keys of the configuration that are not a
+    section.
+    """
+    count = 0
+    stack = [ config ]
+    while stack:
+        for value in stack.pop().values():
+            if isinstance( value, dict ):
+                stack.append( value )
+
+            else:
+                count += 1
+
+    return count
+
+
+def walkProps( obj: ConfigProcessor ) -> int:
+    """Calls props() on all the objects of the tree, as an application
+    that reads the complete configuration.
+    """
+    count = 0
+    stack = [ obj ]
+    while stack:
+        node = stack.pop()
+        count += len( node.props() )
+        stack.extend( node._children() )
+
+    return count
+
+
+class Files( object ):
+    """The YAML and JSON file of a generated configuration
+    """
+    def __init__( self, config: dict ):
+        self.folder = tempfile.mkdtemp( prefix = 'saiti-bench-' )
+        self.yaml   = os.path.join( self.folder, 'config.yaml' )
+        self.json   = os.path.join( self.folder, 'config.json' )
+        dumper = getattr( yaml, 'CSafeDumper', yaml.SafeDumper )
+        with open( self.yaml, 'wt' ) as stream:
+            yaml.dump( config, stream, Dumper = dumper, default_flow_style = False )
+
+        with open( self.json, 'wt' ) as stream:
+            json.dump( config, stream )
+
+        return
+
+    def remove( self ) -> None:
+        for filename in ( self.yaml, self.json ):
+            os.remove( filename )
+
+        os.rmdir( self.folder )
+        return
+
+
+def operations( shape: str, config: dict, files: Files ) -> dict:
+    """Returns per operation a function that returns the setup, and the
+    operation that is called with the result of the setup.
+    """
+    yamlClass, jsonClass = ROOT_CLASSES[ shape ]
+
+    def loaded():
+        root = yamlClass( files.yaml )
+        root.Load()
+        return root
+
+    def dump( root ):
+        with open( os.devnull, 'wt' ) as stream:
+            root.dump( stream )
+
+        return
+
+    return {
+        'yaml.Load':    ( lambda: yamlClass( files.yaml ), lambda root: root.Load() ),
+        'json.Load':    ( lambda: jsonClass( files.json ), lambda root: root.Load() ),
+        'ParseConfig':  ( lambda: yamlClass( files.yaml ), lambda root: root.ParseConfig( config ) ),
+        'props':        ( loaded, walkProps ),
+        'BuildConfig':  ( loaded, lambda root: root.BuildConfig() ),
+        'dump':         ( loaded, dump ),
+    }
+
+
+def measure( setup, operation, repeat: int, memory: bool ) -> dict:
+    """Times the operation, the setup is not timed. The result holds the best
+    time of the repeats and with memory the peak and retained memory.
+    """
+    best = None
+    for _ in range( repeat ):
+        subject = setup()
+        gc.collect()
+        start = time.perf_counter()
+        result = operation( subject )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min( best, elapsed )
+        del subject, result
+
+    measurement = { 'seconds': best, 'repeat': repeat }
+    if memory:
+        subject = setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = operation( subject )
+            gc.collect()
+            retained, peak = tracemalloc.get_traced_memory()
+
+        finally:
+            tracemalloc.stop()
+
+        measurement.update( peak_bytes = peak, retained_bytes = retained )
+        del subject, result
+
+    return measurement
+
+
+def runSuite( sizes: list, shapes: list, repeat: int = 3, memory: bool = True, log = print ) -> dict:
+    """Runs the benchmarks and returns the results
+
+    :param sizes:   list:   the numbers of keys
+    :param shapes:  list:   the shapes, see generateConfig()
+    :param repeat:  int:    the repeats of the sizes up to 100k keys, the
+                            larger sizes run once
+    :param memory:  bool:   measure the memory as well
+    :param log:     func:   prints the progress
+    :return:        dict:   the results
+    """
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            config = generateConfig( shape, size )
+            keys = countKeys( config )
+            files = Files( config )
+            try:
+                for name, ( setup, operation ) in operations( shape, config, files ).items():
+                    measurement = measure( setup, operation, repeat if size <= 100000 else 1, memory )
+                    measurement.update( shape = shape, size = size, keys = keys, operation = name )
+                    results.append( measurement )
+                    log( "{0:5} {1:>8} {2:12} {3:10.4f} sec {4:>10}".format(
+                         shape, keys, name, measurement[ 'seconds' ],
+                         "{:.1f} MB".format( measurement[ 'peak_bytes' ] / 2 ** 20 ) if memory else '' ) )
+
+            finally:
+                files.remove()
+
+    return {
+        'saiti':            __version__,
+        'python':           platform.python_version(),
+        'implementation':   platform.python_implementation(),
+        'platform':         platform.platform(),
+        'libyaml':          bool( getattr( yaml, '__with_libyaml__', False ) ),
+        'created':          datetime.datetime.now().isoformat( timespec = 'seconds' ),
+        'results':          results,
+    }
+
+
+def compareResults( baseline: dict, current: dict, threshold: float, log = print ) -> list:
+    """Compares the results with the baseline
+
+    :param baseline:    dict:   the results of an earlier run
+    :param current:     dict:   the results of this run
+    :param threshold:   float:  the ratio of the times that is a regression
+    :param log:         func:   prints the comparison
+    :return:            list:   the ( shape, size, operation, ratio ) of the
+                                regressions
+    """
+    previous = { ( item[ 'shape' ], item[ 'size' ], item[ 'operation' ] ): item
+                 for item in baseline[ 'results' ] }
+    regressions = []
+    log( "compared with saiti {} ({})".format( baseline.get( 'saiti' ), baseline.get( 'created' ) ) )
+    for item in current[ 'results' ]:
+        key = ( item[ 'shape' ], item[ 'size' ], item[ 'operation' ] )
+        if key not in previous:
+            continue
+
+        ratio = item[ 'seconds' ] / max( previous[ key ][ 'seconds' ], 1e-9 )
+        marker = ''
+        if ratio > threshold:
+            regressions.append( key + ( ratio, ) )
+            marker = 'REGRESSION'
+
+        log( "{0:5} {1:>8} {2:12} {3:8.2f} x {4}".format( key[ 0 ], key[ 1 ], key[ 2 ], ratio, marker ) )
+
+    return regressions
+
+
+def main( argv: list = None ) -> int:
+    parser = argparse.ArgumentParser( description = 'saiti benchmark suite' )
+    parser.add_argument( '--sizes', default = ",".join( str( size ) for size in SIZES ),
+                         help = 'comma separated numbers of keys' )
+    parser.add_argument( '--shapes', default = ",".join( SHAPES ), help = 'comma separated shapes' )
+    parser.add_argument( '--repeat', type = int, default = 3 )
+    parser.add_argument( '--no-memory', dest = 'memory', action = 'store_false',
+                         help = 'do not measure the memory' )
+    parser.add_argument( '--output', default = 'saiti-benchmark-{}.json'.format( __version__ ) )
+    parser.add_argument( '--compare', help = 'result file of an earlier run' )
+    parser.add_argument( '--threshold', type = float, default = 1.2,
+                         help = 'slowdown ratio that is reported as regression' )
+    args = parser.parse_args( argv )
+    current = runSuite( [ int( size ) for size in args.sizes.split( ',' ) ],
+                        [ shape.strip() for shape in args.shapes.split( ',' ) ],
+                        args.repeat, args.memory )
+    with open( args.output, 'wt' ) as stream:
+        json.dump( current, stream, indent = 4 )
+
+    print( "results written to {}".format( args.output ) )
+    if args.compare:
+        with open( args.compare, 'rt' ) as stream:
+            baseline = json.load( stream )
+
+        if compareResults( baseline, current, args.threshold ):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -87,11 +87,13 @@ class CustomConfig( ConfigProcessor,
 
 
 class CustonConfigFile( YamlConfigFile ):
-    def __init__( self, filename: str, **kwargs ):
+    def __init__( self, filename: str, loadLater: bool = False, **kwargs ):
         YamlConfigFile.__init__( self, filename, loadLater = True, **kwargs )
         self.__common = CustomConfig( **kwargs )
         self.setWildcardObject( CustomConfig, **kwargs )
-        self.Load()
+        if not loadLater:
+            self.Load()
+
         return
 
     @property
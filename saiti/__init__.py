@@ -18,7 +18,8 @@
 #
 from saiti.base import ConfigProcessor
 from saiti.baselist import ConfigProcessorList
-from saiti.file import YamlConfigFile, JsonConfigFile
+from saiti.cache import ConfigCache
+from saiti.file import YamlConfigFile, YamlDocumentsFile, JsonConfigFile
 from saiti.pathlist import PathList
 from saiti.database import DatabaseConfig
 from saiti.logger import LoggingConfig
@@ -18,8 +18,418 @@
 # MA  02110-1301, USA.
 #
 import sys
-import inspect
+import copy
 import logging
+import contextlib
+import threading
+import weakref
+import hashlib
+import contextvars
+import collections
+import collections.abc
+from saiti.importspec import parseImportSpec, resolveCallable
+from saiti.frozen import frozenClass, freezeValue
+from saiti.pathindex import PathIndex
+from saiti.errors import ErrorReport, ConfigError, UNKNOWN_KEY, READ_ONLY, WRONG_TYPE, INVALID_VALUE, \
+    IMPORT_FAILED, INSTANTIATION
+
+_PRIMITIVES         = ( bool, int, str, float )
+
+# Value kinds of the parse plan entries
+_PRIMITIVE          = 'primitive'
+_LIST               = 'list'
+_PROCESSOR          = 'processor'
+_OBJECT             = 'object'
+
+# Parse plans per ( class, translators )
+_PARSE_PLANS        = {}
+
+# Properties per class
+_CLASS_PROPERTIES   = {}
+
+# ( config key, getter ) of the properties per ( class, translators )
+_PROPS_REGISTRY     = {}
+
+# The config keys of the getters that read an attribute per ( class,
+# translators ), see ConfigProcessor._changedKeys()
+_ATTRIBUTE_KEYS     = {}
+
+# The path of the objects being parsed, held per thread and asyncio task
+_BREADCRUMS         = contextvars.ContextVar( 'saiti_breadcrums', default = () )
+
+# Attributes of ConfigProcessor itself, setting them is not a configuration change
+_INTERNAL_PREFIX    = '_ConfigProcessor__'
+_INTERNAL_ATTRIBUTES = frozenset( ( '_throw_exception', '_lazy', '__class__' ) )
+
+# Result of ConfigProcessor.diff(), lists of paths ( tuples of keys )
+ConfigDiff          = collections.namedtuple( 'ConfigDiff', ( 'added', 'removed', 'changed' ) )
+
+# Values compared by diff() and getFingerprint() in place of an object build
+# from an import specification and of a wildcard section kept as raw data
+_SpecValue          = collections.namedtuple( '_SpecValue', ( 'spec', ) )
+_RawSection         = collections.namedtuple( '_RawSection', ( 'configs', ) )
+
+# Parsed objects per ( parent class, class, name, state, config ) while shared
+# loading is active, see shareSubtrees()
+_SHARE_MEMO         = contextvars.ContextVar( 'saiti_share_memo', default = None )
+
+# The report that collects the errors, see collectErrors()
+_ERROR_REPORT       = contextvars.ContextVar( 'saiti_error_report', default = None )
+
+# Lazy variants per class, see ConfigProcessor._deferParseConfig()
+_LAZY_CLASSES       = {}
+_LAZY_LOCK          = threading.RLock()
+# The attributes that can be read without materializing the object
+_LAZY_ATTRIBUTES    = frozenset( ( '_materialize', '_deferParseConfig', '_ConfigProcessor__pending',
+                                   '_ConfigProcessor__parsing', '_ConfigProcessor__failed',
+                                   '_LAZY_BASE', '_throw_exception', '_lazy', '__class__',
+                                   '_changed', '_setParent', '_checkShared' ) )
+
+
+def _lazyGetAttribute( self, name: str ) -> object:
+    """__getattribute__ of the lazy variant of a class, reading any attribute
+    other than the ones used by the lazy mode itself materializes the
+    deferred configuration first.
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        object.__getattribute__( self, '_materialize' )()
+
+    return object.__getattribute__( self, name )
+
+
+def _lazyClass( cls ) -> type:
+    """Returns the lazy variant of the class, the variant is only used until
+    the object is materialized and then swapped back to the class.
+
+    :param cls:     class:  class derived from ConfigProcessor
+    :return:        class:  the lazy variant
+    """
+    lazy = _LAZY_CLASSES.get( cls )
+    if lazy is None:
+        lazy = type( cls.__name__, ( cls, ), { '__getattribute__': _lazyGetAttribute,
+                                               '__module__': cls.__module__,
+                                               '_LAZY_BASE': cls } )
+        _LAZY_CLASSES[ cls ] = lazy
+
+    return lazy
+
+
+# Variants of the classes with active wildcards, see ConfigProcessor.setActiveWildcards()
+_ACTIVE_CLASSES     = {}
+
+
+def _activeGetAttr( self, name: str ) -> object:
+    """__getattr__ of the active wildcards variant of a class, reading a
+    wildcard section that was kept as raw data builds the object.
+    """
+    raw = object.__getattribute__( self, '__dict__' ).get( '_ConfigProcessor__wildcardRaw' )
+    if raw and name in raw:
+        self._ConfigProcessor__materializeWildcard( name )
+        return object.__getattribute__( self, name )
+
+    raise AttributeError( "'{}' object has no attribute '{}'".format( type( self ).__name__, name ) )
+
+
+def _activeClass( cls ) -> type:
+    """Returns the variant of the class with the __getattr__ that builds the
+    raw wildcard sections. The variant is only used by objects with active
+    wildcards, so the other classes keep the normal attribute errors of
+    their properties.
+
+    :param cls:     class:  class derived from ConfigProcessor
+    :return:        class:  the variant
+    """
+    if '_ACTIVE_BASE' in vars( cls ):
+        return cls
+
+    active = _ACTIVE_CLASSES.get( cls )
+    if active is None:
+        active = type( cls.__name__, ( cls, ), { '__getattr__': _activeGetAttr,
+                                                 '__module__': cls.__module__,
+                                                 '_ACTIVE_BASE': cls } )
+        _ACTIVE_CLASSES[ cls ] = active
+
+    return active
+
+
+# Variants of the classes that track the changes of their objects, see _track()
+_TRACKED_CLASSES    = {}
+
+
+def _trackedSetAttr( self, name: str, value: object ) -> None:
+    """__setattr__ of the tracked variant of a class, when a setter of a
+    derived class stores a value the fingerprints and path indexes of the
+    object and its parents are updated and a nested ConfigProcessor object
+    gets this object as its parent. Objects shared by shareSubtrees() can
+    not be changed.
+    """
+    if name.startswith( _INTERNAL_PREFIX ) or name in _INTERNAL_ATTRIBUTES:
+        object.__setattr__( self, name, value )
+        return
+
+    if object.__getattribute__( self, '__dict__' ).get( '_ConfigProcessor__shared' ):
+        self._checkShared()
+
+    object.__setattr__( self, name, value )
+
+    if isinstance( getattr( type( self ), name, None ), property ):
+        # The setter stores its attributes through this hook as well
+        return
+
+    if isinstance( value, ConfigProcessor ):
+        value._setParent( self )
+
+    self._changed( name )
+    return
+
+
+def _trackedClass( cls ) -> type:
+    """Returns the tracked variant of the class, see _track().
+
+    :param cls:     class:  class derived from ConfigProcessor
+    :return:        class:  the variant
+    """
+    tracked = _TRACKED_CLASSES.get( cls )
+    if tracked is None:
+        tracked = type( cls.__name__, ( cls, ), { '__setattr__': _trackedSetAttr,
+                                                  '__module__': cls.__module__,
+                                                  '_TRACKED_BASE': cls } )
+        _TRACKED_CLASSES[ cls ] = tracked
+
+    return tracked
+
+
+def _track( obj: 'ConfigProcessor' ) -> None:
+    """Swaps the class of the object for its tracked variant. Only the
+    objects with a fingerprint, a path index or shared sections need to see
+    the changes made by the setters, so the other objects are parsed without
+    a __setattr__ hook.
+
+    :param obj:     ConfigProcessor:    the object
+    :return:        None
+    """
+    cls = type( obj )
+    if cls.__setattr__ is _trackedSetAttr:
+        return
+
+    lazy = vars( cls ).get( '_LAZY_BASE' )
+    if lazy is not None:
+        # the lazy variant is swapped back to its base on the first use
+        obj.__class__ = _lazyClass( _trackedClass( lazy ) )
+
+    else:
+        obj.__class__ = _trackedClass( cls )
+
+    return
+
+
+def _baseClass( cls ) -> type:
+    """Returns the class of the lazy, active or tracked variant of a class.
+
+    :param cls:     class:  class derived from ConfigProcessor or a variant
+    :return:        class:  the class
+    """
+    base = cls
+    while base is not None:
+        cls = base
+        state = vars( cls )
+        base = state.get( '_LAZY_BASE' ) or state.get( '_ACTIVE_BASE' ) or state.get( '_TRACKED_BASE' )
+
+    return cls
+
+
+@contextlib.contextmanager
+def shareSubtrees():
+    """Context in which ParseConfig shares the nested objects of identical
+    configuration sections, like the sections produced by YAML anchors and
+    merge keys. A section is parsed once, the next nested object of the same
+    class and name in the same parent class with the same section re-uses
+    the parsed object, a shared wildcard object is not even build.
+
+    The shared objects are read-only, ParseConfig replaces a shared object
+    by a private copy before changing it and unshare() makes the copy for
+    the setters.
+    """
+    token = _SHARE_MEMO.set( {} )
+    try:
+        yield
+
+    finally:
+        _SHARE_MEMO.reset( token )
+
+    return
+
+
+@contextlib.contextmanager
+def collectErrors( limit: int = None, subtreeLimit: int = None ):
+    """Context in which the errors found by ParseConfig are collected into
+    an ErrorReport, instead of raising an exception or printing each error
+    on stderr. Errors raised by the property setters are collected as well.
+
+        with collectErrors( limit = 100, subtreeLimit = 10 ) as report:
+            config = MyConfigFile( 'app.yaml' )
+
+        for error in report:
+            print( error.path, error.key, error.type, error.reason )
+
+    :param limit:           int:    the parse stops after this number of
+                                    errors, None no limit
+    :param subtreeLimit:    int:    a nested object is not parsed any further
+                                    after this number of errors, None no limit
+    :return:                ErrorReport:    the report
+    """
+    report = ErrorReport( limit, subtreeLimit )
+    token = _ERROR_REPORT.set( report )
+    try:
+        yield report
+
+    finally:
+        _ERROR_REPORT.reset( token )
+
+    return
+
+
+def _contentKey( value: object, keys: dict ) -> object:
+    """Returns a hashable key of the content of a configuration section, the
+    keys of the dictionaries and lists are cached by identity as the YAML
+    aliases and merge keys refer to the same objects.
+
+    :param value:   object: the configuration section
+    :param keys:    dict:   id( value ) -> ( value, key ) of the containers
+    :return:        object: the key
+    """
+    value_type = type( value )
+    if value_type in ( dict, list, tuple ):
+        cached = keys.get( id( value ) )
+        if cached is not None and cached[ 0 ] is value:
+            return cached[ 1 ]
+
+        if value_type is dict:
+            key = dict, tuple( ( _contentKey( name, keys ), _contentKey( item, keys ) )
+                               for name, item in value.items() )
+
+        else:
+            key = list, tuple( _contentKey( item, keys ) for item in value )
+
+        keys[ id( value ) ] = ( value, key )
+        return key
+
+    try:
+        hash( value )
+
+    except TypeError:
+        return value_type, id( value )
+
+    return value_type, value
+
+
+def _classProperties( cls ) -> dict:
+    """Returns the public properties of the class, walking the MRO so that
+    an attribute in a derived class overrules the one of its base classes.
+    The result is cached per class.
+
+    :param cls:     class:  the class to inspect
+    :return:        dict:   property name and property object
+    """
+    properties = _CLASS_PROPERTIES.get( cls )
+    if properties is None:
+        properties = {}
+        for klass in reversed( cls.__mro__ ):
+            for name, attr in vars( klass ).items():
+                if name.startswith( '_' ):
+                    continue
+
+                if isinstance( attr, property ):
+                    properties[ name ] = attr
+
+                else:
+                    properties.pop( name, None )
+
+        _CLASS_PROPERTIES[ cls ] = properties
+
+    return properties
+
+
+def _diffNodes( old, new, path: tuple, result: ConfigDiff ) -> None:
+    """Compares the items of two ConfigProcessor objects into the result,
+    see ConfigProcessor.diff().
+    """
+    if _baseClass( type( old ) ) is not _baseClass( type( new ) ):
+        result.changed.append( path )
+        return
+
+    if old.getFingerprint() == new.getFingerprint():
+        return
+
+    oldItems = dict( old._compareItems() )
+    for key, value in new._compareItems():
+        keyPath = path + ( key, )
+        if key not in oldItems:
+            result.added.append( keyPath )
+            continue
+
+        oldValue = oldItems.pop( key )
+        if type( value ) is _RawSection or type( oldValue ) is _RawSection:
+            if type( value ) is type( oldValue ):
+                # both sections are still raw data, compare the data
+                if value != oldValue:
+                    result.changed.append( keyPath )
+
+                continue
+
+            # only the raw section is build to compare it with the object
+            if type( value ) is _RawSection:
+                value = new._wildcardItem( key )
+
+            else:
+                oldValue = old._wildcardItem( key )
+
+        if isinstance( value, ConfigProcessor ) and isinstance( oldValue, ConfigProcessor ):
+            _diffNodes( oldValue, value, keyPath, result )
+
+        elif oldValue != value:
+            result.changed.append( keyPath )
+
+    for key in oldItems:
+        result.removed.append( path + ( key, ) )
+
+    return
+
+
+class WildcardView( collections.abc.Mapping ):
+    """Read-only mapping of the wildcard objects of a ConfigProcessor in
+    the order of the configuration, see ConfigProcessor.getWildcardValue().
+    The view reads the wildcard index of the object, so it stays current
+    when wildcard objects are added and it is created only once per object.
+    """
+    def __init__( self, owner: 'ConfigProcessor' ):
+        """Constructor of the view
+
+        :param owner:   ConfigProcessor:    the object with the wildcards
+        """
+        self.__owner = owner
+        return
+
+    def owner( self ) -> 'ConfigProcessor':
+        """Returns the object of the view
+        """
+        return self.__owner
+
+    def __getitem__( self, key: str ) -> 'ConfigProcessor':
+        return self.__owner._wildcardItem( key )
+
+    def __contains__( self, key: object ) -> bool:
+        return key in self.__owner._ConfigProcessor__wildcards
+
+    def __iter__( self ):
+        return iter( self.__owner._ConfigProcessor__wildcards )
+
+    def __len__( self ) -> int:
+        return len( self.__owner._ConfigProcessor__wildcards )
+
+    def __repr__( self ) -> str:
+        return "WildcardView( {} )".format( list( self ) )
+
 
 class ConfigItemLoader( object ):
     def __init__( self ):
@@ -31,12 +441,12 @@ class ConfigItemLoader( object ):
 class ConfigProcessor( object ):
     """The main class to process a configuration object
     """
-    _BREADCRUMS = []
-
     def __init__( self,
                   name,
                   translators = None,
                   throw_exception = False,
+                  lazy = False,
+                  pathIndex = False,
                   **kwargs ):
         """Constructor of the ConfigProcessor object.
 
@@ -44,19 +454,229 @@ class ConfigProcessor( object ):
         :param translators:     dict:   Dictionary with keys to translate
                                         into another key.
         :param throw_exception: bool:   True on error an exception shall be thrown.
+        :param lazy:            bool:   True the nested ConfigProcessor objects
+                                        are parsed when they are first used.
+        :param pathIndex:       bool:   True the path index is build when the
+                                        object is loaded, see getPathIndex().
         """
         self.__name             = name
         self.__wildcard         = False
         self.__wildcardObject   = None
         self.__wildcardKwargs   = {}
-        self.__wildcardKeys     = []
+        # the wildcard keys in configuration order, the objects are attributes
+        # of the object, see _wildcardItem()
+        self.__wildcards        = {}
+        self.__wildcardView     = None
+        self.__wildcardActive   = None
+        self.__wildcardRaw      = {}
         self.__translators      = {}
+        self.__translatorsKey   = ()
         self._throw_exception   = throw_exception
+        self._lazy              = lazy
+        self.__pending          = None
+        self.__parsing          = False
+        self.__failed           = None
+        self.__parents          = None
+        self.__fingerprint      = None
+        self.__index            = None
+        self.__pathIndex        = pathIndex
         if isinstance( translators, dict ):
             self.__translators  = translators
+            self.__translatorsKey = tuple( sorted( translators.items() ) )
 
         return
 
+    def _setParent( self, parent: 'ConfigProcessor' ) -> None:
+        """Adds a parent of the object, the parents are held by weak
+        references. An object has more than one parent when it is shared,
+        see shareSubtrees(), the first parent is held without a WeakSet.
+
+        :param parent:  ConfigProcessor:    the parent object
+        :return:        None
+        """
+        state = object.__getattribute__( self, '__dict__' )
+        parents = state.get( '_ConfigProcessor__parents' )
+        if isinstance( parents, weakref.WeakSet ):
+            parents.add( parent )
+            return
+
+        current = parents() if parents is not None else None
+        if current is None or current is parent:
+            state[ '_ConfigProcessor__parents' ] = weakref.ref( parent )
+
+        else:
+            state[ '_ConfigProcessor__parents' ] = weakref.WeakSet( ( current, parent ) )
+
+        return
+
+    def _changed( self, attr: str = None ) -> None:
+        """Invalidates the fingerprint of the object and its parents, all the
+        parents of a shared object. A parent fingerprint is only computed
+        after the ones of its children, so the walk stops at the first object
+        without fingerprint.
+
+        The path indexes that hold the object are updated as well, only the
+        keys that read the attribute when it is given, see _changedKeys().
+
+        Changing a list value in place outside ParseConfig() does not pass a
+        setter, call _changed() on the object after such change.
+
+        :param attr:    str:    the attribute that was set, None when any
+                                key of the object may have changed
+        :return:        None
+        """
+        indexes = object.__getattribute__( self, '__dict__' ).get( '_ConfigProcessor__indexes' )
+        if indexes:
+            keys = None if attr is None else self._changedKeys( attr )
+            if keys is None:
+                for index in list( indexes ):
+                    index.refresh( self )
+
+            else:
+                items = self._keyItems( keys )
+                for index in list( indexes ):
+                    index.update( self, items )
+
+        nodes = [ self ]
+        while nodes:
+            # read the state directly, this must not materialize a lazy object
+            state = object.__getattribute__( nodes.pop(), '__dict__' )
+            if state.get( '_ConfigProcessor__fingerprint' ) is None:
+                continue
+
+            state[ '_ConfigProcessor__fingerprint' ] = None
+            parents = state.get( '_ConfigProcessor__parents' )
+            if isinstance( parents, weakref.WeakSet ):
+                nodes.extend( parents )
+
+            elif parents is not None:
+                parent = parents()
+                if parent is not None:
+                    nodes.append( parent )
+
+        return
+
+    def _addIndex( self, index: PathIndex ) -> None:
+        """Registers a path index that holds the object, the index is held
+        by a weak reference.
+
+        :param index:   PathIndex:  the index
+        :return:        None
+        """
+        state = object.__getattribute__( self, '__dict__' )
+        indexes = state.get( '_ConfigProcessor__indexes' )
+        if indexes is None:
+            indexes = state[ '_ConfigProcessor__indexes' ] = weakref.WeakSet()
+
+        indexes.add( index )
+        _track( self )
+        return
+
+    def _removeIndex( self, index: PathIndex ) -> None:
+        """Removes the registration of a path index
+
+        :param index:   PathIndex:  the index
+        :return:        None
+        """
+        indexes = object.__getattribute__( self, '__dict__' ).get( '_ConfigProcessor__indexes' )
+        if indexes is not None:
+            indexes.discard( index )
+
+        return
+
+    def _changedKeys( self, attr: str ) -> tuple:
+        """Returns the config keys whose value can change when the attribute
+        is set. A getter that only reads one attribute, like 'return
+        self.__port', is mapped onto that attribute, the other getters are
+        always included.
+
+        :param attr:    str:    the attribute name, like '_WebConfig__port'
+        :return:        tuple:  the config keys, None when unknown
+        """
+        if attr in self.__wildcards:
+            return ( attr, )
+
+        attributes = _ATTRIBUTE_KEYS.get( ( type( self ), self.__translatorsKey ) )
+        if attributes is None:
+            registry = _PROPS_REGISTRY.get( ( type( self ), self.__translatorsKey ) )
+            if registry is None:
+                registry = self._propsRegistry()
+
+            attributes = {}
+            computed = ()
+            for key, fget in registry:
+                code = getattr( fget, '__code__', None )
+                if code is not None and len( code.co_names ) == 1:
+                    attributes.setdefault( code.co_names[ 0 ], [] ).append( key )
+
+                else:
+                    computed += ( key, )
+
+            attributes = { name: tuple( keys ) + computed for name, keys in attributes.items() }
+            _ATTRIBUTE_KEYS[ ( type( self ), self.__translatorsKey ) ] = attributes
+
+        return attributes.get( attr )
+
+    def _keyItems( self, keys: tuple ) -> list:
+        """Returns the values of the config keys, see _changedKeys().
+
+        :param keys:    tuple:  config keys of properties or wildcards
+        :return:        list:   ( config key, value ) pairs
+        """
+        registry = _PROPS_REGISTRY.get( ( type( self ), self.__translatorsKey ) )
+        if registry is None:
+            registry = self._propsRegistry()
+
+        getters = dict( registry )
+        items = []
+        for key in keys:
+            fget = getters.get( key )
+            items.append( ( key, fget( self ) if fget is not None else self._wildcardItem( key ) ) )
+
+        return items
+
+    def getPathIndex( self ) -> PathIndex:
+        """Returns the index of the dotted paths below this object, the
+        index is build on the first call, or when the object is loaded with
+        pathIndex = True, and then kept up to date by the setters. Building
+        the index parses all deferred lazy sections.
+
+        :return:        PathIndex:  the index
+        """
+        index = self.__index
+        if index is None:
+            index = self.__index = PathIndex( self )
+
+        return index
+
+    def getPathValue( self, path: str ) -> object:
+        """Returns the value of the dotted path, like 'common.database.engine'.
+
+        If throw_exception is set and the path does not exist a ValueError
+        shall be thrown.
+
+        :param path:    str:    dotted path of config keys
+        :return:        object: the value, None when the path is not found
+                                and throw_exception is not set.
+        """
+        try:
+            return self.getPathIndex().get( path )
+
+        except KeyError:
+            if self._throw_exception:
+                raise ValueError( "path {} not found".format( path ) )
+
+        return None
+
+    def getPathValues( self, prefix: str ) -> dict:
+        """Returns the paths and values below the dotted path, for example
+        all the keys of 'common.logging.handlers'.
+
+        :param prefix:  str:    dotted path of config keys
+        :return:        dict:   dotted path and value, ordered by path
+        """
+        return self.getPathIndex().items( prefix )
+
     def hasWildcard( self ):
         """Has the object a wildcard object
 
@@ -82,7 +702,7 @@ class ConfigProcessor( object ):
         :param kwargs:  dict:   keyword arguments for the wildcard class
         :return:        None
         """
-        if hasattr( ConfigProcessor, '_BREADCRUMS' ):
+        if isinstance( value, type ) and issubclass( value, ConfigProcessor ):
             self.__wildcard         = True
             self.__wildcardObject   = value
             self.__wildcardKwargs   = kwargs
@@ -90,12 +710,68 @@ class ConfigProcessor( object ):
 
         raise ValueError( "wildcardObject must be instance of ConfigProcessor" )
 
+    def setActiveWildcards( self, keys ) -> None:
+        """Sets the keys of the wildcard objects that are build by
+        ParseConfig, the other wildcard sections are kept as raw data and
+        build when they are read as attribute or by getWildcardValue().
+        None builds all the wildcard objects.
+
+        :param keys:    list:   the active keys, a single key or None
+        :return:        None
+        """
+        if keys is None:
+            self.__wildcardActive = None
+            return
+
+        if isinstance( keys, str ):
+            keys = ( keys, )
+
+        self.__wildcardActive = frozenset( keys )
+        self.__class__ = _activeClass( type( self ) )
+        return
+
+    def _isRawWildcard( self, key: str ) -> bool:
+        """Returns True when the wildcard section is kept as raw data and
+        was not build yet.
+
+        :param key:     str:    name of the wildcard object
+        :return:        bool:   True/False
+        """
+        return key in self.__wildcardRaw
+
+    def __materializeWildcard( self, key: str ) -> None:
+        """Builds the wildcard object from the raw data kept by ParseConfig.
+
+        :param key:     str:    name of the wildcard object
+        :return:        None
+        """
+        # Other threads wait here until the object is build completely
+        with _LAZY_LOCK:
+            pending = self.__wildcardRaw.get( key )
+            if pending is None:
+                return
+
+            var = self.__wildcardObject( key, **self.__wildcardKwargs )
+            for config, crums in pending:
+                token = _BREADCRUMS.set( crums )
+                try:
+                    self._parseChild( var, config )
+
+                finally:
+                    _BREADCRUMS.reset( token )
+
+            setattr( self, key, var )
+            # removed last, until then readers end up waiting on the lock
+            del self.__wildcardRaw[ key ]
+
+        return
+
     def getWildcardKeys( self ):
         """Returns the key values of the wildcard objects
 
-        :return:        list:   List of strings with wildcard names
+        :return:        KeysView:   the wildcard names in configuration order
         """
-        return self.__wildcardKeys
+        return self.__wildcards.keys()
 
     def getWildcardValue( self, key: any = None ) -> object:
         """Returns a wildcard object of the key supplied, whenever the key is
@@ -106,34 +782,77 @@ class ConfigProcessor( object ):
 
         :param key:     str:    String name of the wildcard object.
         :return:        object: When the key is present an object is returned
-                        list:   When the key is ommitted an list obj objects
-                                is returned.
+                        WildcardView:   When the key is ommitted a read-only
+                                mapping of the objects is returned.
                         None:   When the key is not found and throw_exception
                                 is not set.
         """
         if key is None:
-            result = {}
-            for key in self.__wildcardKeys:
-                result[ key ] = getattr( self, key )
+            view = self.__wildcardView
+            if view is None or view.owner() is not self:
+                view = self.__wildcardView = WildcardView( self )
 
-            return result
+            return view
 
-        elif key in self.__wildcardKeys:
-            return getattr( self, key )
+        elif key in self.__wildcards:
+            return self._wildcardItem( key )
 
         if self._throw_exception:
             raise ValueError( "wildcard object {} not found".format( key ) )
 
         return None
 
-    def _error( self, message: str ) -> None:
+    def _wildcardItem( self, key: str ) -> 'ConfigProcessor':
+        """Returns the wildcard object of the key, a section that was kept
+        as raw data is build first.
+
+        :param key:     str:    name of the wildcard object
+        :return:        ConfigProcessor:    the wildcard object
+        :raises:        KeyError when there is no such wildcard object
+        """
+        value = self.__dict__.get( key )
+        if value is None:
+            if key not in self.__wildcards:
+                raise KeyError( key )
+
+            self.__materializeWildcard( key )
+            value = self.__dict__[ key ]
+
+        return value
+
+    def _adoptWildcard( self, key: str, value: 'ConfigProcessor' ) -> None:
+        """Sets an existing object as wildcard object, used when a
+        configuration is rebuild from the unchanged parts of another.
+
+        :param key:     str:                name of the wildcard object
+        :param value:   ConfigProcessor:    the wildcard object
+        :return:        None
+        """
+        self.__wildcards.setdefault( key, None )
+        self.__wildcardRaw.pop( key, None )
+        setattr( self, key, value )
+        value._setParent( self )
+        self._changed()
+        return
+
+    def _error( self, message: str, key: str = None, value: object = None, reason: str = None ) -> None:
         """Set error message, when throw_exception is set on the constructor
         and exception shall be thrown, otherwise the message is outputed on
-        stderr.
+        stderr. Within collectErrors() the error is added to the report.
 
         :param message: str     Error message
+        :param key:     str     the config key of the error
+        :param value:   object  the value of the key
+        :param reason:  str     the reason of the error, see saiti.errors
         :return:
         """
+        report = _ERROR_REPORT.get()
+        if report is not None:
+            report.add( ConfigError( _BREADCRUMS.get(), key,
+                                     None if key is None else type( value ).__name__,
+                                     reason, message ) )
+            return
+
         if self._throw_exception:
             raise AttributeError( message )
 
@@ -152,107 +871,553 @@ class ConfigProcessor( object ):
 
         :return:    str
         """
-        return "->".join( self._BREADCRUMS )
+        return "->".join( _BREADCRUMS.get() )
+
+    def _enterBreadCrum( self ) -> contextvars.Token:
+        """Adds the name of the object to the breadcrum path of the current
+        parse context, the path is held in a context variable so that
+        configurations can be parsed concurrently by threads and asyncio
+        tasks.
+
+        :return:    Token:  token to pass to _leaveBreadCrum()
+        """
+        return _BREADCRUMS.set( _BREADCRUMS.get() + ( self.name(), ) )
+
+    def _leaveBreadCrum( self, token: contextvars.Token ) -> None:
+        """Restores the breadcrum path of before _enterBreadCrum().
+
+        :param token:   Token:  token returned by _enterBreadCrum()
+        :return:        None
+        """
+        _BREADCRUMS.reset( token )
+        return
 
     def ParseConfig( self, config: dict ) -> None:
         """Parse the config dictionary
 
+        The keys are dispatched through the parse plan of the class, see
+        _parsePlan(), so each key costs one dictionary lookup and a direct
+        call of the property setter or getter.
+
         :param config:
         :return:
         """
-        self._BREADCRUMS.append( self.name() )
-        for key, value in config.items():
-            if key in self.__translators:
-                if not hasattr( self, self.__translators[ key ] ):
-                    self._error( "{} has no attr {}".format( self.breadCrumPath(), self.__translators[ key ] ) )
+        self._checkShared()
+        plan = _PARSE_PLANS.get( ( type( self ), self.__translatorsKey ) )
+        if plan is None:
+            plan = self._parsePlan()
+
+        report = _ERROR_REPORT.get()
+        mark = report.mark() if report is not None else 0
+        token = self._enterBreadCrum()
+        try:
+            for key, value in config.items():
+                if report is not None and self._stopParse( report, mark ):
+                    break
+
+                entry = plan.get( key )
+                if entry is None:
+                    self.__parseWildcard( key, value )
                     continue
 
-            elif not hasattr( self, key ):
-                if not self.__wildcard:
-                    self._error( "{} has no attr {}".format( self.breadCrumPath(), key ) )
-                    continue
+                attr, kind, fget, fset, default_type = entry
+                value_type = type( value )
+                if value_type in _PRIMITIVES:
+                    if kind is _PRIMITIVE or kind is _OBJECT:
+                        if value_type is default_type or default_type is None or value_type is int or \
+                                ( value_type is str and value.startswith( 'ext://' ) ):
+                            # the property setter handles the conversion
+                            if fset is None:
+                                self._error( "{} attr {} is read-only".format( self.breadCrumPath(), attr ),
+                                             attr, value, READ_ONLY )
+                                continue
 
-            if key in self.__translators:
-                key = self.__translators[ key ]
+                            if report is None:
+                                fset( self, value )
 
-            if hasattr( self, key ):
-                var = getattr( self, key )
+                            else:
+                                self.__setCollected( attr, value, fset )
 
-            else:
-                self.__wildcardKeys.append( key )
-                var = self.__wildcardObject( key, **self.__wildcardKwargs )
-                setattr( self, key, var )
+                        elif value_type is str:
+                            self.__parseImportSpec( attr, value, fset )
 
-            if type( value ) in ( bool, int, str, float ):
-                if type( value ) == type( var ) or var is None:
-                    setattr( self, key, value )
+                        else:
+                            self._error( "primitive ERROR: key {} = {} in {}".format( attr, value, self.breadCrumPath() ),
+                                         attr, value, WRONG_TYPE )
 
-                elif type( value ) is int:
-                    if callable( var ):
-                        var = value
+                    else:
+                        self._error( "primitive ERROR: key {} = {} in {}".format( attr, value, self.breadCrumPath() ),
+                                     attr, value, WRONG_TYPE )
 
-                    elif isinstance( var, object ):
-                        var = value
+                elif value_type in ( tuple, list ):
+                    if kind is _LIST:
+                        var = fget( self )
+                        if report is None:
+                            for item in value:
+                                var.append( item )
 
-                elif type( value ) is str and ( callable( var ) or isinstance( var, object ) ):
-                    if value.startswith( 'ext://' ):    # case the class function shall handle the conversion
-                        var = value
+                        else:
+                            self.__appendCollected( attr, value, var )
 
                     else:
-                        value = value.replace( ':', '.' )
-                        module_name, cls_name = value.rsplit( '.', 1 )
-                        try:
-                            module = __import__( module_name, None, None, [ cls_name ] )
+                        self._error( "array ERROR: key {} = {} in {}".format( attr, value, self.breadCrumPath() ),
+                                     attr, value, WRONG_TYPE )
+
+                elif kind is _PROCESSOR:
+                    self._parseChild( fget( self ), value )
+
+                else:
+                    self._error( "unknown ERROR: key {} = {} in {}".format( attr, value, self.breadCrumPath() ),
+                                 attr, value, WRONG_TYPE )
 
-                        except ImportError:
-                            # support importing modules not yet set up by the parent module
-                            # (or package for that matter)
-                            self._error( "import ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
-                            continue
+        finally:
+            self._leaveBreadCrum( token )
+            self._changed()
 
-                        args = []
-                        kwargs = {}
-                        if cls_name.endswith( ')' ):
-                            cls_name, cls_args = cls_name.split( '(', 1 )
+        if self.__pathIndex and self.__index is None and not _BREADCRUMS.get():
+            # the object is loaded, later changes update the index
+            self.__index = PathIndex( self )
 
-                            def fn( *args, **kwargs ):
-                                return args, kwargs
+        return
 
-                            try:
-                                args, kwargs = eval( 'fn( ' + cls_args )
+    @staticmethod
+    def _stopParse( report: ErrorReport, mark: int ) -> bool:
+        """Returns True when the parse of the object shall stop, the limit of
+        the report is reached or the object has too many errors, then the
+        object is reported as skipped.
 
-                            except Exception as exc:
-                                self._error( "object instantiation exception {} on key {} = {} in {}".format( str( exc ),
-                                                                                                              key,
-                                                                                                              value,
-                                                                                                              self.breadCrumPath() ) )
+        :param report:  ErrorReport:    the report of collectErrors()
+        :param mark:    int:            the mark of the report at the start
+                                        of the object
+        :return:        bool:           True/False
+        """
+        if report.stopped():
+            return True
 
-                        cls = getattr( module, cls_name )
-                        try:
-                            setattr( self, key, cls( *args, **kwargs ) )
+        if report.exceeded( mark ):
+            report.skip( mark, _BREADCRUMS.get() )
+            return True
 
-                        except Exception:
-                            self._error( "object instantiation ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
+        return False
 
-                else:
-                    self._error( "primitive ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
+    def __setCollected( self, attr: str, value: object, fset ) -> None:
+        """Calls the property setter within collectErrors(), the ValueError
+        and TypeError of the setter are added to the report.
+        """
+        try:
+            fset( self, value )
 
-            elif type( value ) in ( tuple, list ):
-                if isinstance( var, list ):   # Also decended list classes
-                    for item in value:
-                        var.append( item )
+        except ( ValueError, TypeError ) as exc:
+            self._error( "{} attr {}: {}".format( self.breadCrumPath(), attr, exc ), attr, value, INVALID_VALUE )
 
-                else:
-                    self._error( "array ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
+        return
+
+    def __appendCollected( self, attr: str, value: list, var: list ) -> None:
+        """Appends the items to the list within collectErrors(), the
+        ValueError and TypeError of an item, like a PathList folder that does
+        not exist, are added to the report and the next items are appended.
+        """
+        for item in value:
+            try:
+                var.append( item )
+
+            except ( ValueError, TypeError ) as exc:
+                self._error( "{} attr {}: {}".format( self.breadCrumPath(), attr, exc ), attr, item, INVALID_VALUE )
+
+        return
+
+    def _parseChild( self, child: 'ConfigProcessor', config: dict ) -> None:
+        """Parse the config dictionary into a nested ConfigProcessor object,
+        in lazy mode the parsing is deferred until the child is used.
+
+        :param child:   ConfigProcessor:    the nested object
+        :param config:  dict:               configuration data
+        :return:        None
+        """
+        if object.__getattribute__( child, '__dict__' ).get( '_ConfigProcessor__shared' ):
+            # copy on write
+            child = self.__installChild( child, child._clone() )
+
+        child._throw_exception = self._throw_exception
+        child._lazy = self._lazy
+        if self._lazy:
+            child._deferParseConfig( config )
+            return
+
+        memo = _SHARE_MEMO.get()
+        if memo is None or not isinstance( config, dict ):
+            child.ParseConfig( config )
+            return
+
+        key = self.__shareKey( memo, type( child ), child.name(), config )
+        shared = memo.get( key )
+        if shared is not None:
+            self.__installChild( child, shared )
+            shared._markShared()
+            return
+
+        child.ParseConfig( config )
+        memo[ key ] = child
+        return
+
+    def __shareKey( self, memo: dict, cls: type, name: str, config: dict ) -> tuple:
+        """Returns the key of a nested object in the memo of shareSubtrees().
+        The key is taken from the raw section and not from the nested object,
+        as the object of a wildcard section is not build yet. The class of
+        this object stands for the constructor arguments of the nested one.
+
+        :param memo:    dict:   the memo of shareSubtrees()
+        :param cls:     class:  the class of the nested object
+        :param name:    str:    the name of the nested object
+        :param config:  dict:   configuration data
+        :return:        tuple:  the key
+        """
+        return ( _baseClass( type( self ) ), _baseClass( cls ), name, self.__translatorsKey,
+                 self._throw_exception, _contentKey( config, memo.setdefault( None, {} ) ) )
+
+    def __installChild( self, old: 'ConfigProcessor', new: 'ConfigProcessor' ) -> 'ConfigProcessor':
+        """Replaces all references of the object to the nested object old by
+        the object new.
+
+        :param old:     ConfigProcessor:    the current nested object
+        :param new:     ConfigProcessor:    the replacement
+        :return:        ConfigProcessor:    the replacement
+        """
+        self._checkShared()
+        state = object.__getattribute__( self, '__dict__' )
+        for attr, current in list( state.items() ):
+            if current is old:
+                state[ attr ] = new
+
+        new._setParent( self )
+        self._changed()
+        return new
+
+    def _markShared( self ) -> None:
+        """Marks the object and its nested objects as shared, see
+        shareSubtrees().
+
+        :return:        None
+        """
+        state = object.__getattribute__( self, '__dict__' )
+        if not state.get( '_ConfigProcessor__shared' ):
+            for child in self._children():
+                child._markShared()
+
+            state[ '_ConfigProcessor__shared' ] = True
+            _track( self )
+
+        return
+
+    def _checkShared( self ) -> None:
+        """Raises an AttributeError when the object is shared, shared objects
+        can not be changed.
+
+        :return:        None
+        """
+        if object.__getattribute__( self, '__dict__' ).get( '_ConfigProcessor__shared' ):
+            raise AttributeError( "{} is shared with other sections, use unshare() on its parent "
+                                  "to change it".format( self.name() ) )
+
+        return
+
+    def isShared( self ) -> bool:
+        """Returns True when the object is shared with other sections, see
+        shareSubtrees().
+
+        :return:        bool:   True/False
+        """
+        return bool( object.__getattribute__( self, '__dict__' ).get( '_ConfigProcessor__shared' ) )
+
+    def _clone( self ) -> 'ConfigProcessor':
+        """Returns a private copy of a shared object, the nested objects
+        stay shared and are copied when they are changed.
+
+        :return:        ConfigProcessor:    the copy
+        """
+        clone = copy.copy( self )
+        state = object.__getattribute__( clone, '__dict__' )
+        for attr, value in list( state.items() ):
+            if isinstance( value, ( list, dict ) ):
+                state[ attr ] = copy.copy( value )
+
+        state[ '_ConfigProcessor__shared' ]       = False
+        state[ '_ConfigProcessor__parents' ]      = None
+        state[ '_ConfigProcessor__fingerprint' ]  = None
+        state[ '_ConfigProcessor__index' ]        = None
+        state.pop( '_ConfigProcessor__indexes', None )
+        return clone
+
+    def unshare( self, key: str ) -> 'ConfigProcessor':
+        """Replaces the shared nested object of the key by a private copy
+        that can be changed, see shareSubtrees().
+
+        :param key:     str:    config key of the nested object
+        :return:        ConfigProcessor:    the nested object
+        """
+        plan = _PARSE_PLANS.get( ( type( self ), self.__translatorsKey ) )
+        if plan is None:
+            plan = self._parsePlan()
+
+        entry = plan.get( key )
+        child = entry[ 2 ]( self ) if entry is not None else self.getWildcardValue( key )
+        if not isinstance( child, ConfigProcessor ):
+            raise ValueError( "{} is not a nested ConfigProcessor object".format( key ) )
+
+        if child.isShared():
+            child = self.__installChild( child, child._clone() )
+
+        return child
+
+    def _deferParseConfig( self, config: dict ) -> None:
+        """Keeps the config dictionary to be parsed when a public attribute
+        of the object is read for the first time. Until then the class of the
+        object is swapped for its lazy variant.
+
+        :param config:  dict:   configuration data
+        :return:        None
+        """
+        with _LAZY_LOCK:
+            if self.__pending is None:
+                self.__pending = []
+                self.__class__ = _lazyClass( type( self ) )
+
+            self.__pending.append( ( config, _BREADCRUMS.get() ) )
+            self._changed()
+
+        return
+
+    def _materialize( self ) -> None:
+        """Parses the deferred config dictionaries and swaps the lazy variant
+        back for the class of the object. When the parse fails the object
+        stays in the lazy variant and every access raises the error again.
+
+        :return:        None
+        :raises:        ValueError: the deferred configuration is invalid
+        """
+        # Other threads wait here until the object is parsed completely
+        with _LAZY_LOCK:
+            if self.__pending is None or self.__parsing:
+                # parsed, or read by the parse itself
+                return
+
+            if self.__failed is not None:
+                raise ValueError( self.__failed )
+
+            self.__parsing = True
+            try:
+                for config, crums in self.__pending:
+                    token = _BREADCRUMS.set( crums )
+                    try:
+                        self._LAZY_BASE.ParseConfig( self, config )
+
+                    finally:
+                        _BREADCRUMS.reset( token )
+
+            except Exception as exc:
+                self.__failed = str( exc )
+                raise ValueError( self.__failed ) from exc
+
+            finally:
+                self.__parsing = False
+
+            self.__pending = None
+            self.__class__ = self._LAZY_BASE
+
+        return
+
+    def _children( self ) -> list:
+        """Returns the nested ConfigProcessor objects.
+
+        :return:        list:   ConfigProcessor objects
+        """
+        children = []
+        for prop in _classProperties( type( self ) ).values():
+            value = prop.fget( self )
+            if isinstance( value, ConfigProcessor ):
+                children.append( value )
+
+        for key in self.__wildcards:
+            children.append( self._wildcardItem( key ) )
+
+        return children
+
+    def validate( self ) -> None:
+        """Parses and validates all the sub-trees that were deferred by the
+        lazy mode, for example to check a configuration in CI.
+
+        :return:        None
+        """
+        for child in self._children():
+            child.validate()
+
+        return
+
+    def _getParsePlan( self ) -> dict:
+        """Returns the cached parse plan of the class, see _parsePlan().
+
+        :return:        dict:   the parse plan
+        """
+        plan = _PARSE_PLANS.get( ( type( self ), self.__translatorsKey ) )
+        if plan is None:
+            plan = self._parsePlan()
+
+        return plan
 
-            elif isinstance( var, ConfigProcessor ):
-                var._throw_exception = self._throw_exception
-                var.ParseConfig( value )
+    def _parsePlan( self ) -> dict:
+        """Builds the parse plan for the class of this object and caches it.
+
+        The plan maps every accepted configuration key, including the keys
+        from the translators, onto a tuple of ( attribute name, value kind,
+        getter, setter, default type ). The value kind is derived from the
+        default value that the constructor did set on the property.
+
+        :return:        dict:   the parse plan
+        """
+        # the variants of a class use the plan of the class, the defaults of
+        # a tracked object were already replaced by the parsed values
+        base = _baseClass( type( self ) )
+        plan = _PARSE_PLANS.get( ( base, self.__translatorsKey ) )
+        if plan is not None:
+            _PARSE_PLANS[ ( type( self ), self.__translatorsKey ) ] = plan
+            return plan
+
+        properties = _classProperties( type( self ) )
+        plan = {}
+        for attr, prop in properties.items():
+            default = prop.fget( self )
+            if isinstance( default, ConfigProcessor ):
+                kind = _PROCESSOR
+
+            elif isinstance( default, list ):   # Also decended list classes
+                kind = _LIST
+
+            elif default is None or type( default ) in _PRIMITIVES:
+                kind = _PRIMITIVE
 
             else:
-                self._error( "unknown ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ) )
+                kind = _OBJECT
+
+            plan[ attr ] = ( attr, kind, prop.fget, prop.fset, None if default is None else type( default ) )
+
+        for key, attr in self.__translators.items():
+            if attr in plan:
+                plan[ key ] = plan[ attr ]
+
+            else:
+                plan.pop( key, None )
+
+        _PARSE_PLANS[ ( base, self.__translatorsKey ) ] = plan
+        _PARSE_PLANS[ ( type( self ), self.__translatorsKey ) ] = plan
+        return plan
+
+    def __parseWildcard( self, key: str, value: any ) -> None:
+        """Parse a key that is not a property of the class into a wildcard
+        object.
+
+        :param key:     str:    name of the wildcard object
+        :param value:   dict:   configuration data
+        :return:        None
+        """
+        if key in self.__translators:
+            self._error( "{} has no attr {}".format( self.breadCrumPath(), self.__translators[ key ] ),
+                         key, value, UNKNOWN_KEY )
+            return
+
+        if not self.__wildcard or hasattr( type( self ), key ):
+            self._error( "{} has no attr {}".format( self.breadCrumPath(), key ), key, value, UNKNOWN_KEY )
+            return
+
+        raw = self.__wildcardRaw.get( key )
+        if raw is None:
+            var = self.__dict__.get( key )
+            if var is None:
+                self.__wildcards[ key ] = None
+                if self.__wildcardActive is not None and key not in self.__wildcardActive:
+                    raw = self.__wildcardRaw[ key ] = []
+
+                else:
+                    memo = _SHARE_MEMO.get()
+                    if memo is not None and not self._lazy and isinstance( value, dict ):
+                        shared = memo.get( self.__shareKey( memo, self.__wildcardObject, key, value ) )
+                        if shared is not None:
+                            setattr( self, key, shared )
+                            shared._markShared()
+                            return
+
+                    var = self.__wildcardObject( key, **self.__wildcardKwargs )
+                    setattr( self, key, var )
+
+        if raw is not None:
+            # not an active wildcard, the object is build when it is used
+            if isinstance( value, dict ):
+                raw.append( ( value, _BREADCRUMS.get() ) )
 
-        self._BREADCRUMS.pop()
+            else:
+                self._error( "unknown ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ),
+                             key, value, WRONG_TYPE )
+
+            return
+
+        if isinstance( value, dict ):
+            self._parseChild( var, value )
+
+        else:
+            self._error( "unknown ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ),
+                         key, value, WRONG_TYPE )
+
+        return
+
+    def __parseImportSpec( self, key: str, value: str, fset ) -> None:
+        """Instantiate the object from the import specification
+        'module.Class' or 'module.Class( args )' and set it on the property.
+
+        :param key:     str:    name of the property
+        :param value:   str:    import specification
+        :param fset:    func:   the property setter
+        :return:        None
+        """
+        try:
+            path, args, kwargs = parseImportSpec( value )
+
+        except ValueError as exc:
+            self._error( "object instantiation exception {} on key {} = {} in {}".format( str( exc ),
+                                                                                          key,
+                                                                                          value,
+                                                                                          self.breadCrumPath() ),
+                         key, value, INVALID_VALUE )
+            return
+
+        try:
+            cls = resolveCallable( path )
+
+        except ImportError:
+            # support importing modules not yet set up by the parent module
+            # (or package for that matter)
+            self._error( "import ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ),
+                         key, value, IMPORT_FAILED )
+            return
+
+        if fset is None:
+            self._error( "{} attr {} is read-only".format( self.breadCrumPath(), key ), key, value, READ_ONLY )
+            return
+
+        try:
+            obj = cls( *args, **kwargs )
+            fset( self, obj )
+
+        except Exception:
+            self._error( "object instantiation ERROR: key {} = {} in {}".format( key, value, self.breadCrumPath() ),
+                         key, value, INSTANTIATION )
+            return
+
+        # diff() compares the object by its specification, see _compareItems()
+        state = self.__dict__
+        specs = state.get( '_ConfigProcessor__specs' )
+        if specs is None:
+            specs = state[ '_ConfigProcessor__specs' ] = {}
+
+        specs[ key ] = ( obj, value )
         return
 
     def props( self ) -> dict:
@@ -260,26 +1425,69 @@ class ConfigProcessor( object ):
 
         :return:        dict:   dictionary with the properies and value
         """
-        pr = {}
-        for name in dir( self ):
-            value = getattr( self, name )
-            if not name.startswith( '_' ) and not inspect.ismethod( value ):
-                if len( self.__translators ):
-                    found = False
-                    for key1, key2 in self.__translators.items():
-                        if key2 == name:
-                            pr[ key1 ] = value
-                            found = True
-                            break
-
-                    if not found:
-                        pr[ name ] = value
+        registry = _PROPS_REGISTRY.get( ( type( self ), self.__translatorsKey ) )
+        if registry is None:
+            registry = self._propsRegistry()
 
-                else:
-                    pr[ name ] = value
+        pr = { key: fget( self ) for key, fget in registry }
+        state = self.__dict__
+        for key in self.__wildcards:
+            value = state.get( key )
+            pr[ key ] = value if value is not None else self._wildcardItem( key )
 
         return pr
 
+    def _propsRegistry( self ) -> tuple:
+        """Builds the registry of the properties for props() and caches it
+        per class and translators.
+
+        The properties are taken from _classProperties(), ordered by name,
+        with the name translated back to the configuration key.
+
+        :return:        tuple:  ( config key, getter ) per property
+        """
+        reverse = {}
+        for key, attr in self.__translators.items():
+            reverse.setdefault( attr, key )
+
+        properties = _classProperties( type( self ) )
+        registry = tuple( ( reverse.get( name, name ), properties[ name ].fget ) for name in sorted( properties ) )
+        _PROPS_REGISTRY[ ( type( self ), self.__translatorsKey ) ] = registry
+        return registry
+
+    def configItems( self ):
+        """Yields the key and value pairs that can be saved and loaded again,
+        values are a primitive, a list or a nested ConfigProcessor object.
+
+        An object build from an import specification yields the
+        specification string. None values, read-only primitive properties
+        and other objects are skipped as ParseConfig cannot load them back.
+
+        :return:        generator:  ( config key, value ) pairs
+        """
+        plan = _PARSE_PLANS.get( ( type( self ), self.__translatorsKey ) )
+        if plan is None:
+            plan = self._parsePlan()
+
+        specs = self.__dict__.get( '_ConfigProcessor__specs' )
+        specs = { id( obj ): spec for obj, spec in specs.values() } if specs else None
+        for key, value in self.props().items():
+            if specs is not None and id( value ) in specs:
+                yield key, specs[ id( value ) ]
+
+            elif isinstance( value, ConfigProcessor ):
+                yield key, value
+
+            elif isinstance( value, ( list, tuple ) ):
+                yield key, list( value )
+
+            elif isinstance( value, _PRIMITIVES ):
+                entry = plan.get( key )
+                if entry is None or entry[ 3 ] is not None:
+                    yield key, value
+
+        return
+
     def BuildConfig( self ) -> dict:
         """Create a dictionary of the data in the class and ConfigProcessor
         sub-classes.
@@ -287,7 +1495,7 @@ class ConfigProcessor( object ):
         :return:        dict:   dictionary with the properies and value
         """
         config = {}
-        for key, value in self.props():
+        for key, value in self.configItems():
             if isinstance( value, ConfigProcessor ):
                 config[ key ] = value.BuildConfig()
 
@@ -296,6 +1504,121 @@ class ConfigProcessor( object ):
 
         return config
 
+    def getFingerprint( self ) -> bytes:
+        """Returns the fingerprint of the object, a digest of the keys and
+        values of the object and the fingerprints of the nested objects.
+        The fingerprint is cached until a setter changes the object or one
+        of its nested objects, from now on the object tracks its changes.
+
+        :return:        bytes:  the fingerprint
+        """
+        fingerprint = self.__fingerprint
+        if fingerprint is None:
+            _track( self )
+            digest = hashlib.blake2b( repr( _baseClass( type( self ) ) ).encode(), digest_size = 16 )
+            for key, value in self._compareItems():
+                digest.update( repr( key ).encode() )
+                digest.update( b'\0' )
+                if isinstance( value, ConfigProcessor ):
+                    # the parent is invalidated when the nested object changes
+                    value._setParent( self )
+                    digest.update( value.getFingerprint() )
+
+                else:
+                    digest.update( repr( value ).encode() )
+
+                digest.update( b'\0' )
+
+            fingerprint = self.__fingerprint = digest.digest()
+
+        return fingerprint
+
+    def _diffItems( self ):
+        """Returns the key and value pairs of the object for the path
+        index, see saiti.pathindex.
+
+        :return:        iterable:   ( config key, value ) pairs
+        """
+        return self.props().items()
+
+    def _compareItems( self ):
+        """Yields the key and value pairs that are compared by diff() and
+        getFingerprint(). An object build from an import specification is
+        compared by its specification, as most objects do not implement
+        equality, and a wildcard section kept as raw data is compared by
+        its data, so it is not build.
+
+        :return:        generator:  ( config key, value ) pairs
+        """
+        registry = _PROPS_REGISTRY.get( ( type( self ), self.__translatorsKey ) )
+        if registry is None:
+            registry = self._propsRegistry()
+
+        state = self.__dict__
+        specs = state.get( '_ConfigProcessor__specs' )
+        specs = { id( obj ): spec for obj, spec in specs.values() } if specs else None
+        for key, fget in registry:
+            value = fget( self )
+            if specs is not None and id( value ) in specs:
+                value = _SpecValue( specs[ id( value ) ] )
+
+            yield key, value
+
+        for key in self.__wildcards:
+            raw = self.__wildcardRaw.get( key )
+            if raw is not None:
+                yield key, _RawSection( tuple( config for config, crums in raw ) )
+
+            else:
+                yield key, self._wildcardItem( key )
+
+        return
+
+    @staticmethod
+    def diff( old: 'ConfigProcessor', new: 'ConfigProcessor' ) -> ConfigDiff:
+        """Compares two configuration trees, nested objects with the same
+        fingerprint are skipped so the cost depends on the size of the change.
+
+        :param old:     ConfigProcessor:    the previous configuration
+        :param new:     ConfigProcessor:    the new configuration
+        :return:        ConfigDiff:         the added, removed and changed
+                                            paths, a path is a tuple of keys
+        """
+        result = ConfigDiff( [], [], [] )
+        _diffNodes( old, new, (), result )
+        return result
+
+    def freeze( self ) -> 'FrozenConfig':
+        """Returns a read-only snapshot of the configuration tree. The values
+        are read by plain attribute access with the property names and the
+        wildcard keys, lists become tuples and the nested objects are frozen
+        as well. The snapshot is hashable and can be shared between threads.
+
+        :return:        FrozenConfig:   the snapshot, see saiti.frozen
+        """
+        keys    = []
+        values  = []
+        for key, value in self._freezeItems():
+            keys.append( key )
+            values.append( value.freeze() if isinstance( value, ConfigProcessor ) else freezeValue( value ) )
+
+        return frozenClass( type( self ).__name__, tuple( keys ) )( tuple( values ) )
+
+    def _freezeItems( self ):
+        """Yields the attribute name and value pairs for freeze(), the
+        properties by name and the wildcard objects.
+
+        :return:        generator:  ( name, value ) pairs
+        """
+        properties = _classProperties( type( self ) )
+        for name in sorted( properties ):
+            yield name, properties[ name ].fget( self )
+
+        for key in self.__wildcards:
+            yield key, self._wildcardItem( key )
+
+        return
+
     def _dump_element( self, key, value, indent: int, printer ):
         indentStr = " " * indent
         if isinstance( value, ( int, str, float, bool, list, tuple ) ):
@@ -335,7 +1658,7 @@ class ConfigProcessor( object ):
             print( data, file = stream )
             return
 
-        self._dump( self, 0, printer )
+        self._dump( 0, printer )
         return
 
     def dump2log( self, logger = 'root', level = logging.DEBUG ):
@@ -345,5 +1668,5 @@ class ConfigProcessor( object ):
             log.log( level, data )
             return
 
-        self._dump( self, 0, printer )
+        self._dump( 0, printer )
         return
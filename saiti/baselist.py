@@ -18,7 +18,7 @@
 # MA  02110-1301, USA.
 #
 import sys
-from saiti.base import ConfigProcessor
+from saiti.base import ConfigProcessor, _ERROR_REPORT
 
 class ConfigProcessorList( ConfigProcessor ):
     """The list class to process a configuration object
@@ -48,26 +48,74 @@ class ConfigProcessorList( ConfigProcessor ):
         :param config:  dict:   configuration data
         :return:
         """
-        self._BREADCRUMS.append( self.name() )
-        for key, value in config.items():
-            obj = self.newObject( key, value )
-            obj._throw_exception = self._throw_exception
-            obj.ParseConfig( value )
-            self.__list.append( obj )
-
-        self._BREADCRUMS.pop()
+        self._checkShared()
+        report = _ERROR_REPORT.get()
+        mark = report.mark() if report is not None else 0
+        token = self._enterBreadCrum()
+        try:
+            for key, value in config.items():
+                if report is not None and self._stopParse( report, mark ):
+                    break
+
+                obj = self.newObject( key, value )
+                obj._throw_exception = self._throw_exception
+                obj.ParseConfig( value )
+                obj._setParent( self )
+                self.__list.append( obj )
+
+            self._changed()
+
+        finally:
+            self._leaveBreadCrum( token )
+
+        return
+
+    def _children( self ) -> list:
+        """Returns the ConfigProcessor objects in the list.
+
+        :return:        list:   ConfigProcessor objects
+        """
+        return list( self.__list )
+
+    def configItems( self ):
+        """Yields the name and object of the items in the list.
+
+        :return:        generator:  ( name, ConfigProcessor ) pairs
+        """
+        for item in self.__list:
+            yield item.name(), item
+
         return
 
+    def _diffItems( self ):
+        """Returns the name and object of the items for the path index.
+
+        :return:        iterable:   ( name, ConfigProcessor ) pairs
+        """
+        return self.configItems()
+
+    def _compareItems( self ):
+        """Returns the name and object of the items for diff() and
+        getFingerprint().
+
+        :return:        iterable:   ( name, ConfigProcessor ) pairs
+        """
+        return self.configItems()
+
+    def _freezeItems( self ):
+        """Yields the name and object of the items for freeze().
+
+        :return:        generator:  ( name, ConfigProcessor ) pairs
+        """
+        return self.configItems()
+
     def BuildConfig( self ) -> dict:
         """Create a dictionary of the data in the class and ConfigProcessor
         sub-classes.
 
         :return:        dict:   dictionary with the properies and value
         """
-        config = []
-        # TODO: create the list data object
-
-        return config
+        return { name: item.BuildConfig() for name, item in self.configItems() }
 
     def props( self ) -> dict:
         """Creates the dictionary object with propery keys and values of
@@ -0,0 +1,118 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from saiti.file import YamlConfigFile, JsonConfigFile
+
+
+BulkResult = namedtuple( 'BulkResult', [ 'filename', 'config', 'error' ] )
+BulkResult.__doc__ = """Result of one file of loadConfigFiles(), either config is the
+loaded root object or error holds the exception raised while loading.
+"""
+
+
+def _readDocument( rootClass, filename: str, kwargs: dict ) -> tuple:
+    """Reads the document of one file in the worker process.
+
+    :return:    tuple:  ( document, None ) or ( None, exception )
+    """
+    try:
+        return rootClass( filename, loadLater = True, **kwargs ).LoadDocument(), None
+
+    except Exception as exc:
+        return None, exc
+
+
+def _loadFile( rootClass, filename: str, kwargs: dict ) -> BulkResult:
+    """Loads one file completely in the worker thread.
+    """
+    try:
+        config = rootClass( filename, loadLater = True, **kwargs )
+        config.Load()
+        return BulkResult( filename, config, None )
+
+    except Exception as exc:
+        return BulkResult( filename, None, exc )
+
+
+def _needsLoad( rootClass, kwargs: dict ) -> bool:
+    """Returns True when the files must be loaded with Load(), because the
+    root class overrides it or reads JSON in streaming mode, the document
+    is then not read in another process.
+    """
+    return kwargs.get( 'streaming', False ) or rootClass.Load not in ( YamlConfigFile.Load, JsonConfigFile.Load )
+
+
+def loadConfigFiles( filenames: list, rootClass, mode: str = 'process',
+                     workers: int = None, **kwargs ) -> list:
+    """Loads many configuration files of the same root class.
+
+    In 'process' mode the YAML/JSON documents are parsed in a process pool
+    and the ConfigProcessor trees are build in the calling process. In
+    'thread' mode each file is loaded completely by a thread pool, this
+    suits I/O bound cases such as files on network storage. A root class
+    that overrides Load(), or the keyword streaming = True, is always
+    loaded in 'thread' mode. The other options, like share, are applied
+    by ParseDocument().
+
+    The root class must be derived from YamlConfigFile or JsonConfigFile
+    and accept the keyword loadLater, in process mode it must also be
+    importable by the worker processes.
+
+    :param filenames:   list:   the configuration filenames
+    :param rootClass:   class:  the root class of the configuration files
+    :param mode:        str:    'process' or 'thread'
+    :param workers:     int:    the number of workers, default by the pool
+    :param kwargs:      dict:   keywords for the root class
+    :return:            list:   BulkResult per file, in the order of filenames
+    """
+    filenames = list( filenames )
+    if mode not in ( 'process', 'thread' ):
+        raise ValueError( "mode must be 'process' or 'thread'" )
+
+    if mode == 'thread' or _needsLoad( rootClass, kwargs ):
+        with ThreadPoolExecutor( max_workers = workers ) as executor:
+            return list( executor.map( _loadFile,
+                                       [ rootClass ] * len( filenames ),
+                                       filenames,
+                                       [ kwargs ] * len( filenames ) ) )
+
+    chunksize = max( 1, len( filenames ) // ( ( workers or os.cpu_count() or 1 ) * 4 ) )
+    results = []
+    with ProcessPoolExecutor( max_workers = workers ) as executor:
+        documents = executor.map( _readDocument,
+                                  [ rootClass ] * len( filenames ),
+                                  filenames,
+                                  [ kwargs ] * len( filenames ),
+                                  chunksize = chunksize )
+        for filename, ( document, error ) in zip( filenames, documents ):
+            if error is None:
+                try:
+                    config = rootClass( filename, loadLater = True, **kwargs )
+                    config.ParseDocument( document )
+                    results.append( BulkResult( filename, config, None ) )
+                    continue
+
+                except Exception as exc:
+                    error = exc
+
+            results.append( BulkResult( filename, None, error ) )
+
+    return results
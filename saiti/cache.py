@@ -0,0 +1,187 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import os
+import stat
+import marshal
+import hashlib
+import tempfile
+
+
+CACHE_VERSION = 2
+
+
+class ConfigCache( object ):
+    """On-disk cache of parsed configuration documents.
+
+    The cache entry of a configuration file holds the parser, path,
+    modification time, size and SHA-256 hash of the file, followed by the
+    document in marshal format. When the file or the parser changed the
+    entry is rebuilt, so the parser only runs when the file is new or
+    changed.
+
+    Only plain data (dict, list, str, numbers, ...) is cached, a document
+    with other objects is parsed on every load. An entry is only read when
+    it is a regular file of the current user that others can not write.
+    """
+    def __init__( self, directory: str = None ):
+        """Constructor of the cache
+
+        :param directory:   str:    folder to store the cache files in, when
+                                    omitted the cache file is stored next to
+                                    the configuration file as .<name>.cache
+        """
+        self.__directory    = directory
+        if directory is not None:
+            os.makedirs( directory, exist_ok = True )
+
+        return
+
+    def cacheFilename( self, filename: str ) -> str:
+        """Returns the filename of the cache entry of the configuration file.
+
+        :param filename:    str:    configuration filename
+        :return:            str:    cache filename
+        """
+        filename = os.path.abspath( filename )
+        if self.__directory is None:
+            folder, name = os.path.split( filename )
+            return os.path.join( folder, '.{}.cache'.format( name ) )
+
+        digest = hashlib.sha1( filename.encode( 'utf-8' ) ).hexdigest()
+        return os.path.join( self.__directory, '{}.cache'.format( digest ) )
+
+    def load( self, filename: str, parser, parserName: str ) -> tuple:
+        """Loads the document of the configuration file from the cache, or
+        parses the file and stores the document in the cache.
+
+        :param filename:    str:    configuration filename
+        :param parser:      func:   called with the file content (bytes) to
+                                    parse the document
+        :param parserName:  str:    name of the parser and its mode, like
+                                    'yaml.SafeLoader', an entry is only used
+                                    by the same parser
+        :return:            tuple:  the document and True when it was loaded
+                                    from the cache
+        """
+        filename    = os.path.abspath( filename )
+        with open( filename, 'rb' ) as stream:
+            info    = os.fstat( stream.fileno() )
+            data    = stream.read()
+
+        key         = ( CACHE_VERSION, marshal.version, parserName, filename,
+                        info.st_mtime_ns, info.st_size, hashlib.sha256( data ).hexdigest() )
+        cache       = self.cacheFilename( filename )
+        try:
+            with open( cache, 'rb' ) as stream:
+                if self.trusted( os.fstat( stream.fileno() ) ) and marshal.load( stream ) == key:
+                    return marshal.load( stream ), True
+
+        except ( OSError, EOFError, ValueError, TypeError ):
+            pass
+
+        document = parser( data )
+        self.store( cache, key, document )
+        return document, False
+
+    @staticmethod
+    def trusted( info: os.stat_result ) -> bool:
+        """Returns True when the cache entry may be read, a regular file of
+        the current user that can not be written by the group or others.
+
+        :param info:    stat_result:    the status of the cache entry
+        :return:        bool:           True/False
+        """
+        if not stat.S_ISREG( info.st_mode ) or info.st_mode & ( stat.S_IWGRP | stat.S_IWOTH ):
+            return False
+
+        return not hasattr( os, 'getuid' ) or info.st_uid == os.getuid()
+
+    def store( self, cache: str, key: tuple, document: object ) -> None:
+        """Writes the cache entry atomically; the entry is written into a
+        temporary file that is renamed over the old entry.
+
+        :param cache:       str:    cache filename
+        :param key:         tuple:  the key of the configuration file
+        :param document:    object: the parsed document
+        :return:            None
+        """
+        try:
+            data = marshal.dumps( key ) + marshal.dumps( document )
+
+        except ValueError:
+            # not plain data, the document is not cached
+            return
+
+        folder = os.path.dirname( cache )
+        try:
+            fd, tmpname = tempfile.mkstemp( dir = folder, prefix = '.saiti-', suffix = '.tmp' )
+
+        except OSError:
+            # A read-only location only disables the cache
+            return
+
+        try:
+            with os.fdopen( fd, 'wb' ) as stream:
+                stream.write( data )
+
+            os.replace( tmpname, cache )
+
+        except Exception:
+            os.remove( tmpname )
+            raise
+
+        return
+
+    def invalidate( self, filename: str ) -> None:
+        """Removes the cache entry of the configuration file.
+
+        :param filename:    str:    configuration filename
+        :return:            None
+        """
+        try:
+            os.remove( self.cacheFilename( filename ) )
+
+        except FileNotFoundError:
+            pass
+
+        return
+
+
+def createCache( cache ) -> ConfigCache:
+    """Creates the cache object from the 'cache' keyword of the file classes.
+
+    :param cache:   None:           no cache
+                    bool:           True, cache next to the configuration file
+                    str:            the folder to store the cache files in
+                    ConfigCache:    the cache object to use
+    :return:        ConfigCache:    or None when no cache is used
+    """
+    if cache is None or cache is False:
+        return None
+
+    elif cache is True:
+        return ConfigCache()
+
+    elif isinstance( cache, str ):
+        return ConfigCache( cache )
+
+    elif isinstance( cache, ConfigCache ):
+        return cache
+
+    raise ValueError( "cache must be a bool, folder name or ConfigCache object" )
@@ -0,0 +1,142 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Structured report of the errors found while parsing a configuration,
+see saiti.base.collectErrors().
+"""
+import collections
+
+
+# Reasons of the errors
+UNKNOWN_KEY         = 'unknown-key'
+READ_ONLY           = 'read-only'
+WRONG_TYPE          = 'wrong-type'
+INVALID_VALUE       = 'invalid-value'
+IMPORT_FAILED       = 'import-failed'
+INSTANTIATION       = 'instantiation-failed'
+SUBTREE_SKIPPED     = 'subtree-skipped'
+
+# One error, path is the tuple of the object names from the root, type is
+# the name of the type of the value or None
+ConfigError         = collections.namedtuple( 'ConfigError', ( 'path', 'key', 'type', 'reason', 'message' ) )
+
+
+class ErrorReport( object ):
+    """Collects the errors of a parse instead of raising or printing them.
+
+    The report stops the parse when it holds limit errors, see stopped(). A
+    nested object that gets more than subtreeLimit errors is not parsed any
+    further, its errors are kept and it counts as one error for the
+    subtree limit of its parents.
+    """
+    def __init__( self, limit: int = None, subtreeLimit: int = None ):
+        """Constructor of the report
+
+        :param limit:           int:    maximum number of errors, None no limit
+        :param subtreeLimit:    int:    maximum number of errors of a nested
+                                        object, None no limit
+        """
+        self.__limit        = limit
+        self.__subtreeLimit = subtreeLimit
+        self.__errors       = []
+        # the error count for the subtree limits
+        self.__weight       = 0
+        self.__truncated    = False
+        return
+
+    @property
+    def errors( self ) -> list:
+        """The ConfigError tuples in the order they were found
+        """
+        return self.__errors
+
+    @property
+    def truncated( self ) -> bool:
+        """True when the parse was stopped at the limit
+        """
+        return self.__truncated
+
+    def __len__( self ) -> int:
+        return len( self.__errors )
+
+    def __iter__( self ):
+        return iter( self.__errors )
+
+    def add( self, error: ConfigError ) -> None:
+        """Adds an error, errors beyond the limit are dropped.
+
+        :param error:   ConfigError:    the error
+        :return:        None
+        """
+        if self.__limit is not None and len( self.__errors ) >= self.__limit:
+            self.__truncated = True
+            return
+
+        self.__errors.append( error )
+        self.__weight += 1
+        return
+
+    def stopped( self ) -> bool:
+        """Returns True when the limit is reached and the parse shall stop
+
+        :return:        bool:   True/False
+        """
+        if self.__limit is not None and len( self.__errors ) >= self.__limit:
+            self.__truncated = True
+            return True
+
+        return False
+
+    def mark( self ) -> int:
+        """Returns the error count at the start of a nested object, to pass
+        to exceeded() and skip().
+
+        :return:        int:    the mark
+        """
+        return self.__weight
+
+    def exceeded( self, mark: int ) -> bool:
+        """Returns True when the object started at mark got more errors than
+        the subtree limit.
+
+        :param mark:    int:    the mark returned by mark()
+        :return:        bool:   True/False
+        """
+        return self.__subtreeLimit is not None and self.__weight - mark > self.__subtreeLimit
+
+    def skip( self, mark: int, path: tuple ) -> None:
+        """Records that the rest of the object at the path is skipped, for
+        its parents the object counts as one error from now on.
+
+        :param mark:    int:    the mark returned by mark()
+        :param path:    tuple:  the path of the object
+        :return:        None
+        """
+        errors = self.__weight - mark
+        self.__errors.append( ConfigError( path, None, None, SUBTREE_SKIPPED,
+                                           "{} skipped after {} errors".format( "->".join( path ), errors ) ) )
+        self.__weight = mark + 1
+        return
+
+    def asDicts( self ) -> list:
+        """Returns the errors as dictionaries, for example to write them
+        as JSON.
+
+        :return:        list:   a dictionary per error
+        """
+        return [ dict( error._asdict(), path = list( error.path ) ) for error in self.__errors ]
@@ -18,22 +18,357 @@
 # MA  02110-1301, USA.
 #
 import os
-from saiti.base import ConfigProcessor
+import re
+import shutil
+import tempfile
+import threading
+import contextlib
+from saiti.base import ConfigProcessor, shareSubtrees, _PROCESSOR, _SHARE_MEMO
+from saiti.baselist import ConfigProcessorList
+from saiti.cache import createCache
 import yaml
 import json
 
 
+# Loader modes with the libyaml loader and its pure-Python fallback
+YAML_LOADERS = {
+    'safe':     ( 'CSafeLoader', 'SafeLoader' ),
+    'unsafe':   ( 'CLoader',     'Loader' ),
+}
+
+
+def selectYamlLoader( mode: str = 'safe', libyaml: bool = True ) -> type:
+    """Selects the YAML loader class for the mode, the libyaml (C) loader
+    when available, otherwise the pure-Python loader.
+
+    :param mode:        str:    'safe' only constructs standard YAML tags,
+                                'unsafe' also constructs Python objects.
+    :param libyaml:     bool:   False forces the pure-Python loader.
+    :return:            class:  the yaml loader class
+    """
+    if mode not in YAML_LOADERS:
+        raise ValueError( "loader must be one of {}".format( ", ".join( YAML_LOADERS.keys() ) ) )
+
+    c_loader, py_loader = YAML_LOADERS[ mode ]
+    if libyaml and hasattr( yaml, c_loader ):
+        return getattr( yaml, c_loader )
+
+    return getattr( yaml, py_loader )
+
+
+def saveAtomic( filename: str, write ) -> None:
+    """Writes a file through a temporary file in the same folder, which is
+    renamed to the filename when complete. Readers never see a partial file
+    and the original file is kept when the write fails.
+
+    :param filename:    str:    the file to write
+    :param write:       func:   called with the text stream to write to
+    :return:            None
+    """
+    folder = os.path.dirname( os.path.abspath( filename ) )
+    fd, tmpname = tempfile.mkstemp( dir = folder, prefix = '.saiti-', suffix = '.tmp' )
+    try:
+        with os.fdopen( fd, 'wt' ) as stream:
+            write( stream )
+            stream.flush()
+            os.fsync( stream.fileno() )
+
+        if os.path.exists( filename ):
+            shutil.copymode( filename, tmpname )
+
+        else:
+            os.chmod( tmpname, 0o644 )
+
+        os.replace( tmpname, filename )
+
+    except BaseException:
+        try:
+            os.unlink( tmpname )
+
+        except OSError:
+            pass
+
+        raise
+
+    return
+
+
+def _yamlNodeEvents( dumper, node ):
+    """Yields the YAML events of a represented node, like the serializer
+    does, without anchors and aliases.
+    """
+    if isinstance( node, yaml.ScalarNode ):
+        implicit = ( node.tag == dumper.resolve( yaml.ScalarNode, node.value, ( True, False ) ),
+                     node.tag == dumper.resolve( yaml.ScalarNode, node.value, ( False, True ) ) )
+        yield yaml.ScalarEvent( None, node.tag, implicit, node.value, style = node.style )
+
+    elif isinstance( node, yaml.SequenceNode ):
+        implicit = node.tag == dumper.resolve( yaml.SequenceNode, node.value, True )
+        yield yaml.SequenceStartEvent( None, node.tag, implicit, flow_style = node.flow_style )
+        for item in node.value:
+            yield from _yamlNodeEvents( dumper, item )
+
+        yield yaml.SequenceEndEvent()
+
+    else:
+        implicit = node.tag == dumper.resolve( yaml.MappingNode, node.value, True )
+        yield yaml.MappingStartEvent( None, node.tag, implicit, flow_style = node.flow_style )
+        for key, value in node.value:
+            yield from _yamlNodeEvents( dumper, key )
+            yield from _yamlNodeEvents( dumper, value )
+
+        yield yaml.MappingEndEvent()
+
+    return
+
+
+def _yamlValueEvents( dumper, value ):
+    """Yields the YAML events of a key or value
+    """
+    node = dumper.represent_data( value )
+    # the representer remembers the objects of the document, one value is
+    # represented at a time so they are released directly
+    dumper.represented_objects  = {}
+    dumper.object_keeper        = []
+    dumper.alias_key            = None
+    return _yamlNodeEvents( dumper, node )
+
+
+def yamlEvents( dumper, obj: ConfigProcessor ):
+    """Yields the YAML events of the configuration object, walking the
+    ConfigProcessor tree.
+
+    :param dumper:      yaml.Dumper:        dumper to represent the values
+    :param obj:         ConfigProcessor:    the configuration object
+    :return:            generator:          YAML events of the mapping
+    """
+    yield yaml.MappingStartEvent( None, None, True, flow_style = False )
+    for key, value in obj.configItems():
+        yield from _yamlValueEvents( dumper, key )
+        if isinstance( value, ConfigProcessor ):
+            yield from yamlEvents( dumper, value )
+
+        else:
+            yield from _yamlValueEvents( dumper, value )
+
+    yield yaml.MappingEndEvent()
+    return
+
+
+def jsonChunks( obj: ConfigProcessor, indent: str = '' ):
+    """Yields the JSON text of the configuration object in chunks, walking
+    the ConfigProcessor tree. The layout is the same as json.dump() with an
+    indent of 4.
+
+    :param obj:         ConfigProcessor:    the configuration object
+    :param indent:      str:                indent of the object
+    :return:            generator:          JSON text chunks
+    """
+    inner = indent + '    '
+    first = True
+    yield '{'
+    for key, value in obj.configItems():
+        yield '{0}{1}{2}: '.format( '\n' if first else ',\n', inner, json.dumps( str( key ) ) )
+        first = False
+        if isinstance( value, ConfigProcessor ):
+            yield from jsonChunks( value, inner )
+
+        else:
+            # JSON text never holds a raw newline inside a string
+            yield json.dumps( value, indent = 4 ).replace( '\n', '\n' + inner )
+
+    yield '}' if first else '\n{}}}'.format( indent )
+    return
+
+
+# Characters read per chunk by the streaming JSON loader
+JSON_CHUNK_SIZE = 65536
+_JSON_WHITESPACE = re.compile( r'[ \t\n\r]*' )
+
+
+class JsonStreamReader( object ):
+    """Reads a JSON document from a text stream in chunks. The objects are
+    walked member by member with members(), a member value is read
+    completely with value(), so only the value being read is held in
+    memory.
+    """
+    def __init__( self, stream, chunkSize: int = JSON_CHUNK_SIZE ):
+        """Constructor of the reader
+
+        :param stream:      file:   text stream of the JSON document
+        :param chunkSize:   int:    number of characters to read per chunk
+        """
+        self.__stream   = stream
+        self.__chunk    = chunkSize
+        self.__buffer   = ''
+        self.__pos      = 0
+        self.__eof      = False
+        self.__decoder  = json.JSONDecoder()
+        return
+
+    def __fill( self, size: int ) -> bool:
+        """Reads the next chunk, the characters before the current position
+        are dropped.
+
+        :return:    bool:   False at the end of the stream
+        """
+        data = self.__stream.read( size )
+        if not data:
+            self.__eof = True
+            return False
+
+        self.__buffer = self.__buffer[ self.__pos: ] + data
+        self.__pos = 0
+        return True
+
+    def __fail( self, message: str ) -> None:
+        raise json.JSONDecodeError( message, self.__buffer, self.__pos )
+
+    def peek( self ) -> str:
+        """Skips the whitespace and returns the next character, an empty
+        string at the end of the document.
+        """
+        while True:
+            self.__pos = _JSON_WHITESPACE.match( self.__buffer, self.__pos ).end()
+            if self.__pos < len( self.__buffer ):
+                return self.__buffer[ self.__pos ]
+
+            if not self.__fill( self.__chunk ):
+                return ''
+
+    def expect( self, char: str ) -> None:
+        """Reads the expected character
+        """
+        if self.peek() != char:
+            self.__fail( "Expecting '{}'".format( char ) )
+
+        self.__pos += 1
+        return
+
+    def value( self ) -> object:
+        """Reads the next value completely
+
+        :return:    object: the value
+        """
+        if self.peek() == '':
+            self.__fail( 'Expecting value' )
+
+        size = self.__chunk
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode( self.__buffer, self.__pos )
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len( self.__buffer ) or self.__eof:
+                    self.__pos = end
+                    return value
+
+            except json.JSONDecodeError:
+                if self.__eof:
+                    raise
+
+            self.__fill( size )
+            size *= 2
+
+    def members( self ):
+        """Reads an object member by member, the value of a member must be
+        read before the next member is requested.
+
+        :return:    generator:  the keys of the members
+        """
+        self.expect( '{' )
+        if self.peek() == '}':
+            self.__pos += 1
+            return
+
+        while True:
+            if self.peek() != '"':
+                self.__fail( 'Expecting property name enclosed in double quotes' )
+
+            key = self.value()
+            self.expect( ':' )
+            yield key
+            char = self.peek()
+            self.__pos += 1
+            if char == '}':
+                return
+
+            if char != ',':
+                self.__pos -= 1
+                self.__fail( "Expecting ',' delimiter" )
+
+
+def streamJson( reader: JsonStreamReader, target: ConfigProcessor ) -> None:
+    """Parses the JSON object of the reader into the configuration object.
+    Members that hold a nested ConfigProcessor object are walked into, the
+    other members are read completely and passed to ParseConfig, so the
+    items of a ConfigProcessorList are parsed one by one.
+
+    :param reader:  JsonStreamReader:   the reader positioned at the object
+    :param target:  ConfigProcessor:    the configuration object
+    :return:        None
+    """
+    plan    = target._getParsePlan()
+    # lazy and shared parsing need the complete sections
+    descend = not isinstance( target, ConfigProcessorList ) and not target._lazy and _SHARE_MEMO.get() is None
+    for key in reader.members():
+        child = None
+        if descend and reader.peek() == '{':
+            entry = plan.get( key )
+            if entry is not None:
+                if entry[ 1 ] is _PROCESSOR:
+                    child = entry[ 2 ]( target )
+
+            elif target.hasWildcard() and not hasattr( type( target ), key ):
+                # creates the wildcard object
+                target.ParseConfig( { key: {} } )
+                if key in target.getWildcardKeys() and not target._isRawWildcard( key ):
+                    child = target.getWildcardValue( key )
+
+        if child is None or child.isShared():
+            target.ParseConfig( { key: reader.value() } )
+            continue
+
+        child._throw_exception = target._throw_exception
+        token = target._enterBreadCrum()
+        try:
+            streamJson( reader, child )
+
+        finally:
+            target._leaveBreadCrum( token )
+
+    return
+
+
 class YamlConfigFile( ConfigProcessor ):
     """Main YAML file reader/writer
     """
-    def __init__( self, filename: str, loadLater: bool = False, **kwargs ):
+    def __init__( self, filename: str, loadLater: bool = False,
+                  loader: str = 'safe', libyaml: bool = True, cache = None, active = None,
+                  share: bool = False, **kwargs ):
         """Constructor of the YAML reader/writer class
 
         :param filename:    str:    filename of the YAML
+        :param loadLater:   bool:   True the file is not loaded by the constructor
+        :param loader:      str:    loader mode 'safe' or 'unsafe', see selectYamlLoader()
+        :param libyaml:     bool:   use the libyaml (C) loader when available
+        :param cache:       object: cache of the parsed document, see createCache()
+        :param active:      list:   the wildcard sections to build on load, the
+                                    others are build when used, see
+                                    setActiveWildcards()
+        :param share:       bool:   True identical sections, like the ones of
+                                    YAML anchors, are parsed once and shared,
+                                    see shareSubtrees()
         :param kwargs:      dict:   the keywords for the ConfigProcessor
         """
         ConfigProcessor.__init__( self, 'file', **kwargs )
+        self.setActiveWildcards( active )
+        self.__share     = share
         self.__filename  = filename
+        self.__loader    = selectYamlLoader( loader, libyaml )
+        self.__backend   = None
+        self.__cache     = createCache( cache )
+        self.__options   = dict( kwargs, loader = loader, libyaml = libyaml, cache = self.__cache,
+                                 active = active, share = share )
         if not loadLater:
             self.Load()
 
@@ -44,37 +379,317 @@ class YamlConfigFile( ConfigProcessor ):
         """
         return os.path.basename( self.__filename )
 
+    def getFilename( self ) -> str:
+        """Returns the full filename of the configuration file
+        """
+        return self.__filename
+
+    def getOptions( self ) -> dict:
+        """Returns the keywords of the constructor, without the filename and
+        loadLater, to build a new object of the same file, see ConfigWatcher.
+
+        :return:    dict:   the keywords
+        """
+        return dict( self.__options, throw_exception = self._throw_exception, lazy = self._lazy )
+
+    def getLoaderBackend( self ) -> str:
+        """Returns the name of the YAML loader class used by the last Load(),
+        'CSafeLoader' or 'CLoader' when libyaml was used and 'cache' when
+        the document was loaded from the cache.
+
+        :return:    str:    name of the loader class or None when not loaded
+        """
+        return self.__backend
+
+    def LoadDocument( self ) -> object:
+        """Loads the YAML document from the file or from the cache
+
+        :return:    object: the YAML document
+        """
+        if self.__cache is not None:
+            document, cached = self.__cache.load( self.__filename, self.__parse,
+                                                  'yaml.{}'.format( self.__loader.__name__ ) )
+            self.__backend = 'cache' if cached else self.__loader.__name__
+            return document
+
+        with open( self.__filename, 'rt' ) as stream:
+            document = yaml.load( stream, Loader = self.__loader )
+
+        self.__backend = self.__loader.__name__
+        return document
+
+    def __parse( self, data: bytes ) -> object:
+        """Parses the YAML document for the cache
+        """
+        return yaml.load( data, Loader = self.__loader )
+
     def Load( self ) -> None:
         """Loads the YAML configuration file
 
         :return:    None
         """
-        with open( self.__filename, 'rt' ) as stream:
-            self.ParseConfig( yaml.load( stream, Loader = yaml.Loader ) )
+        self.ParseDocument( self.LoadDocument() )
+        return
+
+    def ParseDocument( self, document: object ) -> None:
+        """Parses a document read by LoadDocument() with the options of
+        the object, see loadConfigFiles().
+
+        :param document:    object: the YAML document
+        :return:            None
+        """
+        with shareSubtrees() if self.__share else contextlib.nullcontext():
+            self.ParseConfig( document )
 
         return
 
     def Save( self ) -> None:
-        """Saves the YAML configuration file
+        """Saves the YAML configuration file, the YAML events are emitted
+        while the configuration tree is walked and written through a
+        temporary file, see saveAtomic().
 
         :return:    None
         """
-        yaml.dump( self.BuildConfig(), Dumper = yaml.Dumper )
+        def write( stream ):
+            dumper = yaml.SafeDumper( stream, default_flow_style = False )
+            try:
+                dumper.emit( yaml.StreamStartEvent() )
+                dumper.emit( yaml.DocumentStartEvent( explicit = False ) )
+                for event in yamlEvents( dumper, self ):
+                    dumper.emit( event )
+
+                dumper.emit( yaml.DocumentEndEvent( explicit = False ) )
+                dumper.emit( yaml.StreamEndEvent() )
+
+            finally:
+                dumper.dispose()
+
+            return
+
+        saveAtomic( self.__filename, write )
+        return
+
+
+# Document markers, '---' and '...' at the start of a line followed by a
+# space or the end of the line. These can not occur inside a document.
+_YAML_DOCUMENT_START    = re.compile( rb'---(?:[ \t]|\r?\n|$)' )
+_YAML_DOCUMENT_END      = re.compile( rb'\.\.\.(?:[ \t]|\r?\n|$)' )
+
+
+def scanYamlDocuments( stream ) -> list:
+    """Scans a YAML stream for the document markers and returns the byte
+    offsets of the documents, the documents themselves are not parsed. The
+    documents are the same ones yaml.load_all() returns; the '%' directives
+    in front of a '---' belong to that document.
+
+    :param stream:  file:   the YAML stream opened in binary mode
+    :return:        list:   ( start, end ) offsets per document
+    """
+    documents   = []
+    start       = None      # offset of the open document
+    base        = 0         # offset after the last '...'
+    directive   = None      # offset of the first directive before a '---'
+    position    = 0
+    for line in stream:
+        if _YAML_DOCUMENT_START.match( line ):
+            begin = position if directive is None else directive
+            if start is not None:
+                documents.append( ( start, begin ) )
+
+            start       = begin
+            directive   = None
+
+        elif _YAML_DOCUMENT_END.match( line ):
+            if start is not None:
+                documents.append( ( start, position + len( line ) ) )
+
+            start       = None
+            base        = position + len( line )
+            directive   = None
+
+        elif start is None:
+            # Between the documents only directives and comments may occur,
+            # any other content starts an implicit document.
+            text = line.strip()
+            if text.startswith( b'%' ):
+                if directive is None:
+                    directive = position
+
+            elif text and not text.startswith( b'#' ):
+                start = base
+
+        position += len( line )
+
+    if start is not None:
+        documents.append( ( start, position ) )
+
+    return documents
+
+
+class YamlDocumentsFile( ConfigProcessor ):
+    """Multi-document YAML file reader, every document of the file is an
+    own root ConfigProcessor object. Load() only locates the documents in
+    the file, a document is read and parsed when it is requested with
+    getDocument() or getDocuments() and kept for the next request.
+    """
+    def __init__( self, filename: str, loadLater: bool = False,
+                  loader: str = 'safe', libyaml: bool = True, **kwargs ):
+        """Constructor of the multi-document YAML reader class
+
+        :param filename:    str:    filename of the YAML
+        :param loadLater:   bool:   True the file is not loaded by the constructor
+        :param loader:      str:    loader mode 'safe' or 'unsafe', see selectYamlLoader()
+        :param libyaml:     bool:   use the libyaml (C) loader when available
+        :param kwargs:      dict:   the keywords for the ConfigProcessor
+        """
+        ConfigProcessor.__init__( self, 'file', **kwargs )
+        self.__filename  = filename
+        self.__loader    = selectYamlLoader( loader, libyaml )
+        self.__offsets   = []
+        self.__documents = {}
+        self.__lock      = threading.RLock()
+        if not loadLater:
+            self.Load()
+
+        return
+
+    def name( self ) -> str:
+        """Returns the filename of the configuration object
+        """
+        return os.path.basename( self.__filename )
+
+    def getFilename( self ) -> str:
+        """Returns the full filename of the configuration file
+        """
+        return self.__filename
+
+    def newObject( self, index: int, document: object ) -> object:
+        """Creates the root ConfigProcessor object of a document
+
+        :param index:       int:    the index of the document in the file
+        :param document:    object: the YAML document
+        :return:            ConfigProcessor: the root object of the document
+        """
+        raise NotImplementedError()
+
+    def Load( self ) -> None:
+        """Locates the documents in the YAML file, the documents that were
+        parsed before are dropped.
+
+        :return:    None
+        """
+        with open( self.__filename, 'rb' ) as stream:
+            offsets = scanYamlDocuments( stream )
+
+        with self.__lock:
+            self.__offsets   = offsets
+            self.__documents = {}
+
+        return
+
+    def getDocumentCount( self ) -> int:
+        """Returns the number of documents in the file
+
+        :return:    int:    number of documents
+        """
+        return len( self.__offsets )
+
+    def LoadDocument( self, index: int ) -> object:
+        """Reads and loads one YAML document from the file, an empty
+        document is returned as an empty dictionary.
+
+        :param index:   int:    the index of the document
+        :return:        object: the YAML document
+        :raises:        IndexError when the file has no such document
+        """
+        start, end = self.__offsets[ index ]
+        with open( self.__filename, 'rb' ) as stream:
+            stream.seek( start )
+            data = stream.read( end - start )
+
+        document = yaml.load( data, Loader = self.__loader )
+        return {} if document is None else document
+
+    def getDocument( self, index: int ) -> object:
+        """Returns the root object of a document, the document is parsed on
+        the first request.
+
+        :param index:   int:    the index of the document, negative indexes
+                                count from the end
+        :return:        ConfigProcessor: the root object of the document
+        :raises:        IndexError when the file has no such document
+        """
+        if index < 0:
+            index += len( self.__offsets )
+
+        obj = self.__documents.get( index )
+        if obj is not None:
+            return obj
+
+        with self.__lock:
+            obj = self.__documents.get( index )
+            if obj is None:
+                if not 0 <= index < len( self.__offsets ):
+                    raise IndexError( "{} has no document {}".format( self.name(), index ) )
+
+                document = self.LoadDocument( index )
+                obj = self.newObject( index, document )
+                obj._throw_exception = self._throw_exception
+                token = self._enterBreadCrum()
+                try:
+                    obj.ParseConfig( document )
+
+                finally:
+                    self._leaveBreadCrum( token )
+
+                self.__documents[ index ] = obj
+
+        return obj
+
+    def getDocuments( self ):
+        """Yields the root objects of the documents in file order, each
+        document is parsed when it is reached.
+
+        :return:    generator:  ConfigProcessor objects
+        """
+        for index in range( len( self.__offsets ) ):
+            yield self.getDocument( index )
+
         return
 
 
 class JsonConfigFile( ConfigProcessor ):
     """Main JSON file reader/writer
     """
-    def __init__( self, filename: str, **kwargs ):
+    def __init__( self, filename: str, loadLater: bool = False, cache = None, active = None,
+                  share: bool = False, streaming: bool = False, **kwargs ):
         """Constructor of the JSON reader/writer class
 
         :param filename:    str:    filename of the JSON
+        :param loadLater:   bool:   True the file is not loaded by the constructor
+        :param cache:       object: cache of the parsed document, see createCache()
+        :param active:      list:   the wildcard sections to build on load, the
+                                    others are build when used, see
+                                    setActiveWildcards()
+        :param share:       bool:   True identical sections, like the ones of
+                                    YAML anchors, are parsed once and shared,
+                                    see shareSubtrees()
+        :param streaming:   bool:   True Load() reads the file in chunks and
+                                    parses the sections as they are read,
+                                    the cache is then not used.
         :param kwargs:      dict:   the keywords for the ConfigProcessor
         """
         ConfigProcessor.__init__( self, 'file', **kwargs )
+        self.setActiveWildcards( active )
+        self.__share     = share
+        self.__streaming = streaming
         self.__filename  = filename
-        self.Load()
+        self.__cache     = createCache( cache )
+        self.__options   = dict( kwargs, cache = self.__cache, active = active, share = share,
+                                 streaming = streaming )
+        if not loadLater:
+            self.Load()
+
         return
 
     def name( self ) -> str:
@@ -82,22 +697,74 @@ class JsonConfigFile( ConfigProcessor ):
         """
         return os.path.basename( self.__filename )
 
+    def getFilename( self ) -> str:
+        """Returns the full filename of the configuration file
+        """
+        return self.__filename
+
+    def getOptions( self ) -> dict:
+        """Returns the keywords of the constructor, without the filename and
+        loadLater, to build a new object of the same file, see ConfigWatcher.
+
+        :return:    dict:   the keywords
+        """
+        return dict( self.__options, throw_exception = self._throw_exception, lazy = self._lazy )
+
+    def LoadDocument( self ) -> object:
+        """Loads the JSON document from the file or from the cache
+
+        :return:    object: the JSON document
+        """
+        if self.__cache is not None:
+            return self.__cache.load( self.__filename, json.loads, 'json' )[ 0 ]
+
+        with open( self.__filename, 'rt' ) as stream:
+            return json.load( stream )
+
     def Load( self ) -> None:
-        """Loads the JSON configuration file
+        """Loads the JSON configuration file, in streaming mode the file is
+        parsed while it is read, see streamJson().
 
         :return:    None
         """
-        with open( self.__filename, 'rt' ) as stream:
-            self.ParseConfig( json.load( stream ) )
+        if not self.__streaming:
+            self.ParseDocument( self.LoadDocument() )
+            return
+
+        with shareSubtrees() if self.__share else contextlib.nullcontext():
+            with open( self.__filename, 'rt' ) as stream:
+                reader = JsonStreamReader( stream )
+                streamJson( reader, self )
+                if reader.peek() != '':
+                    raise json.JSONDecodeError( 'Extra data', '', 0 )
+
+        return
+
+    def ParseDocument( self, document: object ) -> None:
+        """Parses a document read by LoadDocument() with the options of
+        the object, streaming does not apply to a document that is already
+        read, see loadConfigFiles().
+
+        :param document:    object: the JSON document
+        :return:            None
+        """
+        with shareSubtrees() if self.__share else contextlib.nullcontext():
+            self.ParseConfig( document )
 
         return
 
     def Save( self ) -> None:
-        """Saves the JSON configuration file
+        """Saves the JSON configuration file, the JSON text is written in
+        chunks while the configuration tree is walked and written through a
+        temporary file, see saveAtomic().
 
         :return:    None
         """
-        with open( self.__filename, 'wt' ) as stream:
-            json.dump( self.BuildConfig(), stream, indent = 4 )
+        def write( stream ):
+            for chunk in jsonChunks( self ):
+                stream.write( chunk )
+
+            return
 
+        saveAtomic( self.__filename, write )
         return
@@ -0,0 +1,210 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Read-only snapshots of loaded configuration trees, see
+ConfigProcessor.freeze().
+
+A snapshot node is an instance of a generated class with __slots__, one
+slot per key, so a value is read by a plain attribute access. Keys that
+are not valid attribute names, like 'saiti.base' of a logger, are read
+with node[ key ]. The nodes can not be changed, are hashable and can be
+shared between threads.
+"""
+import keyword
+import threading
+import collections.abc
+
+
+# Snapshot classes per ( class, keys )
+_FROZEN_CLASSES = {}
+_FROZEN_LOCK    = threading.Lock()
+
+
+class FrozenConfig( object ):
+    """Base class of the snapshot nodes, the values are held in key order
+    in a tuple and the keys that are attribute names also in a slot.
+
+    The class has no public methods so that any key can be a slot, the
+    node supports len(), iter() over the keys, 'in' and node[ key ].
+    """
+    __slots__   = ( '_FrozenConfig__values', '_FrozenConfig__hash' )
+    _KEYS       = ()
+    _INDEX      = {}
+    _SLOTS      = ()
+
+    def __init__( self, values: tuple ):
+        """Constructor of the snapshot node
+
+        :param values:  tuple:  the frozen values in the order of _KEYS
+        """
+        object.__setattr__( self, '_FrozenConfig__values', values )
+        object.__setattr__( self, '_FrozenConfig__hash', None )
+        for slot, value in zip( self._SLOTS, values ):
+            if slot is not None:
+                object.__setattr__( self, slot, value )
+
+        return
+
+    def __setattr__( self, name: str, value: object ) -> None:
+        raise AttributeError( "{} is read-only".format( type( self ).__name__ ) )
+
+    def __delattr__( self, name: str ) -> None:
+        raise AttributeError( "{} is read-only".format( type( self ).__name__ ) )
+
+    def __getitem__( self, key: str ) -> object:
+        index = self._INDEX.get( key )
+        if index is None:
+            raise KeyError( key )
+
+        return self.__values[ index ]
+
+    def __contains__( self, key: str ) -> bool:
+        return key in self._INDEX
+
+    def __iter__( self ):
+        return iter( self._KEYS )
+
+    def __len__( self ) -> int:
+        return len( self._KEYS )
+
+    def __eq__( self, other: object ) -> bool:
+        if not isinstance( other, FrozenConfig ):
+            return NotImplemented
+
+        return self._KEYS == other._KEYS and self.__values == other.__values
+
+    def __hash__( self ) -> int:
+        result = self.__hash
+        if result is None:
+            # The nodes are immutable, so the hash is computed only once
+            result = hash( ( self._KEYS, self.__values ) )
+            object.__setattr__( self, '_FrozenConfig__hash', result )
+
+        return result
+
+    def __repr__( self ) -> str:
+        return "{}( {} )".format( type( self ).__name__,
+                                  ", ".join( "{}={!r}".format( key, value )
+                                             for key, value in zip( self._KEYS, self.__values ) ) )
+
+    def __reduce__( self ):
+        return _unpickleFrozen, ( type( self ).__name__, self._KEYS, self.__values )
+
+
+class _FrozenMapping( collections.abc.Mapping ):
+    """Read-only mapping of a frozen dictionary value, unlike a
+    MappingProxyType it is hashable and can be pickled with the snapshot.
+    """
+    __slots__   = ( '_FrozenMapping__items', '_FrozenMapping__hash' )
+
+    def __init__( self, items: dict ):
+        """Constructor of the read-only mapping
+
+        :param items:   dict:   the frozen values by key, not copied
+        """
+        object.__setattr__( self, '_FrozenMapping__items', items )
+        object.__setattr__( self, '_FrozenMapping__hash', None )
+        return
+
+    def __setattr__( self, name: str, value: object ) -> None:
+        raise AttributeError( "{} is read-only".format( type( self ).__name__ ) )
+
+    def __delattr__( self, name: str ) -> None:
+        raise AttributeError( "{} is read-only".format( type( self ).__name__ ) )
+
+    def __getitem__( self, key: object ) -> object:
+        return self.__items[ key ]
+
+    def __iter__( self ):
+        return iter( self.__items )
+
+    def __len__( self ) -> int:
+        return len( self.__items )
+
+    def __hash__( self ) -> int:
+        result = self.__hash
+        if result is None:
+            result = hash( frozenset( self.__items.items() ) )
+            object.__setattr__( self, '_FrozenMapping__hash', result )
+
+        return result
+
+    def __repr__( self ) -> str:
+        return "{}( {!r} )".format( type( self ).__name__, self.__items )
+
+    def __reduce__( self ):
+        return _FrozenMapping, ( self.__items, )
+
+
+def _slotName( key: object ) -> str:
+    """Returns the slot name of the key or None when the key can only be
+    read with node[ key ].
+    """
+    if isinstance( key, str ) and key.isidentifier() and not keyword.iskeyword( key ) and \
+            not key.startswith( '_' ):
+        return key
+
+    return None
+
+
+def frozenClass( name: str, keys: tuple ) -> type:
+    """Returns the snapshot class for the keys, the classes are cached per
+    class name and keys.
+
+    :param name:    str:    name of the configuration class
+    :param keys:    tuple:  the keys of the node
+    :return:        class:  class derived from FrozenConfig
+    """
+    cls = _FROZEN_CLASSES.get( ( name, keys ) )
+    if cls is None:
+        with _FROZEN_LOCK:
+            cls = _FROZEN_CLASSES.get( ( name, keys ) )
+            if cls is None:
+                slots = tuple( _slotName( key ) for key in keys )
+                cls = type( 'Frozen' + name, ( FrozenConfig, ), {
+                    '__slots__':    tuple( slot for slot in slots if slot is not None ),
+                    '_KEYS':        keys,
+                    '_INDEX':       { key: index for index, key in enumerate( keys ) },
+                    '_SLOTS':       slots,
+                } )
+                _FROZEN_CLASSES[ ( name, keys ) ] = cls
+
+    return cls
+
+
+def _unpickleFrozen( name: str, keys: tuple, values: tuple ) -> FrozenConfig:
+    """Rebuilds a pickled snapshot node
+    """
+    return frozenClass( name, keys )( values )
+
+
+def freezeValue( value: object ) -> object:
+    """Returns the read-only version of a value, lists become tuples and
+    dictionaries read-only mappings. Snapshot nodes and other objects are
+    returned as they are.
+
+    :param value:   object: the value to freeze
+    :return:        object: the frozen value
+    """
+    if isinstance( value, ( list, tuple ) ):
+        return tuple( freezeValue( item ) for item in value )
+
+    if isinstance( value, dict ):
+        return _FrozenMapping( { key: freezeValue( item ) for key, item in value.items() } )
+
+    return value
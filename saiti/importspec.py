@@ -0,0 +1,181 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Resolves import specifications like 'module.Class' or
+'module:Class( 1, name = "x" )' into the callable and its arguments.
+
+The imported callables and the parsed specifications are cached for the
+process, import and syntax errors are cached as well so that a failing
+specification that is repeated fails fast, clearCallableCache() drops
+the imports so that a module installed later is found. The arguments
+may only be Python literals, they are parsed with ast.literal_eval()
+and never evaluated.
+"""
+import ast
+import copy
+import importlib
+import collections
+
+
+# A cached error, a new exception is raised every time so that the cache
+# does not keep the traceback and the frames of the earlier raises alive
+_Failure    = collections.namedtuple( '_Failure', ( 'type', 'message' ) )
+
+# dotted path -> callable or the _Failure of the import
+_CALLABLES  = {}
+# specification -> ( dotted path, args, kwargs, mutable ) or the _Failure
+_SPECS      = {}
+
+
+def resolveCallable( path: str ) -> object:
+    """Imports the callable of the dotted path 'module.Class'.
+
+    :param path:    str:    the dotted path of the callable
+    :return:        object: the callable
+    :raises:        ImportError when the module or callable does not exist
+    """
+    result = _CALLABLES.get( path )
+    if result is None:
+        try:
+            if '.' not in path:
+                raise ImportError( "{} is not a dotted path 'module.name'".format( path ) )
+
+            module_name, name = path.rsplit( '.', 1 )
+            try:
+                result = getattr( importlib.import_module( module_name ), name )
+
+            except AttributeError:
+                raise ImportError( "module {} has no attribute {}".format( module_name, name ) )
+
+        except ImportError as exc:
+            result = _Failure( type( exc ), str( exc ) )
+
+        _CALLABLES[ path ] = result
+
+    if isinstance( result, _Failure ):
+        raise result.type( result.message )
+
+    return result
+
+
+def clearCallableCache() -> None:
+    """Drops the cached imports and the cached import errors, the next
+    resolveCallable() imports again. ConfigWatcher.reload() calls this so
+    that a module that was set up after the first load is found.
+
+    :return:    None
+    """
+    _CALLABLES.clear()
+    importlib.invalidate_caches()
+    return
+
+
+def _literal( node: ast.AST ) -> tuple:
+    """Returns the value of the literal node and True when it holds a
+    mutable container.
+    """
+    value = ast.literal_eval( node )
+    return value, isinstance( value, ( list, dict, set ) )
+
+
+def parseImportSpec( spec: str ) -> tuple:
+    """Parses the import specification, the result is memoized per
+    specification string.
+
+    :param spec:    str:    'module.Class', 'module:Class' or with literal
+                            arguments 'module.Class( 1, name = "x" )'
+    :return:        tuple:  ( dotted path, args, kwargs )
+    :raises:        ValueError when the specification is not valid
+    """
+    result = _SPECS.get( spec )
+    if result is None:
+        try:
+            result = _parseImportSpec( spec )
+
+        except ValueError as exc:
+            result = _Failure( type( exc ), str( exc ) )
+
+        _SPECS[ spec ] = result
+
+    if isinstance( result, _Failure ):
+        raise result.type( result.message )
+
+    path, args, kwargs, mutable = result
+    if mutable:
+        # the memoized arguments are never handed out
+        return path, copy.deepcopy( args ), copy.deepcopy( kwargs )
+
+    return path, args, dict( kwargs )
+
+
+def _parseImportSpec( spec: str ) -> tuple:
+    """Parses the import specification without the memoization.
+
+    :return:    tuple:  ( dotted path, args, kwargs, mutable )
+    """
+    callable_part, paren, arguments = spec.partition( '(' )
+    path = callable_part.strip().replace( ':', '.' )
+    try:
+        node = ast.parse( path + paren + arguments, mode = 'eval' ).body
+
+    except SyntaxError as exc:
+        raise ValueError( "invalid import specification {}: {}".format( spec, exc.msg ) )
+
+    if isinstance( node, ast.Call ):
+        func = node.func
+
+    elif paren:
+        raise ValueError( "invalid import specification {}".format( spec ) )
+
+    else:
+        func = node
+
+    names = []
+    while isinstance( func, ast.Attribute ):
+        names.insert( 0, func.attr )
+        func = func.value
+
+    if not isinstance( func, ast.Name ) or not names:
+        raise ValueError( "invalid import specification {}, expected 'module.name'".format( spec ) )
+
+    names.insert( 0, func.id )
+    args    = []
+    kwargs  = {}
+    mutable = False
+    if isinstance( node, ast.Call ):
+        try:
+            for arg in node.args:
+                if isinstance( arg, ast.Starred ):
+                    raise ValueError( "*args not supported" )
+
+                value, is_mutable = _literal( arg )
+                args.append( value )
+                mutable |= is_mutable
+
+            for keyword in node.keywords:
+                if keyword.arg is None:
+                    raise ValueError( "**kwargs not supported" )
+
+                value, is_mutable = _literal( keyword.value )
+                kwargs[ keyword.arg ] = value
+                mutable |= is_mutable
+
+        except ValueError as exc:
+            raise ValueError( "invalid argument in import specification {}: {}".format( spec, exc ) )
+
+    return ".".join( names ), tuple( args ), kwargs, mutable
@@ -18,14 +18,23 @@
 #
 import os
 import sys
+import time
+import queue
 import socket
 import logging
 import logging.handlers
 import logging.config
 from saiti import ConfigProcessor, ConfigProcessorList
 from saiti.mixins.hostport import HostPortConfigMixin
+from saiti.importspec import resolveCallable
+from saiti.loghandlers import installQueueProxies, stopQueueListener, manageListener, \
+    BlockingQueueHandler, BoundedQueueListener
 
 
+# The fingerprints of the configuration applied by LoggingConfig.setConfig()
+# or LoggingConfig.reconfigure(), the logging configuration is process wide
+_APPLIED = None
+
 class LoggingLevelMixin( object ):
     """Mixin class to handle the logging level
     """
@@ -105,6 +114,13 @@ class LoggingNullHandlerConfig( ConfigProcessor, LoggingLevelMixin ):
         """
         return self.__filters
 
+    def handlerConfig( self ) -> dict:
+        """Returns the dictConfig() entry of the handler
+
+        :return:    dict:   handler configuration
+        """
+        return self.props()
+
 
 class LoggingStreamHandlerConfig( LoggingNullHandlerConfig ):
     def __init__( self, name, **kwargs ):
@@ -146,6 +162,9 @@ class LoggingStreamHandlerConfig( LoggingNullHandlerConfig ):
 
 
 class LoggingFileHandlerConfig( LoggingNullHandlerConfig ):
+    # The handler class when bufferSize is set
+    BUFFERED_CLASS = 'saiti.loghandlers.BufferedFileHandler'
+
     def __init__( self, name, class_name = 'FileHandler', **kwargs ):
         """constructor of the FileHandler class
 
@@ -158,6 +177,9 @@ class LoggingFileHandlerConfig( LoggingNullHandlerConfig ):
         self.__mode         = 'a'  # str
         self.__encoding     = None  # str
         self.__delay        = False  # True/False
+        self.__bufferSize       = 0         # int       0 = flush every record
+        self.__flushInterval    = 1.0       # float     seconds
+        self.__flushLevel       = 'ERROR'   # str
         return
 
     @property
@@ -217,8 +239,72 @@ class LoggingFileHandlerConfig( LoggingNullHandlerConfig ):
         self.__delay = value
         return
 
+    @property
+    def bufferSize( self ) -> int:
+        """The number of characters that are buffered before the file is
+        written, 0 writes every record.
+        """
+        return self.__bufferSize
+
+    @bufferSize.setter
+    def bufferSize( self, value: int ):
+        if value < 0:
+            raise ValueError( "bufferSize must be 0 or more" )
+
+        self.__bufferSize = value
+        return
+
+    @property
+    def flushInterval( self ) -> float:
+        """The maximum number of seconds a record is buffered
+        """
+        return self.__flushInterval
+
+    @flushInterval.setter
+    def flushInterval( self, value: float ):
+        if value <= 0:
+            raise ValueError( "flushInterval must be more than 0" )
+
+        self.__flushInterval = value
+        return
+
+    @property
+    def flushLevel( self ) -> str:
+        """The records of this level and above are written at once, default
+        is 'ERROR'
+        """
+        return self.__flushLevel
+
+    @flushLevel.setter
+    def flushLevel( self, value: str ):
+        if value not in logging._nameToLevel and value not in logging._levelToName:
+            raise ValueError( "flushLevel must be on of {}".format( ", ".join( logging._nameToLevel.keys() ) ) )
+
+        self.__flushLevel = value
+        return
+
+    def handlerConfig( self ) -> dict:
+        """Returns the dictConfig() entry of the handler, with bufferSize the
+        buffered variant of the handler. Unset values are left to the
+        default of the handler.
+
+        :return:    dict:   handler configuration
+        """
+        config = { key: value for key, value in self.props().items()
+                   if value is not None and key not in ( 'bufferSize', 'flushInterval', 'flushLevel' ) }
+        if self.__bufferSize:
+            config.update( { 'class': self.BUFFERED_CLASS,
+                             'bufferSize': self.__bufferSize,
+                             'flushInterval': self.__flushInterval,
+                             'flushLevel': self.__flushLevel } )
+
+        return config
+
 
 class LoggingWatchedFileHandlerConfig( LoggingFileHandlerConfig ):
+    # The handler class when bufferSize is set
+    BUFFERED_CLASS = 'saiti.loghandlers.BufferedWatchedFileHandler'
+
     def __init__( self, name, **kwargs ):
         """constructor of the WatchedFileHandler class
 
@@ -230,6 +316,9 @@ class LoggingWatchedFileHandlerConfig( LoggingFileHandlerConfig ):
 
 
 class LoggingRotatingFileHandlerConfig( LoggingFileHandlerConfig ):
+    # The handler class when bufferSize is set
+    BUFFERED_CLASS = 'saiti.loghandlers.BufferedRotatingFileHandler'
+
     def __init__( self, name, **kwargs ):
         """constructor of the RotatingFileHandler class
 
@@ -335,6 +424,9 @@ class LoggingTimedRotatingFileHandlerConfig( LoggingNullHandlerConfig ):
 
 class LoggingSocketHandlerConfig( LoggingNullHandlerConfig,
                                   HostPortConfigMixin ):
+    # The handler class when batchSize is set
+    BATCHING_CLASS = 'saiti.loghandlers.BatchingSocketHandler'
+
     def __init__( self, name, class_name = 'SocketHandler', **kwargs ):
         """constructor of the SocketHandler class
 
@@ -345,9 +437,76 @@ class LoggingSocketHandlerConfig( LoggingNullHandlerConfig,
         """
         LoggingNullHandlerConfig.__init__( self, name, class_name, **kwargs )
         HostPortConfigMixin.__init__( self, **kwargs )
+        self.__batchSize        = 0         # int       0 = a send per record
+        self.__flushInterval    = 1.0       # float     seconds
+        self.__maxBufferBytes   = 1048576   # int
         return
 
+    @property
+    def batchSize( self ) -> int:
+        """The maximum number of records in one send, 0 sends every record
+        on the logging call.
+        """
+        return self.__batchSize
+
+    @batchSize.setter
+    def batchSize( self, value: int ):
+        if value < 0:
+            raise ValueError( "batchSize must be 0 or more" )
+
+        self.__batchSize = value
+        return
+
+    @property
+    def flushInterval( self ) -> float:
+        """The maximum number of seconds a record waits for its batch
+        """
+        return self.__flushInterval
+
+    @flushInterval.setter
+    def flushInterval( self, value: float ):
+        if value <= 0:
+            raise ValueError( "flushInterval must be more than 0" )
+
+        self.__flushInterval = value
+        return
+
+    @property
+    def maxBufferBytes( self ) -> int:
+        """The maximum number of bytes of the records that wait for the
+        receiver, beyond it the oldest records are dropped.
+        """
+        return self.__maxBufferBytes
+
+    @maxBufferBytes.setter
+    def maxBufferBytes( self, value: int ):
+        if value <= 0:
+            raise ValueError( "maxBufferBytes must be more than 0" )
+
+        self.__maxBufferBytes = value
+        return
+
+    def handlerConfig( self ) -> dict:
+        """Returns the dictConfig() entry of the handler, with batchSize the
+        batching variant of the handler.
+
+        :return:    dict:   handler configuration
+        """
+        config = { 'class': self.cls, 'level': self.level, 'formatter': self.formatter,
+                   'filters': list( self.filters ), 'host': self.host, 'port': self.port }
+        if self.__batchSize:
+            config.update( { 'class': self.BATCHING_CLASS,
+                             'batchSize': self.__batchSize,
+                             'flushInterval': self.__flushInterval,
+                             'maxBufferBytes': self.__maxBufferBytes } )
+
+        return config
+
+
 class LoggingDatagramHandlerConfig( LoggingSocketHandlerConfig ):
+    # The handler class when batchSize is set
+    BATCHING_CLASS = 'saiti.loghandlers.BatchingDatagramHandler'
+
     def __init__( self, name, **kwargs ):
         """constructor of the DatagramHandler class
 
@@ -663,9 +822,147 @@ class LoggingQueueListenerConfig( LoggingNullHandlerConfig ):
         :param kwargs:      dict:   keywords for the ConfigProcessor class
         """
         LoggingNullHandlerConfig.__init__( self, name, 'QueueListener', **kwargs )
-        self.__queue                    = None  # str
-        self.__handlers                 = None  # list of handlers
-        self.__respect_handler_level    = None # bool   False / True
+        self.__queue                    = None  # str       ext:// queue object
+        self.__queueSize                = 0     # int       0 = unbounded
+        self.__handlers                 = []    # list of handlers
+        self.__respect_handler_level    = False # bool   False / True
+        self.__records                  = None
+        self.__listener                 = None
+        self.__started                  = False
+        return
+
+    @property
+    def queue( self ) -> str:
+        """The queue of the listener as 'ext://module.name', by default a
+        queue of queueSize records is created. A queue without task_done()
+        and join(), like a SimpleQueue, is flushed by polling empty().
+        """
+        return self.__queue
+
+    @queue.setter
+    def queue( self, value: str ):
+        if not value.startswith( 'ext://' ):
+            raise ValueError( "queue must be an 'ext://module.name' reference" )
+
+        self.__queue = value
+        return
+
+    @property
+    def queueSize( self ) -> int:
+        """The maximum number of records in the queue, 0 is unbounded. The
+        logging calls wait when the queue is full.
+        """
+        return self.__queueSize
+
+    @queueSize.setter
+    def queueSize( self, value: int ):
+        if value < 0:
+            raise ValueError( "queueSize must be 0 or more" )
+
+        self.__queueSize = value
+        return
+
+    @property
+    def handlers( self ) -> list:
+        """The names of the handlers that handle the records
+        """
+        return self.__handlers
+
+    @property
+    def respect_handler_level( self ) -> bool:
+        """If True the level of a handler is checked before the record is
+        passed to it.
+        """
+        return self.__respect_handler_level
+
+    @respect_handler_level.setter
+    def respect_handler_level( self, value: bool ):
+        self.__respect_handler_level = value
+        return
+
+    def handlerConfig( self ) -> dict:
+        """Returns the dictConfig() entry of the QueueHandler that takes the
+        place of the listener on the loggers, a new queue is created for
+        every call.
+
+        :return:    dict:   handler configuration
+        """
+        if self.__queue is not None:
+            self.__records = resolveCallable( self.__queue[ len( 'ext://' ): ] )
+
+        else:
+            self.__records = queue.Queue( self.__queueSize )
+
+        config = { '()': BlockingQueueHandler, 'queue': self.__records,
+                   'level': self.level, 'filters': list( self.filters ) }
+        if self.formatter:
+            config[ 'formatter' ] = self.formatter
+
+        return config
+
+    def start( self, handlers: list ) -> logging.handlers.QueueListener:
+        """Builds and starts the listener, called by LoggingConfig.setConfig()
+        after dictConfig() build the handlers. The listener is stopped by
+        stop(), the next setConfig() and at exit.
+
+        :param handlers:    list:   the handler objects of the handlers names
+        :return:            QueueListener:  the started listener
+        """
+        self.__listener = BoundedQueueListener( self.__records, *handlers,
+                                                respect_handler_level = self.__respect_handler_level )
+        self.__listener.start()
+        self.__started = True
+        manageListener( self )
+        return self.__listener
+
+    def getListener( self ) -> logging.handlers.QueueListener:
+        """Returns the listener or None when not started
+
+        :return:    QueueListener:  the listener
+        """
+        return self.__listener
+
+    def isStarted( self ) -> bool:
+        """Returns True when the listener is started and not yet stopped
+
+        :return:    bool:   True/False
+        """
+        return self.__started
+
+    def flush( self ) -> None:
+        """Waits until the records in the queue are handled and flushes the
+        handlers of the listener. When the queue can not be joined it waits
+        until the queue is empty, the record taken last may then still be
+        handled.
+
+        :return:    None
+        """
+        if not self.__started:
+            return
+
+        records = self.__records
+        if hasattr( records, 'task_done' ) and hasattr( records, 'join' ):
+            records.join()
+
+        elif hasattr( records, 'empty' ):
+            while self.__started and not records.empty():
+                time.sleep( 0.01 )
+
+        for handler in self.__listener.handlers:
+            handler.flush()
+
+        return
+
+    def stop( self ) -> None:
+        """Stops the listener after the records in the queue are handled,
+        also called by stopQueueListener().
+
+        :return:    None
+        """
+        if self.__started:
+            self.__started = False
+            self.__listener.stop()
+
         return
 
 
@@ -826,17 +1123,15 @@ class LoggingConfig( ConfigProcessor ):
         :param name:        str:    name of the configuration item
         :param kwargs:      dict:   keywords for the ConfigProcessor class
         """
-        ConfigProcessor.__init__( self, 'logging', **kwargs )
+        ConfigProcessor.__init__( self, 'logging', { 'async': 'asynchronous' }, **kwargs )
         self.__version      = 1
+        self.__asynchronous = False
         self.__formatters   = LoggingFormattersConfig( **kwargs )
         self.__handlers     = LoggingHandlersConfig( **kwargs )
         self.__loggers      = LoggingLoggersConfig( **kwargs )
         self.__root         = LoggingRootConfig( **kwargs )
         return
 
-    def __dict__( self ):
-        return
-
     @property
     def version( self ):
         return self.__version
@@ -845,6 +1140,19 @@ class LoggingConfig( ConfigProcessor ):
     def version( self, value ):
         self.__version = value
 
+    @property
+    def asynchronous( self ) -> bool:
+        """The key 'async', when True the handlers are called by one
+        listener thread and the logging calls only put the records on its
+        queue.
+        """
+        return self.__asynchronous
+
+    @asynchronous.setter
+    def asynchronous( self, value: bool ):
+        self.__asynchronous = value
+        return
+
     @property
     def formatters( self ):
         return self.__formatters
@@ -865,9 +1173,145 @@ class LoggingConfig( ConfigProcessor ):
         cfg = {
             "version": self.__version,
             "formatters": self.__formatters.props(),
-            "handlers": self.__handlers.props(),
             "loggers": self.__loggers.props(),
             "root": self.__root.props()
         }
+        # the records of the previous configuration are handled first
+        stopQueueListener()
+        # dictConfig() can not build a QueueListener, a QueueHandler takes its
+        # place and the listener is build with the handlers afterwards
+        cfg[ "handlers" ] = { name: item.handlerConfig() for name, item in self.__handlers.configItems() }
+        listeners = [ item for name, item in self.__handlers.configItems()
+                      if isinstance( item, LoggingQueueListenerConfig ) ]
         logging.config.dictConfig( cfg )
+        for item in listeners:
+            item.start( [ logging._handlers[ name ] for name in item.handlers ] )
+
+        if self.__asynchronous:
+            installQueueProxies( [ '' ] + [ name for name, logger in self.__loggers.configItems() ] )
+
+        global _APPLIED
+        _APPLIED = self.__appliedState()
+        return
+
+    def reconfigure( self ) -> bool:
+        """Applies the configuration like setConfig(), but compared with the
+        configuration that is applied. The loggers are updated in place,
+        only the formatters and handlers of which the settings changed are
+        build again, the other handlers keep their open files and
+        connections. Loggers that are no longer configured are reset.
+
+        Falls back to setConfig() when nothing is applied yet, when the
+        version or the key 'async' changed or when a QueueListener handler
+        is configured.
+
+        :return:    bool:   True when applied incrementally
+        """
+        global _APPLIED
+        applied = _APPLIED
+        state = self.__appliedState()
+        if applied is None or applied[ 'listeners' ] or state[ 'listeners' ] or \
+                ( applied[ 'version' ], applied[ 'asynchronous' ] ) != ( state[ 'version' ], state[ 'asynchronous' ] ):
+            self.setConfig()
+            return False
+
+        # the loggers get their handlers back, the proxies are installed again
+        stopQueueListener()
+        configurator = logging.config.DictConfigurator( {
+            "version": self.__version,
+            "formatters": self.__formatters.props(),
+            "handlers": { name: item.handlerConfig() for name, item in self.__handlers.configItems() }
+        } )
+        formatters = configurator.config[ "formatters" ]
+        changedFormatters = set()
+        for name in list( formatters ):
+            formatters[ name ] = configurator.configure_formatter( formatters[ name ] )
+            if applied[ 'formatters' ].get( name ) != state[ 'formatters' ][ name ]:
+                changedFormatters.add( name )
+
+        handlers = configurator.config[ "handlers" ]
+        previous = { name: logging._handlers.get( name ) for name in applied[ 'handlers' ] }
+        rebuild = []
+        for name, item in self.__handlers.configItems():
+            handler = previous.get( name )
+            if handler is None or applied[ 'handlers' ][ name ] != state[ 'handlers' ][ name ]:
+                rebuild.append( name )
+                continue
+
+            if item.formatter in changedFormatters:
+                handler.setFormatter( formatters[ item.formatter ] )
+
+            handlers[ name ] = handler
+
+        # the target of a MemoryHandler is build first
+        rebuild.sort( key = lambda name: 'target' in handlers[ name ] )
+        for name in rebuild:
+            handlers[ name ] = configurator.configure_handler( handlers[ name ] )
+
+        for name, item in self.__loggers.configItems():
+            logger = logging.getLogger( name )
+            self.__applyLogger( logger, item, handlers )
+            logger.propagate = item.propagate
+
+        self.__applyLogger( logging.getLogger(), self.__root, handlers )
+        for name in applied[ 'loggers' ] - state[ 'loggers' ]:
+            logger = logging.getLogger( name )
+            logger.setLevel( logging.NOTSET )
+            logger.handlers = []
+            logger.propagate = True
+
+        current = set( id( handler ) for handler in handlers.values() )
+        for handler in previous.values():
+            if handler is not None and id( handler ) not in current:
+                handler.close()
+
+        # named after the old handlers are closed, Handler.close() removes
+        # the handler of its name
+        for name in rebuild:
+            handlers[ name ].name = name
+
+        if self.__asynchronous:
+            installQueueProxies( [ '' ] + [ name for name, logger in self.__loggers.configItems() ] )
+
+        _APPLIED = state
+        return True
+
+    @staticmethod
+    def __applyLogger( logger: logging.Logger, item: ConfigProcessor, handlers: dict ) -> None:
+        logger.setLevel( item.level )
+        # a new list, a record being handled keeps the old one
+        logger.handlers = [ handlers[ name ] for name in item.handlers ]
+        logger.disabled = False
+        return
+
+    def __appliedState( self ) -> dict:
+        return {
+            'version':      self.__version,
+            'asynchronous': self.__asynchronous,
+            'listeners':    any( isinstance( item, LoggingQueueListenerConfig )
+                                 for name, item in self.__handlers.configItems() ),
+            'formatters':   { name: item.getFingerprint() for name, item in self.__formatters.configItems() },
+            'handlers':     { name: item.getFingerprint() for name, item in self.__handlers.configItems() },
+            'loggers':      set( name for name, item in self.__loggers.configItems() )
+        }
+
+    def flush( self ) -> None:
+        """Waits until the QueueListener handlers handled their queued records
+
+        :return:    None
+        """
+        for name, item in self.__handlers.configItems():
+            if isinstance( item, LoggingQueueListenerConfig ):
+                item.flush()
+
+        return
+
+    def shutdown( self ) -> None:
+        """Stops the listener thread of asynchronous logging and the
+        QueueListener handlers, the handlers are called directly again.
+        Also done at exit and by setConfig().
+
+        :return:    None
+        """
+        stopQueueListener()
         return
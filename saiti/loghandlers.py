@@ -0,0 +1,544 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Logging handlers used by LoggingConfig.setConfig().
+
+With asynchronous logging the handlers of the configured loggers are
+replaced by QueueProxyHandler objects, which only put the records on a
+queue. The one RoutingQueueListener thread of the process takes the
+records from the queue and passes each one to the handler of its proxy.
+
+The QueueListener handlers of the configuration are build after
+dictConfig(), the loggers get a BlockingQueueHandler in their place and
+the listeners are managed here as well, see manageListener().
+
+BatchingSocketHandler sends many records in one send from a sender
+thread, readFrames() decodes what it sends. BatchingDatagramHandler moves
+the sends of DatagramHandler to a sender thread as well.
+
+The buffered file handlers write the records through a large buffer that
+is flushed when it is full, after an interval or for an important record.
+"""
+import io
+import os
+import stat
+import queue
+import struct
+import pickle
+import atexit
+import logging
+import logging.handlers
+import threading
+import collections
+
+
+class QueueProxyHandler( logging.handlers.QueueHandler ):
+    """Stands in for a configured handler on the loggers, the records are
+    put on the queue of the listener together with the handler.
+    """
+    def __init__( self, queue: object, target: logging.Handler ):
+        """Constructor of the proxy
+
+        :param queue:   Queue:      the queue of the listener
+        :param target:  Handler:    the handler that handles the records
+        """
+        logging.handlers.QueueHandler.__init__( self, queue )
+        # records below the level of the handler are dropped on the caller's thread
+        self.setLevel( target.level )
+        self.target = target
+        return
+
+    def prepare( self, record: logging.LogRecord ) -> logging.LogRecord:
+        # the listener runs in this process, the record is formatted by the
+        # formatter of the target on the listener thread
+        return record
+
+    def enqueue( self, record: logging.LogRecord ) -> None:
+        self.queue.put_nowait( ( self.target, record ) )
+        return
+
+
+class BlockingQueueHandler( logging.handlers.QueueHandler ):
+    """QueueHandler that waits for room when its queue is bounded and full,
+    the records are not dropped.
+    """
+    def __init__( self, queue: object ):
+        logging.handlers.QueueHandler.__init__( self, queue )
+        return
+
+    def enqueue( self, record: logging.LogRecord ) -> None:
+        self.queue.put( record )
+        return
+
+
+class BoundedQueueListener( logging.handlers.QueueListener ):
+    """QueueListener that can be stopped when its bounded queue is full
+    """
+    def enqueue_sentinel( self ) -> None:
+        # waits for room in a bounded queue
+        self.queue.put( self._sentinel )
+        return
+
+
+class RoutingQueueListener( BoundedQueueListener ):
+    """QueueListener of QueueProxyHandler objects, the records are handled
+    by the handler of their proxy.
+    """
+    def __init__( self, queue: object ):
+        """Constructor of the listener
+
+        :param queue:   Queue:  the queue of the proxies
+        """
+        BoundedQueueListener.__init__( self, queue, respect_handler_level = True )
+        return
+
+    def handle( self, item: tuple ) -> None:
+        handler, record = item
+        record = self.prepare( record )
+        if record.levelno >= handler.level:
+            handler.handle( record )
+
+        return
+
+
+class BatchingSocketHandler( logging.handlers.SocketHandler ):
+    """SocketHandler that sends the records in batches from a sender thread.
+
+    The records are framed as by SocketHandler, the length of the pickle
+    in 4 bytes followed by the pickle, and up to batchSize frames go in one
+    send. A batch is send when it is full or after flushInterval seconds.
+
+    A logging call only adds the frame to the buffer. When the connection
+    is down the frames are kept, beyond maxBufferBytes the oldest are
+    dropped and counted in dropped, and the connection is made again with
+    the backoff of SocketHandler (retryStart, retryFactor and retryMax). A
+    batch of which the send failed is send again on the new connection.
+    """
+    def __init__( self, host: str, port: int, batchSize: int = 100,
+                  flushInterval: float = 1.0, maxBufferBytes: int = 1048576 ):
+        """Constructor of the handler
+
+        :param host:            str:    host name or address of the receiver
+        :param port:            int:    port of the receiver
+        :param batchSize:       int:    maximum number of records per send
+        :param flushInterval:   float:  maximum seconds a record waits
+        :param maxBufferBytes:  int:    maximum bytes of the waiting records
+        """
+        logging.handlers.SocketHandler.__init__( self, host, port )
+        self.batchSize          = batchSize
+        self.flushInterval      = flushInterval
+        self.maxBufferBytes     = maxBufferBytes
+        self.dropped            = 0
+        self.__frames           = collections.deque()
+        self.__bytes            = 0
+        self.__ready            = threading.Condition( threading.Lock() )
+        self.__sendLock         = threading.Lock()
+        self.__sender           = None
+        self.__closed           = False
+        return
+
+    def emit( self, record: logging.LogRecord ) -> None:
+        try:
+            frame = self.makePickle( record )
+
+        except Exception:
+            self.handleError( record )
+            return
+
+        with self.__ready:
+            self.__frames.append( frame )
+            self.__bytes += len( frame )
+            self.__dropOldest()
+            if self.__sender is None and not self.__closed:
+                self.__sender = threading.Thread( target = self.__run, name = type( self ).__name__,
+                                                  daemon = True )
+                self.__sender.start()
+
+            if len( self.__frames ) >= self.batchSize:
+                self.__ready.notify()
+
+        return
+
+    def sendFrames( self, frames: list ) -> bool:
+        """Sends the frames in one send, called from the sender thread and
+        by flush().
+
+        :param frames:  list:   the framed records
+        :return:        bool:   False when the frames are not send
+        """
+        if self.sock is None:
+            # no attempt before the retry time of the backoff
+            self.createSocket()
+
+        if self.sock is None:
+            return False
+
+        try:
+            self.sock.sendall( b''.join( frames ) )
+
+        except OSError:
+            self.sock.close()
+            self.sock = None
+            return False
+
+        return True
+
+    def flush( self ) -> None:
+        """Sends the waiting records on the calling thread, the records are
+        kept when the receiver can not be reached.
+
+        :return:    None
+        """
+        self.__ship()
+        return
+
+    def close( self ) -> None:
+        with self.__ready:
+            self.__closed = True
+            sender = self.__sender
+            self.__ready.notify()
+
+        if sender is not None:
+            # the sender ships the last batches before it ends
+            sender.join()
+
+        else:
+            self.__ship()
+
+        logging.handlers.SocketHandler.close( self )
+        return
+
+    def __dropOldest( self ) -> None:
+        while self.__bytes > self.maxBufferBytes and len( self.__frames ) > 1:
+            self.__bytes -= len( self.__frames.popleft() )
+            self.dropped += 1
+
+        return
+
+    def __run( self ) -> None:
+        while True:
+            with self.__ready:
+                if not self.__closed and len( self.__frames ) < self.batchSize:
+                    self.__ready.wait( self.flushInterval )
+
+                closed = self.__closed
+
+            self.__ship()
+            if closed:
+                return
+
+    def __ship( self ) -> None:
+        with self.__sendLock:
+            while True:
+                with self.__ready:
+                    if not self.__frames:
+                        return
+
+                    frames = [ self.__frames.popleft()
+                               for _ in range( min( self.batchSize, len( self.__frames ) ) ) ]
+                    size = sum( len( frame ) for frame in frames )
+                    self.__bytes -= size
+
+                if not self.sendFrames( frames ):
+                    with self.__ready:
+                        self.__frames.extendleft( reversed( frames ) )
+                        self.__bytes += size
+                        self.__dropOldest()
+
+                    return
+
+
+class BatchingDatagramHandler( BatchingSocketHandler ):
+    """BatchingSocketHandler for UDP. Every record still goes in a datagram
+    of its own, as a DatagramHandler receiver reads one record from each
+    datagram, only the pickling and the sends are moved off the logging
+    call and done per batch by the sender thread.
+    """
+    makeSocket = logging.handlers.DatagramHandler.makeSocket
+
+    def sendFrames( self, frames: list ) -> bool:
+        if self.sock is None:
+            self.createSocket()
+
+        if self.sock is None:
+            return False
+
+        try:
+            for frame in frames:
+                self.sock.sendto( frame, self.address )
+
+        except OSError:
+            self.sock.close()
+            self.sock = None
+            return False
+
+        return True
+
+
+class BufferedFileMixin( object ):
+    """Mixin of the buffered file handlers, the file is opened with a
+    buffer of bufferSize bytes and the stream is only flushed when
+    bufferSize characters are written, flushInterval seconds passed or a
+    record of flushLevel or above is handled. close() and therefore
+    logging.shutdown() at exit flush the buffer.
+    """
+    def __init__( self, bufferSize: int, flushInterval: float, flushLevel ):
+        """Constructor of the mixin, called before the handler constructor
+
+        :param bufferSize:      int:    number of characters to buffer
+        :param flushInterval:   float:  maximum seconds a record is buffered
+        :param flushLevel:      str:    level of the records that are
+                                        flushed at once, name or int
+        """
+        self.bufferSize     = bufferSize
+        self.flushInterval  = flushInterval
+        self.flushLevel     = logging._checkLevel( flushLevel )
+        # the size of the file for the rollover, see _open() and emit()
+        self._fileSize      = 0
+        self.__pending      = 0
+        self.__length       = 0
+        # the thread that is writing a record, its flush() calls are skipped
+        self.__writer       = None
+        self.__flusher      = None
+        self.__stopped      = threading.Event()
+        return
+
+    def _open( self ):
+        stream = open( self.baseFilename, self.mode, buffering = max( self.bufferSize, io.DEFAULT_BUFFER_SIZE ),
+                       encoding = self.encoding )
+        info = os.fstat( stream.fileno() )
+        self._fileSize = info.st_size if stat.S_ISREG( info.st_mode ) else None
+        return stream
+
+    def format( self, record: logging.LogRecord ) -> str:
+        message = super().format( record )
+        self.__length = len( message ) + len( self.terminator )
+        return message
+
+    def emit( self, record: logging.LogRecord ) -> None:
+        self.__writer = threading.get_ident()
+        try:
+            super().emit( record )
+
+        finally:
+            self.__writer = None
+
+        self.__pending += self.__length
+        if self._fileSize is not None:
+            self._fileSize += self.__length
+
+        if self.__pending >= self.bufferSize or record.levelno >= self.flushLevel:
+            self.flush()
+
+        elif self.__flusher is None:
+            self.__flusher = threading.Thread( target = self.__run, name = type( self ).__name__, daemon = True )
+            self.__flusher.start()
+
+        return
+
+    def flush( self ) -> None:
+        if self.__writer == threading.get_ident():
+            return
+
+        super().flush()
+        self.__pending = 0
+        return
+
+    def close( self ) -> None:
+        # not joined, the flusher may wait for the lock that is held here
+        self.__stopped.set()
+        super().close()
+        return
+
+    def __run( self ) -> None:
+        while not self.__stopped.wait( self.flushInterval ):
+            if self.__pending:
+                self.flush()
+
+        return
+
+
+class BufferedFileHandler( BufferedFileMixin, logging.FileHandler ):
+    """FileHandler that flushes its buffer by size, time and level
+    """
+    def __init__( self, filename: str, mode: str = 'a', encoding: str = None, delay: bool = False,
+                  bufferSize: int = 65536, flushInterval: float = 1.0, flushLevel = 'ERROR' ):
+        BufferedFileMixin.__init__( self, bufferSize, flushInterval, flushLevel )
+        logging.FileHandler.__init__( self, filename, mode, encoding, delay )
+        return
+
+
+class BufferedWatchedFileHandler( BufferedFileMixin, logging.handlers.WatchedFileHandler ):
+    """WatchedFileHandler that flushes its buffer by size, time and level
+    """
+    def __init__( self, filename: str, mode: str = 'a', encoding: str = None, delay: bool = False,
+                  bufferSize: int = 65536, flushInterval: float = 1.0, flushLevel = 'ERROR' ):
+        BufferedFileMixin.__init__( self, bufferSize, flushInterval, flushLevel )
+        logging.handlers.WatchedFileHandler.__init__( self, filename, mode, encoding, delay )
+        return
+
+
+class BufferedRotatingFileHandler( BufferedFileMixin, logging.handlers.RotatingFileHandler ):
+    """RotatingFileHandler that flushes its buffer by size, time and level.
+    The rollover uses the size counted by the handler, the stream is not
+    flushed to get its position.
+    """
+    def __init__( self, filename: str, mode: str = 'a', maxBytes: int = 0, backupCount: int = 0,
+                  encoding: str = None, delay: bool = False,
+                  bufferSize: int = 65536, flushInterval: float = 1.0, flushLevel = 'ERROR' ):
+        BufferedFileMixin.__init__( self, bufferSize, flushInterval, flushLevel )
+        logging.handlers.RotatingFileHandler.__init__( self, filename, mode, maxBytes, backupCount,
+                                                       encoding, delay )
+        return
+
+    def shouldRollover( self, record: logging.LogRecord ) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+
+        # never a rollover of a special file
+        if self.maxBytes <= 0 or self._fileSize is None:
+            return False
+
+        return self._fileSize + len( self.format( record ) ) + len( self.terminator ) >= self.maxBytes
+
+
+def readFrames( data: bytes ) -> tuple:
+    """Decodes the framed records of SocketHandler and DatagramHandler and
+    their batching variants. The records are unpickled, only use it for
+    data of a trusted sender.
+
+    :param data:    bytes:  the received data
+    :return:        tuple:  ( list of LogRecord, the bytes of an incomplete
+                            frame at the end )
+    """
+    records = []
+    offset = 0
+    while len( data ) - offset >= 4:
+        size = struct.unpack( '>L', data[ offset : offset + 4 ] )[ 0 ]
+        if len( data ) - offset - 4 < size:
+            break
+
+        records.append( logging.makeLogRecord( pickle.loads( data[ offset + 4 : offset + 4 + size ] ) ) )
+        offset += 4 + size
+
+    return records, data[ offset: ]
+
+
+# The listener of the process and the ( logger, proxy ) pairs it serves,
+# see installQueueProxies()
+_LISTENER       = None
+_PROXIES        = []
+_LISTENER_LOCK  = threading.Lock()
+# The owners of the started listeners of the QueueListener handlers, see
+# manageListener()
+_MANAGED        = []
+
+
+def installQueueProxies( loggers: list, queueSize: int = 0 ) -> RoutingQueueListener:
+    """Replaces the handlers of the loggers by QueueProxyHandler objects and
+    starts the listener thread that handles the records. The listener of
+    a previous call is stopped first.
+
+    :param loggers:     list:   the names of the loggers, '' is the root logger
+    :param queueSize:   int:    the maximum number of records in the queue,
+                                0 is unbounded
+    :return:            RoutingQueueListener:   the started listener
+    """
+    global _LISTENER
+    with _LISTENER_LOCK:
+        _stopListener()
+        records = queue.Queue( queueSize )
+        proxies = {}
+        for name in loggers:
+            logger = logging.getLogger( name or None )
+            for handler in list( logger.handlers ):
+                if isinstance( handler, logging.handlers.QueueHandler ):
+                    # already off the caller's thread
+                    continue
+
+                proxy = proxies.get( handler )
+                if proxy is None:
+                    proxy = proxies[ handler ] = QueueProxyHandler( records, handler )
+
+                logger.removeHandler( handler )
+                logger.addHandler( proxy )
+                _PROXIES.append( ( logger, proxy ) )
+
+        _LISTENER = RoutingQueueListener( records )
+        _LISTENER.start()
+
+    return _LISTENER
+
+
+def manageListener( listener: object ) -> None:
+    """Registers the owner of a started listener, its stop() is called
+    with the listener of the process by stopQueueListener(). The owner
+    keeps the started state, so stop() may be called more than once.
+
+    :param listener:    object: the owner, like LoggingQueueListenerConfig
+    :return:            None
+    """
+    with _LISTENER_LOCK:
+        _MANAGED.append( listener )
+
+    return
+
+
+def stopQueueListener() -> None:
+    """Stops the listener threads, the loggers get their handlers back and
+    the records still in the queues are handled. Called by
+    LoggingConfig.setConfig() and at exit.
+
+    :return:    None
+    """
+    with _LISTENER_LOCK:
+        _stopListener()
+
+    return
+
+
+def getQueueListener() -> RoutingQueueListener:
+    """Returns the running listener or None
+
+    :return:    RoutingQueueListener:   the listener
+    """
+    return _LISTENER
+
+
+def _stopListener() -> None:
+    global _LISTENER
+    # the handlers are put back first, so no record ends up in a queue
+    # that is no longer read
+    for logger, proxy in _PROXIES:
+        if proxy in logger.handlers:
+            logger.addHandler( proxy.target )
+            logger.removeHandler( proxy )
+
+    del _PROXIES[:]
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+    while _MANAGED:
+        _MANAGED.pop().stop()
+
+    return
+
+
+# registered after logging.shutdown, so it runs before the handlers are closed
+atexit.register( stopQueueListener )
@@ -0,0 +1,206 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+"""Flat index of the dotted paths of a configuration tree, see
+ConfigProcessor.getPathValue() and ConfigProcessor.getPathValues().
+"""
+import bisect
+import threading
+
+
+class PathIndex( object ):
+    """Maps the dotted paths of a configuration tree, like
+    'common.database.engine', onto their values. The nested objects are
+    indexed as well, 'common.database' maps onto the DatabaseConfig object.
+
+    Every indexed object holds a weak reference to the index, when a setter
+    changes the object only the keys that read the attribute are indexed
+    again, see update(), and ParseConfig indexes the keys of the object
+    again, see refresh(). The paths are also held in a sorted list for prefix queries.
+    """
+    def __init__( self, root: object ):
+        """Constructor of the index, builds the index of the tree
+
+        :param root:    ConfigProcessor:    the root of the tree
+        """
+        self.__values   = {}
+        self.__paths    = []
+        # id( object ) -> [ object, { prefix: keys } ]
+        self.__nodes    = {}
+        self.__lock     = threading.RLock()
+        with self.__lock:
+            self.__index( root, '' )
+
+        return
+
+    def get( self, path: str ) -> object:
+        """Returns the value of the path
+
+        :param path:    str:    dotted path
+        :return:        object: the value
+        :raises:        KeyError when the path does not exist
+        """
+        return self.__values[ path ]
+
+    def items( self, prefix: str ) -> dict:
+        """Returns the paths and values below the prefix
+
+        :param prefix:  str:    dotted path, '' returns the complete index
+        :return:        dict:   path and value, ordered by path
+        """
+        if prefix:
+            prefix += '.'
+
+        with self.__lock:
+            paths = self.__paths
+            start = bisect.bisect_left( paths, prefix )
+            end   = start
+            while end < len( paths ) and paths[ end ].startswith( prefix ):
+                end += 1
+
+            return { path: self.__values[ path ] for path in paths[ start: end ] }
+
+    def refresh( self, node: object ) -> None:
+        """Indexes the keys of the changed object again, nested objects that
+        are still the same object are not indexed again.
+
+        :param node:    ConfigProcessor:    the changed object
+        :return:        None
+        """
+        with self.__lock:
+            entry = self.__nodes.get( id( node ) )
+            if entry is None:
+                return
+
+            items = list( node._diffItems() )
+            for prefix, keys in list( entry[ 1 ].items() ):
+                current = set()
+                for key, value in items:
+                    current.add( key )
+                    self.__update( self.__join( prefix, key ), value )
+
+                for key in keys:
+                    if key not in current:
+                        path = self.__join( prefix, key )
+                        self.__remove( path, self.__values[ path ] )
+                        self.__paths.pop( bisect.bisect_left( self.__paths, path ) )
+                        del self.__values[ path ]
+
+                entry[ 1 ][ prefix ] = tuple( key for key, value in items )
+
+        return
+
+    def update( self, node: object, items: list ) -> None:
+        """Indexes the given keys of the changed object again, used when a
+        setter changed some keys of the object.
+
+        :param node:    ConfigProcessor:    the changed object
+        :param items:   list:               the ( config key, value ) pairs
+        :return:        None
+        """
+        with self.__lock:
+            entry = self.__nodes.get( id( node ) )
+            if entry is None:
+                return
+
+            for prefix, keys in list( entry[ 1 ].items() ):
+                for key, value in items:
+                    self.__update( self.__join( prefix, key ), value )
+                    if key not in keys:
+                        keys += ( key, )
+
+                entry[ 1 ][ prefix ] = keys
+
+        return
+
+    def __update( self, path: str, value: object ) -> None:
+        """Sets the value of the path when it is another object than the
+        indexed one.
+        """
+        old = self.__values.get( path, self )
+        if old is value:
+            return
+
+        if old is not self:
+            self.__remove( path, old )
+
+        self.__set( path, value )
+        return
+
+    @staticmethod
+    def __join( prefix: str, key: object ) -> str:
+        return "{}.{}".format( prefix, key ) if prefix else str( key )
+
+    def __set( self, path: str, value: object ) -> None:
+        """Sets the value of the path and indexes a nested object
+        """
+        if path not in self.__values:
+            bisect.insort( self.__paths, path )
+
+        self.__values[ path ] = value
+        if hasattr( value, '_diffItems' ):
+            self.__index( value, path )
+
+        return
+
+    def __index( self, node: object, prefix: str ) -> None:
+        """Indexes the object and its nested objects below the prefix
+        """
+        items = list( node._diffItems() )
+        entry = self.__nodes.get( id( node ) )
+        if entry is None:
+            entry = self.__nodes[ id( node ) ] = [ node, {} ]
+            node._addIndex( self )
+
+        entry[ 1 ][ prefix ] = tuple( key for key, value in items )
+        for key, value in items:
+            self.__set( self.__join( prefix, key ), value )
+
+        return
+
+    def __remove( self, path: str, value: object ) -> None:
+        """Removes the paths below the path of a replaced nested object
+        """
+        if not hasattr( value, '_diffItems' ):
+            return
+
+        prefix = path + '.'
+        start = bisect.bisect_left( self.__paths, prefix )
+        end   = start
+        while end < len( self.__paths ) and self.__paths[ end ].startswith( prefix ):
+            end += 1
+
+        for child in self.__paths[ start: end ]:
+            self.__forget( self.__values.pop( child ), child )
+
+        del self.__paths[ start: end ]
+        self.__forget( value, path )
+        return
+
+    def __forget( self, value: object, path: str ) -> None:
+        """Removes the registration of an object that is no longer in the
+        tree at the path.
+        """
+        entry = self.__nodes.get( id( value ) )
+        if entry is not None and entry[ 0 ] is value:
+            entry[ 1 ].pop( path, None )
+            if not entry[ 1 ]:
+                del self.__nodes[ id( value ) ]
+                value._removeIndex( self )
+
+        return
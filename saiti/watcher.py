@@ -0,0 +1,427 @@
+# Convert a YAML config file into classes.
+#
+# Copyright (C) 2019  Marc Bertens-Nguyen <m.bertens@pe2mbs.nl
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+import ctypes
+import ctypes.util
+from saiti.base import ConfigProcessor, collectErrors, _PROCESSOR
+from saiti.baselist import ConfigProcessorList
+from saiti.importspec import clearCallableCache
+
+
+log = logging.getLogger( __name__ )
+
+# inotify(7) event masks
+IN_MODIFY       = 0x00000002
+IN_CLOSE_WRITE  = 0x00000008
+IN_MOVED_TO     = 0x00000080
+IN_CREATE       = 0x00000100
+IN_DELETE       = 0x00000200
+IN_NONBLOCK     = os.O_NONBLOCK
+IN_CLOEXEC      = getattr( os, 'O_CLOEXEC', 0 )
+IN_EVENT        = struct.Struct( 'iIII' )
+
+
+class InotifyWatch( object ):
+    """Watches the folder of a file with the Linux inotify(7) API, the folder
+    is watched as editors often replace a file by renaming a new one.
+    """
+    def __init__( self, filename: str ):
+        """Constructor of the inotify watch, raises OSError when inotify is
+        not available.
+
+        :param filename:    str:    the file to watch
+        """
+        if not sys.platform.startswith( 'linux' ):
+            raise OSError( errno.ENOSYS, 'inotify is only available on Linux' )
+
+        libc = ctypes.CDLL( ctypes.util.find_library( 'c' ), use_errno = True )
+        folder, self.__name = os.path.split( os.path.abspath( filename ) )
+        self.__name = os.fsencode( self.__name )
+        self.__fd   = libc.inotify_init1( IN_NONBLOCK | IN_CLOEXEC )
+        if self.__fd < 0:
+            raise OSError( ctypes.get_errno(), 'inotify_init1 failed' )
+
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if libc.inotify_add_watch( self.__fd, os.fsencode( folder ), mask ) < 0:
+            error = ctypes.get_errno()
+            os.close( self.__fd )
+            raise OSError( error, 'inotify_add_watch failed' )
+
+        return
+
+    def fileno( self ) -> int:
+        """The inotify file descriptor, to be used with select()
+        """
+        return self.__fd
+
+    def changed( self ) -> bool:
+        """Reads the pending events.
+
+        :return:    bool:   True when one of the events is for the file
+        """
+        result = False
+        while True:
+            try:
+                data = os.read( self.__fd, 4096 )
+
+            except BlockingIOError:
+                return result
+
+            offset = 0
+            while offset < len( data ):
+                wd, mask, cookie, length = IN_EVENT.unpack_from( data, offset )
+                offset += IN_EVENT.size
+                name = data[ offset: offset + length ].rstrip( b'\0' )
+                offset += length
+                if name == self.__name:
+                    result = True
+
+    def close( self ) -> None:
+        """Closes the inotify file descriptor
+        """
+        os.close( self.__fd )
+        return
+
+
+class PollingWatch( object ):
+    """Watches a file by polling its modification time and size.
+    """
+    def __init__( self, filename: str ):
+        self.__filename = filename
+        self.__stat     = self.__getStat()
+        return
+
+    def __getStat( self ) -> tuple:
+        """Returns the modification time and size or None when the file
+        does not exist.
+        """
+        try:
+            stat = os.stat( self.__filename )
+            return stat.st_mtime_ns, stat.st_size
+
+        except OSError:
+            return None
+
+    def fileno( self ) -> int:
+        """Polling has no file descriptor to wait on
+        """
+        return None
+
+    def changed( self ) -> bool:
+        """Returns True when the modification time or size changed since
+        the previous call.
+        """
+        stat = self.__getStat()
+        if stat != self.__stat:
+            self.__stat = stat
+            return True
+
+        return False
+
+    def close( self ) -> None:
+        return
+
+
+def diffDocuments( old: any, new: any, path: tuple = () ) -> list:
+    """Compares two configuration documents.
+
+    :param old:     any:    the previous document
+    :param new:     any:    the new document
+    :param path:    tuple:  the path of the documents
+    :return:        list:   paths ( tuples of keys ) that were added,
+                            removed or changed
+    """
+    if old == new:
+        return []
+
+    if not isinstance( old, dict ) or not isinstance( new, dict ):
+        return [ path ]
+
+    changes = []
+    for key in old.keys() | new.keys():
+        if key not in old or key not in new:
+            changes.append( path + ( key, ) )
+
+        else:
+            changes.extend( diffDocuments( old[ key ], new[ key ], path + ( key, ) ) )
+
+    return changes
+
+
+def _replaceObject( obj: ConfigProcessor, placeholder: object, value: object ) -> None:
+    """Replaces all references of the object to placeholder by value.
+    """
+    attrs = vars( obj )
+    for attr, current in list( attrs.items() ):
+        if current is placeholder:
+            attrs[ attr ] = value
+            value._setParent( obj )
+
+    obj._changed()
+    return
+
+
+def stageConfig( live: ConfigProcessor, fresh: ConfigProcessor, old: dict, new: dict ) -> None:
+    """Builds the new configuration into the fresh (unparsed) object. The
+    unchanged nested ConfigProcessor objects of the live object are re-used,
+    ParseConfig only runs on the changed sub-trees and the primitive values.
+
+    :param live:    ConfigProcessor:    the object holding the old document
+    :param fresh:   ConfigProcessor:    new object to parse the new document in
+    :param old:     dict:               the old document
+    :param new:     dict:               the new document
+    :return:        None
+    """
+    plan    = fresh._parsePlan()
+    partial = {}
+    reuse   = []
+    nested  = []
+    for key, value in new.items():
+        entry = plan.get( key )
+        if entry is not None and entry[ 1 ] is _PROCESSOR:
+            live_child = entry[ 2 ]( live )
+
+        elif entry is None and key in live.getWildcardKeys() and not live._isRawWildcard( key ):
+            # sections that are still raw data are not build for the compare
+            live_child = live.getWildcardValue( key )
+
+        else:
+            live_child = None
+
+        if live_child is not None and isinstance( value, dict ) and isinstance( old.get( key ), dict ):
+            if old[ key ] == value:
+                reuse.append( ( key, entry, live_child ) )
+                continue
+
+            elif not isinstance( live_child, ConfigProcessorList ):
+                # only the changed parts of the section are parsed
+                nested.append( ( key, entry, live_child ) )
+                if entry is None:
+                    partial[ key ] = {}
+
+                continue
+
+        partial[ key ] = value
+
+    fresh.ParseConfig( partial )
+    token = fresh._enterBreadCrum()
+    try:
+        for key, entry, live_child in nested:
+            fresh_child = entry[ 2 ]( fresh ) if entry is not None else fresh.getWildcardValue( key )
+            fresh_child._throw_exception = fresh._throw_exception
+            stageConfig( live_child, fresh_child, old[ key ], new[ key ] )
+
+    finally:
+        fresh._leaveBreadCrum( token )
+
+    for key, entry, live_child in reuse:
+        if entry is None:
+            fresh._adoptWildcard( key, live_child )
+
+        else:
+            _replaceObject( fresh, entry[ 2 ]( fresh ), live_child )
+
+    return
+
+
+class ConfigWatcher( object ):
+    """Watches the file of a YamlConfigFile or JsonConfigFile object and
+    applies the changes to the live object.
+
+    On a change the file is read again and the changed sections are parsed
+    into a new root object, which re-uses the unchanged sections of the live
+    object. The state of the live object is then swapped in one step, so
+    readers either see the old or the new configuration. When the parse of
+    the new file reports errors the live object is kept unchanged.
+    """
+    def __init__( self, config: ConfigProcessor,
+                  factory = None,
+                  debounce: float = 0.5,
+                  interval: float = 1.0,
+                  polling: bool = False,
+                  callback = None,
+                  **kwargs ):
+        """Constructor of the watcher
+
+        :param config:      ConfigProcessor:    the live file object
+        :param factory:     func:   returns a new, not loaded, object of the
+                                    file class. When omitted the class of the
+                                    config is called with the filename,
+                                    loadLater = True, the options of the
+                                    config (see getOptions()) and kwargs.
+        :param debounce:    float:  seconds the file must be unchanged before
+                                    it is reloaded, 0 disables the debounce.
+        :param interval:    float:  seconds between polls of the file
+        :param polling:     bool:   True always use polling, otherwise inotify
+                                    is used when available.
+        :param callback:    func:   called with the config and the list of
+                                    changed paths after a reload
+        :param kwargs:      dict:   keywords for the file class, these
+                                    override the options of the config
+        """
+        self.__config   = config
+        if factory is None:
+            def factory():
+                options = dict( config.getOptions(), **kwargs )
+                return type( config )( config.getFilename(), loadLater = True, **options )
+
+        self.__factory  = factory
+        self.__debounce = debounce
+        self.__interval = interval
+        self.__polling  = polling
+        self.__callback = callback
+        self.__document = config.LoadDocument()
+        self.__lock     = threading.Lock()
+        self.__thread   = None
+        self.__stop     = threading.Event()
+        return
+
+    def reload( self ) -> list:
+        """Reads the file and applies the changes to the live object. When
+        the new configuration has errors the live object is not changed.
+
+        :return:    list:   the changed paths
+        :raises:    ValueError: the new configuration has errors
+        """
+        with self.__lock:
+            fresh       = self.__factory()
+            document    = fresh.LoadDocument()
+            changes     = diffDocuments( self.__document, document )
+            if not changes:
+                return changes
+
+            # an import that failed before may succeed now
+            clearCallableCache()
+
+            with collectErrors() as report:
+                stageConfig( self.__config, fresh, self.__document, document )
+                if fresh._lazy:
+                    # the deferred sections would only report their errors after the swap
+                    fresh.validate()
+
+            if len( report ):
+                raise ValueError( "reload of {} failed: {}".format( self.__config.getFilename(),
+                                                                    "; ".join( error.message for error in report ) ) )
+
+            # swap the complete state in one step
+            self.__config.__dict__ = fresh.__dict__
+            for child in self.__config._children():
+                child._setParent( self.__config )
+
+            self.__document = document
+
+        if self.__callback is not None:
+            self.__callback( self.__config, [ ".".join( str( key ) for key in path ) for path in changes ] )
+
+        return changes
+
+    def start( self ) -> None:
+        """Starts watching the file in a daemon thread.
+
+        :return:    None
+        """
+        if self.__thread is not None:
+            return
+
+        watch = None
+        if not self.__polling:
+            try:
+                watch = InotifyWatch( self.__config.getFilename() )
+
+            except OSError:
+                log.debug( "inotify not available, polling {}".format( self.__config.getFilename() ) )
+
+        if watch is None:
+            watch = PollingWatch( self.__config.getFilename() )
+
+        self.__stop.clear()
+        self.__thread = threading.Thread( target = self.__run, args = ( watch, ),
+                                          name = 'saiti-watcher', daemon = True )
+        self.__thread.start()
+        return
+
+    def stop( self ) -> None:
+        """Stops watching the file.
+
+        :return:    None
+        """
+        thread, self.__thread = self.__thread, None
+        if thread is not None:
+            self.__stop.set()
+            thread.join()
+
+        return
+
+    def isWatching( self ) -> bool:
+        """Returns True when the watcher thread is running
+        """
+        return self.__thread is not None
+
+    def __wait( self, watch ) -> bool:
+        """Waits for an event or the interval, returns True when the watch
+        reports a change.
+        """
+        if watch.fileno() is None:
+            if self.__stop.wait( self.__interval ):
+                return False
+
+        else:
+            # the short timeout keeps the thread responsive to stop()
+            select.select( [ watch ], [], [], 0.1 )
+
+        return watch.changed()
+
+    def __run( self, watch ) -> None:
+        """The watcher thread
+        """
+        try:
+            while not self.__stop.is_set():
+                if not self.__wait( watch ):
+                    continue
+
+                if self.__debounce:
+                    # wait until the file did not change for the debounce time
+                    deadline = time.monotonic() + self.__debounce
+                    while not self.__stop.is_set() and time.monotonic() < deadline:
+                        if self.__stop.wait( min( self.__debounce, 0.05 ) ):
+                            break
+
+                        if watch.changed():
+                            deadline = time.monotonic() + self.__debounce
+
+                if self.__stop.is_set():
+                    break
+
+                try:
+                    self.reload()
+
+                except Exception:
+                    log.exception( "reload of {} failed".format( self.__config.getFilename() ) )
+
+        finally:
+            watch.close()
+
+        return
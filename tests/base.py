@@ -0,0 +1,431 @@
+import os
+import time
+import shutil
+import unittest
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from saiti import ConfigProcessor, PathList, YamlConfigFile
+from saiti.base import shareSubtrees, _PARSE_PLANS, _PROCESSOR, _PRIMITIVE, _LIST
+
+
+class ChildConfig( ConfigProcessor ):
+    def __init__( self, name = 'child', **kwargs ):
+        ConfigProcessor.__init__( self, name, **kwargs )
+        self.__port     = 8000
+        return
+
+    @property
+    def port( self ) -> int:
+        return self.__port
+
+    @port.setter
+    def port( self, value: int ):
+        # give other threads the opportunity to run while parsing
+        time.sleep( 0 )
+        self.__port = value
+        return
+
+
+class ParentConfig( ConfigProcessor ):
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'parent', { 'class': 'cls' }, **kwargs )
+        self.__cls      = None
+        self.__debug    = False
+        self.__paths    = PathList( must_exists = False )
+        self.__child    = ChildConfig( **kwargs )
+        return
+
+    @property
+    def cls( self ) -> str:
+        return self.__cls
+
+    @cls.setter
+    def cls( self, value: str ):
+        self.__cls = value
+        return
+
+    @property
+    def debug( self ) -> bool:
+        return self.__debug
+
+    @debug.setter
+    def debug( self, value: bool ):
+        self.__debug = value
+        return
+
+    @property
+    def paths( self ) -> PathList:
+        return self.__paths
+
+    @property
+    def child( self ) -> ChildConfig:
+        return self.__child
+
+
+class WildcardConfig( ConfigProcessor ):
+    def __init__( self, name = 'wildcard', **kwargs ):
+        ConfigProcessor.__init__( self, name, **kwargs )
+        self.setWildcardObject( ChildConfig, **kwargs )
+        return
+
+
+class FormatterConfig( ConfigProcessor ):
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'formatter', **kwargs )
+        self.__formatter    = logging.Formatter()
+        return
+
+    @property
+    def formatter( self ) -> logging.Formatter:
+        return self.__formatter
+
+    @formatter.setter
+    def formatter( self, value: logging.Formatter ):
+        self.__formatter = value
+        return
+
+
+class TestParsePlan( unittest.TestCase ):
+    def test_parse( self ):
+        obj = ParentConfig( throw_exception = True )
+        obj.ParseConfig( { 'class': 'logging.StreamHandler',
+                           'debug': True,
+                           'paths': [ '/a', '/b' ],
+                           'child': { 'port': 9000 } } )
+        self.assertEqual( obj.cls, 'logging.StreamHandler' )
+        self.assertTrue( obj.debug )
+        self.assertEqual( obj.paths, [ '/a', '/b' ] )
+        self.assertEqual( obj.child.port, 9000 )
+        return
+
+    def test_plan_cached_per_class( self ):
+        ParentConfig().ParseConfig( {} )
+        plan = _PARSE_PLANS[ ( ParentConfig, ( ( 'class', 'cls' ), ) ) ]
+        self.assertIs( plan[ 'class' ], plan[ 'cls' ] )
+        self.assertEqual( plan[ 'cls' ][ 1 ], _PRIMITIVE )
+        self.assertEqual( plan[ 'paths' ][ 1 ], _LIST )
+        self.assertEqual( plan[ 'child' ][ 1 ], _PROCESSOR )
+        self.assertNotIn( 'name', plan )
+        return
+
+    def test_unknown_key( self ):
+        obj = ParentConfig( throw_exception = True )
+        with self.assertRaises( AttributeError ):
+            obj.ParseConfig( { 'unknown': 1 } )
+
+        with self.assertRaises( AttributeError ):
+            obj.ParseConfig( { 'name': 'x' } )
+
+        return
+
+    def test_type_errors( self ):
+        obj = ParentConfig( throw_exception = True )
+        for config in ( { 'debug': 1.5 }, { 'paths': 'x' }, { 'child': [ 1 ] } ):
+            with self.assertRaises( AttributeError ):
+                obj.ParseConfig( config )
+
+        return
+
+    def test_wildcard( self ):
+        obj = WildcardConfig( throw_exception = True )
+        obj.ParseConfig( { 'one': { 'port': 1 }, 'two': { 'port': 2 } } )
+        obj.ParseConfig( { 'one': { 'port': 3 } } )
+        self.assertEqual( list( obj.getWildcardKeys() ), [ 'one', 'two' ] )
+        self.assertEqual( obj.getWildcardValue( 'one' ).port, 3 )
+        self.assertEqual( obj.two.port, 2 )
+        return
+
+    def test_wildcard_view( self ):
+        obj = WildcardConfig( throw_exception = True )
+        obj.ParseConfig( { 'one': { 'port': 1 } } )
+        view = obj.getWildcardValue()
+        self.assertIs( obj.getWildcardValue(), view )
+        obj.ParseConfig( { 'two': { 'port': 2 } } )
+        self.assertEqual( list( view ), [ 'one', 'two' ] )
+        self.assertEqual( { key: value.port for key, value in view.items() }, { 'one': 1, 'two': 2 } )
+        self.assertNotIn( 'three', view )
+        with self.assertRaises( KeyError ):
+            view[ 'three' ]
+
+        with self.assertRaises( TypeError ):
+            view[ 'three' ] = None
+
+        replacement = ChildConfig( 'two' )
+        obj.two = replacement
+        self.assertIs( view[ 'two' ], replacement )
+        self.assertIs( obj.getWildcardValue( 'two' ), replacement )
+        return
+
+
+class TestProps( unittest.TestCase ):
+    def test_props( self ):
+        obj = ParentConfig()
+        obj.ParseConfig( { 'class': 'logging.StreamHandler', 'debug': True } )
+        props = obj.props()
+        self.assertEqual( list( props ), [ 'child', 'class', 'debug', 'paths' ] )
+        self.assertEqual( props[ 'class' ], 'logging.StreamHandler' )
+        self.assertIs( props[ 'child' ], obj.child )
+        return
+
+    def test_wildcard_props( self ):
+        obj = WildcardConfig()
+        obj.ParseConfig( { 'one': { 'port': 1 } } )
+        self.assertEqual( list( obj.props() ), [ 'one' ] )
+        self.assertEqual( obj.props()[ 'one' ].props(), { 'port': 1 } )
+        return
+
+
+class TestDiff( unittest.TestCase ):
+    def build( self, port = 1 ):
+        obj = WildcardConfig( throw_exception = True )
+        obj.ParseConfig( { 'one': { 'port': port }, 'two': { 'port': 2 } } )
+        return obj
+
+    def test_identical( self ):
+        old, new = self.build(), self.build()
+        self.assertEqual( old.getFingerprint(), new.getFingerprint() )
+        self.assertEqual( ConfigProcessor.diff( old, new ), ( [], [], [] ) )
+        return
+
+    def test_changes( self ):
+        old, new = self.build(), self.build( port = 3 )
+        new.ParseConfig( { 'three': { 'port': 3 } } )
+        diff = ConfigProcessor.diff( old, new )
+        self.assertEqual( diff.added, [ ( 'three', ) ] )
+        self.assertEqual( diff.removed, [] )
+        self.assertEqual( diff.changed, [ ( 'one', 'port' ) ] )
+        self.assertEqual( ConfigProcessor.diff( new, old ).removed, [ ( 'three', ) ] )
+        return
+
+    def test_setter_invalidates( self ):
+        obj = ParentConfig()
+        obj.ParseConfig( { 'child': { 'port': 1 }, 'paths': [ '/a' ] } )
+        fingerprint = obj.getFingerprint()
+        self.assertIs( obj.getFingerprint(), fingerprint )
+        obj.child.port = 2
+        self.assertNotEqual( obj.getFingerprint(), fingerprint )
+        obj.child.port = 1
+        self.assertEqual( obj.getFingerprint(), fingerprint )
+        obj.ParseConfig( { 'paths': [ '/b' ] } )
+        self.assertNotEqual( obj.getFingerprint(), fingerprint )
+        return
+
+    def test_tracked_after_fingerprint( self ):
+        # the setters are only tracked once the fingerprint was computed
+        obj = ParentConfig()
+        obj.ParseConfig( { 'child': { 'port': 1 } } )
+        self.assertIs( type( obj.child ), ChildConfig )
+        fingerprint = obj.getFingerprint()
+        self.assertIsNot( type( obj.child ), ChildConfig )
+        self.assertIsInstance( obj.child, ChildConfig )
+        obj.debug = True
+        self.assertNotEqual( obj.getFingerprint(), fingerprint )
+        other = ParentConfig()
+        other.ParseConfig( { 'child': { 'port': 1 }, 'debug': True } )
+        self.assertEqual( ConfigProcessor.diff( obj, other ), ( [], [], [] ) )
+        return
+
+    def test_import_spec( self ):
+        # objects build from the same specification are equal for diff()
+        old, new = FormatterConfig(), FormatterConfig()
+        old.ParseConfig( { 'formatter': 'logging.Formatter( "%(message)s" )' } )
+        new.ParseConfig( { 'formatter': 'logging.Formatter( "%(message)s" )' } )
+        self.assertEqual( old.getFingerprint(), new.getFingerprint() )
+        self.assertEqual( ConfigProcessor.diff( old, new ), ( [], [], [] ) )
+        new.ParseConfig( { 'formatter': 'logging.Formatter( "%(name)s" )' } )
+        self.assertEqual( ConfigProcessor.diff( old, new ).changed, [ ( 'formatter', ) ] )
+        new.formatter = logging.Formatter( "%(message)s" )
+        self.assertEqual( ConfigProcessor.diff( old, new ).changed, [ ( 'formatter', ) ] )
+        return
+
+
+class CountingConfig( ChildConfig ):
+    BUILD = []
+
+    def __init__( self, name = 'child', **kwargs ):
+        ChildConfig.__init__( self, name, **kwargs )
+        self.BUILD.append( name )
+        return
+
+
+class TestActiveWildcards( unittest.TestCase ):
+    def build( self, active ):
+        CountingConfig.BUILD.clear()
+        obj = WildcardConfig( throw_exception = True )
+        obj.setWildcardObject( CountingConfig, throw_exception = True )
+        obj.setActiveWildcards( active )
+        obj.ParseConfig( { 'one': { 'port': 1 }, 'two': { 'port': 2 }, 'three': { 'unknown': 3 } } )
+        return obj
+
+    def test_active_only( self ):
+        obj = self.build( [ 'one' ] )
+        self.assertEqual( CountingConfig.BUILD, [ 'one' ] )
+        self.assertEqual( list( obj.getWildcardKeys() ), [ 'one', 'two', 'three' ] )
+        self.assertTrue( obj._isRawWildcard( 'two' ) )
+        self.assertEqual( obj.two.port, 2 )
+        self.assertEqual( obj.getWildcardValue( 'two' ).port, 2 )
+        self.assertEqual( CountingConfig.BUILD, [ 'one', 'two' ] )
+        self.assertFalse( obj._isRawWildcard( 'two' ) )
+        self.assertIsInstance( obj, WildcardConfig )
+        with self.assertRaises( AttributeError ):
+            obj.getWildcardValue()[ 'three' ]
+
+        return
+
+    def test_diff_raw( self ):
+        old, new = self.build( 'one' ), self.build( 'one' )
+        new.ParseConfig( { 'one': { 'port': 11 } } )
+        self.assertEqual( ConfigProcessor.diff( old, new ), ( [], [], [ ( 'one', 'port' ) ] ) )
+        self.assertEqual( CountingConfig.BUILD, [ 'one' ] )
+        self.assertTrue( old._isRawWildcard( 'two' ) and new._isRawWildcard( 'two' ) )
+        new.ParseConfig( { 'two': { 'port': 22 } } )
+        self.assertEqual( ConfigProcessor.diff( old, new ).changed, [ ( 'one', 'port' ), ( 'two', ) ] )
+        self.assertTrue( new._isRawWildcard( 'two' ) )
+        return
+
+    def test_error_on_access( self ):
+        obj = self.build( 'one' )
+        with self.assertRaises( AttributeError ) as ctx:
+            obj.three
+
+        self.assertEqual( str( ctx.exception ), 'wildcard->three has no attr unknown' )
+        with self.assertRaises( AttributeError ):
+            obj.four
+
+        return
+
+    def test_parse_again( self ):
+        obj = self.build( [ 'one' ] )
+        obj.ParseConfig( { 'two': { 'port': 22 } } )
+        self.assertEqual( CountingConfig.BUILD, [ 'one' ] )
+        self.assertEqual( obj.two.port, 22 )
+        return
+
+    def test_threads( self ):
+        obj = self.build( [] )
+        with ThreadPoolExecutor( max_workers = 8 ) as executor:
+            ports = list( executor.map( lambda idx: obj.two.port, range( 50 ) ) )
+
+        self.assertEqual( ports, [ 2 ] * 50 )
+        self.assertEqual( CountingConfig.BUILD, [ 'two' ] )
+        return
+
+
+class CountingWildcardConfig( WildcardConfig ):
+    def __init__( self, name = 'wildcard', **kwargs ):
+        WildcardConfig.__init__( self, name, **kwargs )
+        self.setWildcardObject( CountingConfig )
+        return
+
+
+class TestShareSubtrees( unittest.TestCase ):
+    def test_wildcard_not_build( self ):
+        CountingConfig.BUILD.clear()
+        obj = WildcardConfig()
+        obj.setWildcardObject( CountingWildcardConfig )
+        section = { 'port': 1 }
+        with shareSubtrees():
+            obj.ParseConfig( { 'one': { 'web': section }, 'two': { 'web': section, 'admin': { 'port': 2 } } } )
+
+        self.assertEqual( CountingConfig.BUILD, [ 'web', 'admin' ] )
+        self.assertIs( obj.one.web, obj.two.web )
+        self.assertTrue( obj.one.web.isShared() )
+        return
+
+
+class TestLazy( unittest.TestCase ):
+    def test_deferred( self ):
+        obj = ParentConfig( lazy = True, throw_exception = True )
+        obj.ParseConfig( { 'debug': True, 'child': { 'port': 9000 } } )
+        self.assertTrue( obj.debug )
+        child = obj.child
+        self.assertIsNot( type( child ), ChildConfig )
+        self.assertEqual( child.port, 9000 )
+        self.assertIs( type( child ), ChildConfig )
+        return
+
+    def test_error_on_access( self ):
+        obj = ParentConfig( lazy = True, throw_exception = True )
+        obj.ParseConfig( { 'child': { 'unknown': 1 } } )
+        with self.assertRaises( ValueError ) as ctx:
+            obj.child.port
+
+        self.assertEqual( str( ctx.exception ), 'parent->child has no attr unknown' )
+        with self.assertRaises( ValueError ):
+            obj.child.port
+
+        return
+
+    def test_error_not_swallowed( self ):
+        obj = ParentConfig( lazy = True, throw_exception = True )
+        obj.ParseConfig( { 'child': { 'unknown': 1 } } )
+        for _ in range( 2 ):
+            with self.assertRaises( ValueError ):
+                hasattr( obj.child, 'port' )
+
+        return
+
+    def test_validate( self ):
+        obj = WildcardConfig( lazy = True, throw_exception = True )
+        obj.ParseConfig( { 'one': { 'port': 1 }, 'two': { 'unknown': 2 } } )
+        with self.assertRaises( ValueError ):
+            obj.validate()
+
+        return
+
+
+class WildcardFile( YamlConfigFile ):
+    def __init__( self, filename: str, **kwargs ):
+        YamlConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.setWildcardObject( WildcardConfig, **kwargs )
+        self.Load()
+        return
+
+
+class TestConcurrentParse( unittest.TestCase ):
+    FILES = 100
+
+    def setUp( self ):
+        self.folder = tempfile.mkdtemp()
+        for idx in range( self.FILES ):
+            with open( os.path.join( self.folder, 'config{}.yaml'.format( idx ) ), 'wt' ) as stream:
+                for section in range( 20 ):
+                    stream.write( "section{}:\n  child{}:\n    port: {}\n".format( section, section, idx ) )
+
+                if idx % 2:
+                    stream.write( "  child:\n    bad{}: 1\n".format( idx ) )
+
+        return
+
+    def tearDown( self ):
+        shutil.rmtree( self.folder )
+        return
+
+    def load( self, idx ):
+        try:
+            cfg = WildcardFile( os.path.join( self.folder, 'config{}.yaml'.format( idx ) ),
+                                throw_exception = True )
+
+        except AttributeError as exc:
+            return str( exc )
+
+        return [ cfg.getWildcardValue( 'section{}'.format( section ) ).getWildcardValue( 'child{}'.format( section ) ).port
+                 for section in range( 20 ) ]
+
+    def test_threads( self ):
+        with ThreadPoolExecutor( max_workers = 16 ) as executor:
+            results = list( executor.map( self.load, range( self.FILES ) ) )
+
+        for idx, result in enumerate( results ):
+            if idx % 2:
+                self.assertEqual( result, "config{0}.yaml->section19->child has no attr bad{0}".format( idx ) )
+
+            else:
+                self.assertEqual( result, [ idx ] * 20 )
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
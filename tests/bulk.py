@@ -0,0 +1,161 @@
+import os
+import shutil
+import unittest
+import tempfile
+from unittest import mock
+from saiti import ConfigProcessor, YamlConfigFile, JsonConfigFile
+from saiti.bulk import loadConfigFiles
+from saiti.file import streamJson
+from fixtures import SectionConfig
+
+
+class TenantMixin( object ):
+    def __init__( self ):
+        self.__tenant   = ''
+        self.__port     = 0
+        return
+
+    @property
+    def tenant( self ) -> str:
+        return self.__tenant
+
+    @tenant.setter
+    def tenant( self, value: str ):
+        self.__tenant = value
+        return
+
+    @property
+    def port( self ) -> int:
+        return self.__port
+
+    @port.setter
+    def port( self, value: int ):
+        self.__port = value
+        return
+
+
+class TenantYamlFile( YamlConfigFile, TenantMixin ):
+    def __init__( self, filename: str, **kwargs ):
+        TenantMixin.__init__( self )
+        YamlConfigFile.__init__( self, filename, **kwargs )
+        return
+
+
+class TenantJsonFile( JsonConfigFile, TenantMixin ):
+    def __init__( self, filename: str, **kwargs ):
+        TenantMixin.__init__( self )
+        JsonConfigFile.__init__( self, filename, **kwargs )
+        return
+
+
+class LoadingYamlFile( TenantYamlFile ):
+    def Load( self ):
+        self.loaded = True
+        TenantYamlFile.Load( self )
+        return
+
+
+class SectionsYamlFile( YamlConfigFile ):
+    def __init__( self, filename: str, loadLater: bool = False, **kwargs ):
+        YamlConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.setWildcardObject( SectionConfig )
+        if not loadLater:
+            self.Load()
+
+        return
+
+
+class TestBulkLoader( unittest.TestCase ):
+    def setUp( self ):
+        self.folder     = tempfile.mkdtemp()
+        self.filenames  = []
+        for idx in range( 20 ):
+            filename = os.path.join( self.folder, 'tenant{}.yaml'.format( idx ) )
+            with open( filename, 'wt' ) as stream:
+                if idx == 5:
+                    stream.write( "tenant: [ unbalanced\n" )
+
+                elif idx == 7:
+                    stream.write( "tenant: seven\nport: [ 1 ]\n" )
+
+                else:
+                    stream.write( "tenant: tenant{0}\nport: {0}\n".format( idx ) )
+
+            self.filenames.append( filename )
+
+        return
+
+    def tearDown( self ):
+        shutil.rmtree( self.folder )
+        return
+
+    def check( self, results ):
+        self.assertEqual( [ result.filename for result in results ], self.filenames )
+        for idx, result in enumerate( results ):
+            if idx in ( 5, 7 ):
+                self.assertIsNone( result.config )
+                self.assertIsInstance( result.error, Exception )
+
+            else:
+                self.assertIsNone( result.error )
+                self.assertEqual( ( result.config.tenant, result.config.port ),
+                                  ( 'tenant{}'.format( idx ), idx ) )
+
+        return
+
+    def test_process_mode( self ):
+        self.check( loadConfigFiles( self.filenames, TenantYamlFile, workers = 2, throw_exception = True ) )
+        return
+
+    def test_thread_mode( self ):
+        self.check( loadConfigFiles( self.filenames, TenantYamlFile, mode = 'thread',
+                                     workers = 4, throw_exception = True ) )
+        return
+
+    def test_json( self ):
+        filename = os.path.join( self.folder, 'tenant.json' )
+        with open( filename, 'wt' ) as stream:
+            stream.write( '{ "tenant": "json", "port": 1 }' )
+
+        result, = loadConfigFiles( [ filename ], TenantJsonFile, workers = 1 )
+        self.assertEqual( ( result.config.tenant, result.config.port ), ( 'json', 1 ) )
+        return
+
+    def test_share( self ):
+        filename = os.path.join( self.folder, 'sections.yaml' )
+        with open( filename, 'wt' ) as stream:
+            stream.write( "common:\n  web: &web\n    port: 80\nother:\n  web: *web\n" )
+
+        for mode in ( 'process', 'thread' ):
+            result, = loadConfigFiles( [ filename ], SectionsYamlFile, mode = mode, workers = 1, share = True )
+            self.assertIs( result.config.getWildcardValue( 'common' ).web,
+                           result.config.getWildcardValue( 'other' ).web )
+
+        return
+
+    def test_overridden_load( self ):
+        results = loadConfigFiles( self.filenames[ : 2 ], LoadingYamlFile, workers = 1 )
+        self.assertEqual( [ result.config.loaded for result in results ], [ True, True ] )
+        return
+
+    def test_json_streaming( self ):
+        filename = os.path.join( self.folder, 'tenant.json' )
+        with open( filename, 'wt' ) as stream:
+            stream.write( '{ "tenant": "json", "port": 1 }' )
+
+        with mock.patch( 'saiti.file.streamJson', wraps = streamJson ) as stream:
+            result, = loadConfigFiles( [ filename ], TenantJsonFile, workers = 1, streaming = True )
+
+        self.assertTrue( stream.called )
+        self.assertEqual( ( result.config.tenant, result.config.port ), ( 'json', 1 ) )
+        return
+
+    def test_invalid_mode( self ):
+        with self.assertRaises( ValueError ):
+            loadConfigFiles( self.filenames, TenantYamlFile, mode = 'fiber' )
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import json
+import shutil
+import unittest
+import tempfile
+from saiti import YamlConfigFile
+from saiti.cache import ConfigCache, createCache
+
+
+class TestConfigCache( unittest.TestCase ):
+    def setUp( self ):
+        self.folder     = tempfile.mkdtemp()
+        self.filename   = os.path.join( self.folder, 'config.json' )
+        self.write( { 'a': 1 } )
+        self.calls      = 0
+        return
+
+    def tearDown( self ):
+        shutil.rmtree( self.folder )
+        return
+
+    def write( self, document ):
+        with open( self.filename, 'wt' ) as stream:
+            json.dump( document, stream )
+
+        return
+
+    def parser( self, data ):
+        self.calls += 1
+        return json.loads( data )
+
+    def test_warm_start( self ):
+        cache = ConfigCache()
+        self.assertEqual( cache.load( self.filename, self.parser, 'json' ), ( { 'a': 1 }, False ) )
+        self.assertTrue( os.path.isfile( os.path.join( self.folder, '.config.json.cache' ) ) )
+        self.assertEqual( cache.load( self.filename, self.parser, 'json' ), ( { 'a': 1 }, True ) )
+        self.assertEqual( self.calls, 1 )
+        return
+
+    def test_stale( self ):
+        cache = ConfigCache( os.path.join( self.folder, 'cache' ) )
+        cache.load( self.filename, self.parser, 'json' )
+        self.write( { 'a': 2 } )
+        self.assertEqual( cache.load( self.filename, self.parser, 'json' ), ( { 'a': 2 }, False ) )
+        self.assertEqual( cache.load( self.filename, self.parser, 'json' ), ( { 'a': 2 }, True ) )
+        self.assertEqual( self.calls, 2 )
+        self.assertEqual( [ name for name in os.listdir( os.path.join( self.folder, 'cache' ) )
+                            if name.endswith( '.tmp' ) ], [] )
+        return
+
+    def test_corrupt_entry( self ):
+        cache = ConfigCache()
+        with open( cache.cacheFilename( self.filename ), 'wb' ) as stream:
+            stream.write( b'garbage' )
+
+        self.assertEqual( cache.load( self.filename, self.parser, 'json' ), ( { 'a': 1 }, False ) )
+        return
+
+    def test_parser_in_key( self ):
+        cache = ConfigCache()
+        cache.load( self.filename, self.parser, 'yaml.UnsafeLoader' )
+        self.assertEqual( cache.load( self.filename, self.parser, 'yaml.SafeLoader' ), ( { 'a': 1 }, False ) )
+        self.assertEqual( cache.load( self.filename, self.parser, 'yaml.SafeLoader' ), ( { 'a': 1 }, True ) )
+        self.assertEqual( self.calls, 2 )
+        return
+
+    def test_plain_data_only( self ):
+        cache = ConfigCache()
+        self.assertEqual( cache.load( self.filename, lambda data: { 'a': object }, 'json' )[ 1 ], False )
+        self.assertFalse( os.path.exists( cache.cacheFilename( self.filename ) ) )
+        return
+
+    def test_untrusted_entry( self ):
+        cache = ConfigCache()
+        cache.load( self.filename, self.parser, 'json' )
+        os.chmod( cache.cacheFilename( self.filename ), 0o666 )
+        self.assertEqual( cache.load( self.filename, self.parser, 'json' ), ( { 'a': 1 }, False ) )
+        self.assertEqual( self.calls, 2 )
+        return
+
+    def test_yaml_file( self ):
+        cfg = YamlConfigFile( self.filename, cache = True )
+        self.assertNotEqual( cfg.getLoaderBackend(), 'cache' )
+        cfg = YamlConfigFile( self.filename, cache = True, loadLater = True )
+        cfg.LoadDocument()
+        self.assertEqual( cfg.getLoaderBackend(), 'cache' )
+        return
+
+    def test_create_cache( self ):
+        self.assertIsNone( createCache( None ) )
+        self.assertIsInstance( createCache( True ), ConfigCache )
+        with self.assertRaises( ValueError ):
+            createCache( 1 )
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
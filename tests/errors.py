@@ -0,0 +1,89 @@
+import json
+import unittest
+from saiti import ConfigProcessor, ConfigProcessorList, PathList
+from saiti.base import collectErrors
+from saiti.errors import UNKNOWN_KEY, WRONG_TYPE, INVALID_VALUE, SUBTREE_SKIPPED
+from fixtures import SectionConfig
+
+
+class FoldersConfig( ConfigProcessor ):
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'folders', **kwargs )
+        self.__paths    = PathList()
+        return
+
+    @property
+    def paths( self ) -> PathList:
+        return self.__paths
+
+
+class SectionsConfig( ConfigProcessorList ):
+    def __init__( self, **kwargs ):
+        ConfigProcessorList.__init__( self, 'sections', **kwargs )
+        return
+
+    def newObject( self, name: str, obj: dict ) -> object:
+        return SectionConfig( name )
+
+
+class TestCollectErrors( unittest.TestCase ):
+    def test_report( self ):
+        obj = SectionConfig( throw_exception = True )
+        with collectErrors() as report:
+            obj.ParseConfig( { 'debug': [ 1 ],
+                               'unknown': 1,
+                               'web': { 'port': 8080, 'scheme': 'ftp' } } )
+
+        self.assertEqual( [ ( error.path, error.key, error.type, error.reason ) for error in report ],
+                          [ ( ( 'section', ), 'debug', 'list', WRONG_TYPE ),
+                            ( ( 'section', ), 'unknown', 'int', UNKNOWN_KEY ),
+                            ( ( 'section', 'web' ), 'scheme', 'str', INVALID_VALUE ) ] )
+        self.assertEqual( obj.web.port, 8080 )
+        self.assertFalse( report.truncated )
+        self.assertEqual( json.loads( json.dumps( report.asDicts() ) )[ 2 ][ 'path' ], [ 'section', 'web' ] )
+        # outside the context the errors are raised again
+        with self.assertRaises( AttributeError ):
+            obj.ParseConfig( { 'unknown': 1 } )
+
+        return
+
+    def test_list_item( self ):
+        obj = FoldersConfig( throw_exception = True )
+        with collectErrors() as report:
+            obj.ParseConfig( { 'paths': [ '/', '/no/such/folder', '/' ] } )
+
+        self.assertEqual( [ ( error.path, error.key, error.type, error.reason ) for error in report ],
+                          [ ( ( 'folders', ), 'paths', 'str', INVALID_VALUE ) ] )
+        self.assertEqual( obj.paths, [ '/', '/' ] )
+        # outside the context the error is raised
+        with self.assertRaises( ValueError ):
+            FoldersConfig().ParseConfig( { 'paths': [ '/no/such/folder' ] } )
+
+        return
+
+    def test_limit( self ):
+        obj = SectionsConfig()
+        with collectErrors( limit = 3 ) as report:
+            obj.ParseConfig( { 'name{}'.format( index ): { 'unknown': index } for index in range( 10 ) } )
+
+        self.assertEqual( len( report ), 3 )
+        self.assertTrue( report.truncated )
+        self.assertEqual( len( obj._children() ), 3 )
+        return
+
+    def test_subtree_limit( self ):
+        obj = SectionsConfig()
+        broken = { 'bad{}'.format( index ): index for index in range( 10 ) }
+        with collectErrors( subtreeLimit = 2 ) as report:
+            obj.ParseConfig( { 'one': broken, 'two': dict( broken, debug = True ), 'three': { 'debug': True } } )
+
+        self.assertEqual( [ ( error.path, error.reason ) for error in report if error.key is None ],
+                          [ ( ( 'sections', 'one' ), SUBTREE_SKIPPED ), ( ( 'sections', 'two' ), SUBTREE_SKIPPED ) ] )
+        self.assertEqual( len( report ), 8 )
+        # the skipped sections count as one error for the list
+        self.assertTrue( obj._children()[ 2 ].debug )
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,359 @@
+import io
+import os
+import json
+import unittest
+import tempfile
+import yaml
+from saiti import ConfigProcessor, ConfigProcessorList, YamlConfigFile, YamlDocumentsFile, JsonConfigFile
+from saiti.file import selectYamlLoader, scanYamlDocuments, jsonChunks, JsonStreamReader, streamJson
+from fixtures import WebConfig, SectionConfig
+
+
+CONFIG = """
+common: &COMMON
+  debug: false
+  web: &WEB
+    interface: 0.0.0.0
+    port: 8000
+mbertens:
+  <<: *COMMON
+  debug: true
+  web:
+    <<: *WEB
+    interface: localhost
+"""
+
+
+class SectionsFile( YamlConfigFile ):
+    def __init__( self, filename: str, **kwargs ):
+        YamlConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.setWildcardObject( SectionConfig, throw_exception = True )
+        self.Load()
+        return
+
+
+class TestYamlConfigFile( unittest.TestCase ):
+    def setUp( self ):
+        fd, self.filename = tempfile.mkstemp( suffix = '.yaml' )
+        with os.fdopen( fd, 'wt' ) as stream:
+            stream.write( CONFIG )
+
+        return
+
+    def tearDown( self ):
+        os.remove( self.filename )
+        return
+
+    def test_select_loader( self ):
+        self.assertIs( selectYamlLoader( 'safe', libyaml = False ), yaml.SafeLoader )
+        self.assertIs( selectYamlLoader( 'unsafe', libyaml = False ), yaml.Loader )
+        if yaml.__with_libyaml__:
+            self.assertIs( selectYamlLoader( 'safe' ), yaml.CSafeLoader )
+            self.assertIs( selectYamlLoader( 'unsafe' ), yaml.CLoader )
+
+        with self.assertRaises( ValueError ):
+            selectYamlLoader( 'fast' )
+
+        return
+
+    def test_backends_merge_keys( self ):
+        results = []
+        for libyaml in ( True, False ):
+            cfg = SectionsFile( self.filename, libyaml = libyaml, throw_exception = True )
+            if not libyaml:
+                self.assertEqual( cfg.getLoaderBackend(), 'SafeLoader' )
+
+            results.append( [ ( name, section.debug, section.web.interface, section.web.port )
+                              for name, section in cfg.getWildcardValue().items() ] )
+
+        self.assertEqual( results[ 0 ], results[ 1 ] )
+        self.assertEqual( results[ 0 ], [ ( 'common', False, '0.0.0.0', 8000 ),
+                                           ( 'mbertens', True, 'localhost', 8000 ) ] )
+        return
+
+    def test_save( self ):
+        cfg = SectionsFile( self.filename )
+        cfg.getWildcardValue( 'mbertens' ).web.port = 9000
+        cfg.getWildcardValue( 'common' ).web.aliases.extend( [ 'www', 'web' ] )
+        cfg.Save()
+        self.assertEqual( os.listdir( os.path.dirname( self.filename ) ).count( os.path.basename( self.filename ) ), 1 )
+        saved = SectionsFile( self.filename )
+        self.assertEqual( saved.BuildConfig(), cfg.BuildConfig() )
+        self.assertEqual( saved.getWildcardValue( 'mbertens' ).web.port, 9000 )
+        self.assertEqual( saved.getWildcardValue( 'common' ).web.aliases, [ 'www', 'web' ] )
+        return
+
+    def test_save_failure_keeps_file( self ):
+        cfg = SectionsFile( self.filename )
+        cfg.getWildcardValue( 'common' ).web.aliases.append( object() )
+        with self.assertRaises( yaml.YAMLError ):
+            cfg.Save()
+
+        with open( self.filename, 'rt' ) as stream:
+            self.assertEqual( stream.read(), CONFIG )
+
+        self.assertFalse( [ name for name in os.listdir( os.path.dirname( self.filename ) )
+                            if name.startswith( '.saiti-' ) ] )
+        return
+
+
+class SectionsDocumentsFile( YamlDocumentsFile ):
+    def __init__( self, filename: str, **kwargs ):
+        self.loaded = []
+        YamlDocumentsFile.__init__( self, filename, **kwargs )
+        return
+
+    def LoadDocument( self, index: int ) -> object:
+        self.loaded.append( index )
+        return YamlDocumentsFile.LoadDocument( self, index )
+
+    def newObject( self, index: int, document: object ) -> object:
+        return SectionConfig( 'document{}'.format( index ) )
+
+
+class TestYamlDocumentsFile( unittest.TestCase ):
+    DOCUMENTS = """# services
+%YAML 1.1
+---
+debug: true
+web:
+  port: 8000
+--- # second
+web:
+  interface: localhost
+  aliases: [ www ]
+...
+---
+"""
+
+    def setUp( self ):
+        fd, self.filename = tempfile.mkstemp( suffix = '.yaml' )
+        with os.fdopen( fd, 'wt' ) as stream:
+            stream.write( self.DOCUMENTS )
+
+        return
+
+    def tearDown( self ):
+        os.remove( self.filename )
+        return
+
+    def test_scan_same_as_load_all( self ):
+        for text in ( '', '# only a comment\n', 'a: 1\n', 'a: 1\n---\nb: 2\n', '--- [ 1, 2 ]\n--- >\n  text\n',
+                      'a: |\n  ---x\n---\n- 1\n', 'a: 1\n...\n# end\n', 'a: 1\n---', self.DOCUMENTS ):
+            data = text.encode()
+            documents = [ yaml.safe_load( data[ start: end ] )
+                          for start, end in scanYamlDocuments( io.BytesIO( data ) ) ]
+            self.assertEqual( documents, list( yaml.safe_load_all( text ) ) )
+
+        return
+
+    def test_parsed_on_request( self ):
+        cfg = SectionsDocumentsFile( self.filename )
+        self.assertEqual( cfg.getDocumentCount(), 3 )
+        self.assertEqual( cfg.loaded, [] )
+        second = cfg.getDocument( 1 )
+        self.assertEqual( cfg.loaded, [ 1 ] )
+        self.assertEqual( ( second.debug, second.web.interface, second.web.aliases ),
+                          ( False, 'localhost', [ 'www' ] ) )
+        self.assertIs( cfg.getDocument( -2 ), second )
+        self.assertEqual( cfg.loaded, [ 1 ] )
+        documents = list( cfg.getDocuments() )
+        self.assertEqual( cfg.loaded, [ 1, 0, 2 ] )
+        self.assertEqual( [ ( doc.debug, doc.web.port ) for doc in documents ],
+                          [ ( True, 8000 ), ( False, 0 ), ( False, 0 ) ] )
+        with self.assertRaises( IndexError ):
+            cfg.getDocument( 3 )
+
+        return
+
+    def test_errors( self ):
+        with open( self.filename, 'wt' ) as stream:
+            stream.write( 'debug: true\n---\nweb:\n  unknown: 1\n' )
+
+        cfg = SectionsDocumentsFile( self.filename, throw_exception = True )
+        self.assertTrue( cfg.getDocument( 0 ).debug )
+        with self.assertRaises( AttributeError ) as ctx:
+            cfg.getDocument( 1 )
+
+        self.assertEqual( str( ctx.exception ),
+                          '{}->document1->web has no attr unknown'.format( os.path.basename( self.filename ) ) )
+        return
+
+
+class TestShareSubtrees( unittest.TestCase ):
+    def setUp( self ):
+        fd, self.filename = tempfile.mkstemp( suffix = '.yaml' )
+        with os.fdopen( fd, 'wt' ) as stream:
+            stream.write( CONFIG + "other: *COMMON\ncopy:\n  web:\n    interface: 0.0.0.0\n    port: 8000\n" )
+
+        return
+
+    def tearDown( self ):
+        os.remove( self.filename )
+        return
+
+    def test_shared( self ):
+        cfg = SectionsFile( self.filename, share = True )
+        common, other, copy = [ cfg.getWildcardValue( key ) for key in ( 'common', 'other', 'copy' ) ]
+        self.assertIs( common.web, other.web )
+        self.assertIs( common.web, copy.web )
+        self.assertIsNot( common.web, cfg.getWildcardValue( 'mbertens' ).web )
+        self.assertTrue( common.web.isShared() )
+        self.assertFalse( common.isShared() )
+        self.assertEqual( cfg.BuildConfig(), SectionsFile( self.filename ).BuildConfig() )
+        return
+
+    def test_copy_on_write( self ):
+        cfg = SectionsFile( self.filename, share = True )
+        common, other = cfg.getWildcardValue( 'common' ), cfg.getWildcardValue( 'other' )
+        with self.assertRaises( AttributeError ):
+            other.web.port = 9
+
+        self.assertEqual( ( other.web.port, common.web.port ), ( 8000, 8000 ) )
+        web = other.unshare( 'web' )
+        web.port = 1
+        self.assertIs( other.web, web )
+        self.assertFalse( web.isShared() )
+        self.assertEqual( ( other.web.port, common.web.port ), ( 1, 8000 ) )
+        cfg.ParseConfig( { 'common': { 'web': { 'port': 2 } } } )
+        self.assertEqual( ( common.web.port, cfg.getWildcardValue( 'copy' ).web.port ), ( 2, 8000 ) )
+        return
+
+    def test_diff_shared( self ):
+        before = SectionsFile( self.filename, share = True )
+        after = SectionsFile( self.filename, share = True )
+        self.assertEqual( ConfigProcessor.diff( before, after ), ( [], [], [] ) )
+        # a change of the shared object invalidates every section that holds it
+        web = after.getWildcardValue( 'common' ).web
+        web.aliases.append( 'www' )
+        web._changed()
+        self.assertEqual( sorted( ConfigProcessor.diff( before, after ).changed ),
+                          [ ( 'common', 'web', 'aliases' ), ( 'copy', 'web', 'aliases' ),
+                            ( 'other', 'web', 'aliases' ) ] )
+        return
+
+
+class SectionsJsonFile( JsonConfigFile ):
+    def __init__( self, filename: str, **kwargs ):
+        JsonConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.setWildcardObject( SectionConfig, throw_exception = True )
+        self.Load()
+        return
+
+
+class TestJsonConfigFile( unittest.TestCase ):
+    def setUp( self ):
+        fd, self.filename = tempfile.mkstemp( suffix = '.json' )
+        with os.fdopen( fd, 'wt' ) as stream:
+            stream.write( '{ "common": { "debug": true, "web": { "port": 80, "aliases": [ "a", "b" ] } },'
+                          '  "empty": {} }' )
+
+        return
+
+    def tearDown( self ):
+        os.remove( self.filename )
+        return
+
+    def test_chunks_match_json_dump( self ):
+        cfg = SectionsJsonFile( self.filename )
+        self.assertEqual( "".join( jsonChunks( cfg ) ), json.dumps( cfg.BuildConfig(), indent = 4 ) )
+        return
+
+    def test_save( self ):
+        cfg = SectionsJsonFile( self.filename )
+        cfg.getWildcardValue( 'common' ).web.interface = 'localhost'
+        cfg.Save()
+        saved = SectionsJsonFile( self.filename )
+        self.assertEqual( saved.BuildConfig(), cfg.BuildConfig() )
+        self.assertEqual( saved.getWildcardValue( 'common' ).web.interface, 'localhost' )
+        self.assertEqual( saved.getWildcardValue( 'common' ).web.aliases, [ 'a', 'b' ] )
+        return
+
+
+class RoutesConfig( ConfigProcessorList ):
+    def __init__( self, **kwargs ):
+        ConfigProcessorList.__init__( self, 'routes', **kwargs )
+        return
+
+    def newObject( self, name, obj ):
+        return WebConfig( name )
+
+
+class RoutedConfig( SectionConfig ):
+    def __init__( self, name = 'common', **kwargs ):
+        SectionConfig.__init__( self, name, **kwargs )
+        self.__routes = RoutesConfig( **kwargs )
+        return
+
+    @property
+    def routes( self ) -> RoutesConfig:
+        return self.__routes
+
+
+class RoutedJsonFile( JsonConfigFile ):
+    def __init__( self, filename: str, loadLater: bool = False, **kwargs ):
+        JsonConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.setWildcardObject( RoutedConfig, throw_exception = kwargs.get( 'throw_exception', False ) )
+        if not loadLater:
+            self.Load()
+
+        return
+
+
+class TestStreamingJson( unittest.TestCase ):
+    DOCUMENT = { 'common': { 'debug': True,
+                             'web': { 'interface': 'localhost', 'port': 12345, 'aliases': [ 'a', 'b' ] },
+                             'routes': { 'route{}'.format( idx ): { 'port': 1000 + idx, 'aliases': [ str( idx ) ] }
+                                         for idx in range( 50 ) } },
+                 'other': { 'web': { 'port': 1500 } },
+                 'empty': {} }
+
+    def setUp( self ):
+        fd, self.filename = tempfile.mkstemp( suffix = '.json' )
+        with os.fdopen( fd, 'wt' ) as stream:
+            json.dump( self.DOCUMENT, stream, indent = 2 )
+
+        return
+
+    def tearDown( self ):
+        os.remove( self.filename )
+        return
+
+    def test_same_as_load( self ):
+        expected = RoutedJsonFile( self.filename ).BuildConfig()
+        self.assertEqual( RoutedJsonFile( self.filename, streaming = True ).BuildConfig(), expected )
+        self.assertEqual( len( expected[ 'common' ][ 'routes' ] ), 50 )
+        return
+
+    def test_small_chunks( self ):
+        expected = RoutedJsonFile( self.filename ).BuildConfig()
+        for size in ( 1, 3, 7 ):
+            cfg = RoutedJsonFile( self.filename, loadLater = True )
+            with open( self.filename, 'rt' ) as stream:
+                streamJson( JsonStreamReader( stream, size ), cfg )
+
+            self.assertEqual( cfg.BuildConfig(), expected )
+
+        return
+
+    def test_errors( self ):
+        with open( self.filename, 'wt' ) as stream:
+            stream.write( '{ "common": { "web": { "unknown": 1 } } }' )
+
+        with self.assertRaises( AttributeError ) as ctx:
+            RoutedJsonFile( self.filename, streaming = True, throw_exception = True )
+
+        self.assertEqual( str( ctx.exception ),
+                          '{}->common->web has no attr unknown'.format( os.path.basename( self.filename ) ) )
+        for document in ( '{ "common": { "debug": true }', '{ "common" { } }', '{ } x' ):
+            with open( self.filename, 'wt' ) as stream:
+                stream.write( document )
+
+            with self.assertRaises( json.JSONDecodeError ):
+                RoutedJsonFile( self.filename, streaming = True )
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Configuration classes shared by the test modules
+"""
+from saiti import ConfigProcessor
+
+
+class WebConfig( ConfigProcessor ):
+    def __init__( self, name = 'web', **kwargs ):
+        ConfigProcessor.__init__( self, name, **kwargs )
+        self.__interface    = ''
+        self.__port         = 0
+        self.__scheme       = 'http'
+        self.__aliases      = []
+        return
+
+    @property
+    def interface( self ) -> str:
+        return self.__interface
+
+    @interface.setter
+    def interface( self, value: str ):
+        self.__interface = value
+        return
+
+    @property
+    def port( self ) -> int:
+        return self.__port
+
+    @port.setter
+    def port( self, value: int ):
+        self.__port = value
+        return
+
+    @property
+    def scheme( self ) -> str:
+        return self.__scheme
+
+    @scheme.setter
+    def scheme( self, value: str ):
+        if value not in ( 'http', 'https' ):
+            raise ValueError( "scheme must be 'http' or 'https'" )
+
+        self.__scheme = value
+        return
+
+    @property
+    def aliases( self ) -> list:
+        return self.__aliases
+
+
+class SectionConfig( ConfigProcessor ):
+    def __init__( self, name = 'section', **kwargs ):
+        ConfigProcessor.__init__( self, name, { 'class': 'cls' }, **kwargs )
+        self.__cls          = None
+        self.__debug        = False
+        self.__web          = WebConfig( **kwargs )
+        return
+
+    @property
+    def cls( self ) -> str:
+        return self.__cls
+
+    @cls.setter
+    def cls( self, value: str ):
+        self.__cls = value
+        return
+
+    @property
+    def debug( self ) -> bool:
+        return self.__debug
+
+    @debug.setter
+    def debug( self, value: bool ):
+        self.__debug = value
+        return
+
+    @property
+    def web( self ) -> WebConfig:
+        return self.__web
+
+    @web.setter
+    def web( self, value: WebConfig ):
+        self.__web = value
+        return
@@ -0,0 +1,151 @@
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from saiti import ConfigProcessor, ConfigProcessorList, DatabaseConfig, PathList
+from saiti.frozen import FrozenConfig
+
+
+class NamedDatabaseConfig( DatabaseConfig ):
+    def __init__( self, name, **kwargs ):
+        DatabaseConfig.__init__( self, **kwargs )
+        return
+
+
+class ServiceConfig( ConfigProcessor ):
+    def __init__( self, name = 'service', **kwargs ):
+        ConfigProcessor.__init__( self, name, **kwargs )
+        self.__debug    = False
+        self.__paths    = PathList( must_exists = False )
+        self.__database = DatabaseConfig( **kwargs )
+        self.setWildcardObject( NamedDatabaseConfig, **kwargs )
+        return
+
+    @property
+    def debug( self ) -> bool:
+        return self.__debug
+
+    @debug.setter
+    def debug( self, value: bool ):
+        self.__debug = value
+        return
+
+    @property
+    def paths( self ) -> PathList:
+        return self.__paths
+
+    @property
+    def database( self ) -> DatabaseConfig:
+        return self.__database
+
+
+class RulesConfig( ConfigProcessor ):
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'rules', **kwargs )
+        self.__items    = []
+        return
+
+    @property
+    def items( self ) -> list:
+        return self.__items
+
+    @items.setter
+    def items( self, value: list ):
+        self.__items = value
+        return
+
+
+class ServicesConfig( ConfigProcessorList ):
+    def __init__( self, **kwargs ):
+        ConfigProcessorList.__init__( self, 'services', **kwargs )
+        return
+
+    def newObject( self, name, obj ):
+        return ServiceConfig( name )
+
+
+CONFIG = { 'debug': True,
+           'paths': [ '/a', '/b' ],
+           'database': { 'engine': 'sqlite', 'database': 'test.db' },
+           'reports': { 'engine': 'postgresql', 'port': 5432 },
+           'not-an-attribute': { 'engine': 'mysql' } }
+
+
+class TestFreeze( unittest.TestCase ):
+    def build( self ):
+        obj = ServiceConfig( throw_exception = True )
+        obj.ParseConfig( CONFIG )
+        return obj
+
+    def test_values( self ):
+        frozen = self.build().freeze()
+        self.assertIsInstance( frozen, FrozenConfig )
+        self.assertTrue( frozen.debug )
+        self.assertEqual( frozen.paths, ( '/a', '/b' ) )
+        self.assertEqual( frozen.database.engine, 'sqlite' )
+        self.assertEqual( frozen.reports.port, 5432 )
+        self.assertEqual( frozen[ 'not-an-attribute' ].engine, 'mysql' )
+        self.assertIn( 'reports', frozen )
+        self.assertEqual( list( frozen ), [ 'database', 'debug', 'paths', 'reports', 'not-an-attribute' ] )
+        self.assertFalse( hasattr( frozen, '__dict__' ) )
+        return
+
+    def test_read_only( self ):
+        frozen = self.build().freeze()
+        with self.assertRaises( AttributeError ):
+            frozen.debug = False
+
+        with self.assertRaises( AttributeError ):
+            frozen.database.engine = 'mysql'
+
+        with self.assertRaises( AttributeError ):
+            del frozen.debug
+
+        return
+
+    def test_snapshot( self ):
+        obj = self.build()
+        frozen = obj.freeze()
+        obj.debug = False
+        self.assertTrue( frozen.debug )
+        self.assertNotEqual( obj.freeze(), frozen )
+        return
+
+    def test_hash_and_pickle( self ):
+        first, second = self.build().freeze(), self.build().freeze()
+        self.assertEqual( first, second )
+        self.assertEqual( hash( first ), hash( second ) )
+        self.assertEqual( len( { first, second } ), 1 )
+        self.assertEqual( pickle.loads( pickle.dumps( first ) ), first )
+        return
+
+    def test_list_of_mappings( self ):
+        obj = RulesConfig( throw_exception = True )
+        obj.ParseConfig( { 'items': [ { 'a': 1 }, { 'b': [ 1, 2 ] } ] } )
+        first, second = obj.freeze(), obj.freeze()
+        self.assertEqual( first.items[ 1 ][ 'b' ], ( 1, 2 ) )
+        self.assertEqual( hash( first ), hash( second ) )
+        self.assertEqual( pickle.loads( pickle.dumps( first ) ), first )
+        with self.assertRaises( TypeError ):
+            first.items[ 0 ][ 'a' ] = 2
+
+        return
+
+    def test_list( self ):
+        services = ServicesConfig()
+        services.ParseConfig( { 'one': { 'debug': True }, 'two.b': { 'debug': False } } )
+        frozen = services.freeze()
+        self.assertTrue( frozen.one.debug )
+        self.assertFalse( frozen[ 'two.b' ].debug )
+        return
+
+    def test_threads( self ):
+        frozen = self.build().freeze()
+        with ThreadPoolExecutor( max_workers = 8 ) as executor:
+            results = set( executor.map( lambda idx: ( hash( frozen ), frozen.database.engine ), range( 100 ) ) )
+
+        self.assertEqual( results, { ( hash( frozen ), 'sqlite' ) } )
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import shutil
+import unittest
+import datetime
+import tempfile
+import traceback
+from saiti import ConfigProcessor
+from saiti.importspec import parseImportSpec, resolveCallable, clearCallableCache, _CALLABLES
+
+
+class LifetimeConfig( ConfigProcessor ):
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'lifetime', **kwargs )
+        self.__lifetime     = datetime.timedelta( days = 31 )
+        return
+
+    @property
+    def lifetime( self ) -> datetime.timedelta:
+        return self.__lifetime
+
+    @lifetime.setter
+    def lifetime( self, value: datetime.timedelta ):
+        self.__lifetime = value
+        return
+
+
+class TestImportSpec( unittest.TestCase ):
+    def test_parse( self ):
+        self.assertEqual( parseImportSpec( 'datetime.timedelta' ), ( 'datetime.timedelta', (), {} ) )
+        self.assertEqual( parseImportSpec( 'datetime:timedelta( 1, seconds = 5 )' ),
+                          ( 'datetime.timedelta', ( 1, ), { 'seconds': 5 } ) )
+        return
+
+    def test_literals_only( self ):
+        for spec in ( 'os.system( "ls" + "" )', 'os.system( open( "x" ) )', 'os.getcwd()()',
+                      'timedelta', 'mod.Class( *args )' ):
+            with self.assertRaises( ValueError ):
+                parseImportSpec( spec )
+
+        return
+
+    def test_mutable_arguments( self ):
+        path, args, kwargs = parseImportSpec( 'collections.OrderedDict( [ ( "a", 1 ) ] )' )
+        args[ 0 ].append( ( 'b', 2 ) )
+        self.assertEqual( parseImportSpec( 'collections.OrderedDict( [ ( "a", 1 ) ] )' )[ 1 ], ( [ ( 'a', 1 ) ], ) )
+        return
+
+    def test_resolve_cached( self ):
+        self.assertIs( resolveCallable( 'datetime.timedelta' ), datetime.timedelta )
+        for count in range( 2 ):
+            with self.assertRaises( ImportError ):
+                resolveCallable( 'saiti.no_such_module.Class' )
+
+        self.assertFalse( isinstance( _CALLABLES[ 'saiti.no_such_module.Class' ], BaseException ) )
+        return
+
+    def test_clear_cache( self ):
+        folder = tempfile.mkdtemp()
+        sys.path.insert( 0, folder )
+        try:
+            with self.assertRaises( ImportError ):
+                resolveCallable( 'saiti_later_module.Handler' )
+
+            with open( os.path.join( folder, 'saiti_later_module.py' ), 'wt' ) as stream:
+                stream.write( "class Handler( object ):\n    pass\n" )
+
+            # the failure stays cached until the cache is cleared
+            with self.assertRaises( ImportError ):
+                resolveCallable( 'saiti_later_module.Handler' )
+
+            clearCallableCache()
+            self.assertEqual( resolveCallable( 'saiti_later_module.Handler' ).__name__, 'Handler' )
+
+        finally:
+            sys.path.remove( folder )
+            sys.modules.pop( 'saiti_later_module', None )
+            shutil.rmtree( folder )
+
+        return
+
+    def test_fresh_exceptions( self ):
+        depths = []
+        errors = []
+        for count in range( 3 ):
+            for call, arg in ( ( resolveCallable, 'saiti.no_such_module.Class' ),
+                               ( parseImportSpec, 'mod.Class( *args )' ) ):
+                try:
+                    call( arg )
+
+                except ( ImportError, ValueError ) as exc:
+                    depths.append( len( traceback.extract_tb( exc.__traceback__ ) ) )
+                    errors.append( exc )
+
+        # the cached errors do not collect the frames of every raise
+        self.assertEqual( depths, depths[ :2 ] * 3 )
+        self.assertIsNot( errors[ 0 ], errors[ 2 ] )
+        self.assertIsInstance( errors[ 2 ], ModuleNotFoundError )
+        self.assertEqual( str( errors[ 1 ] ), str( errors[ 3 ] ) )
+        return
+
+    def test_parse_config( self ):
+        obj = LifetimeConfig( throw_exception = True )
+        obj.ParseConfig( { 'lifetime': 'datetime.timedelta( days = 2 )' } )
+        self.assertEqual( obj.lifetime, datetime.timedelta( days = 2 ) )
+        with self.assertRaises( AttributeError ):
+            obj.ParseConfig( { 'lifetime': 'datetime.timedelta( days = __import__( "os" ) )' } )
+
+        with self.assertRaises( AttributeError ):
+            obj.ParseConfig( { 'lifetime': 'datetime.no_such_class' } )
+
+        return
+
+    def test_build_config( self ):
+        obj = LifetimeConfig( throw_exception = True )
+        self.assertEqual( obj.BuildConfig(), {} )
+        obj.ParseConfig( { 'lifetime': 'datetime.timedelta( days = 2 )' } )
+        config = obj.BuildConfig()
+        self.assertEqual( config, { 'lifetime': 'datetime.timedelta( days = 2 )' } )
+        other = LifetimeConfig( throw_exception = True )
+        other.ParseConfig( config )
+        self.assertEqual( other.lifetime, datetime.timedelta( days = 2 ) )
+        # a value set without a specification is not saved
+        obj.lifetime = datetime.timedelta( days = 3 )
+        self.assertEqual( obj.BuildConfig(), {} )
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,582 @@
+import os
+import time
+import queue
+import pickle
+import shutil
+import socket
+import logging
+import unittest
+import tempfile
+import threading
+from saiti import LoggingConfig
+from saiti.loghandlers import QueueProxyHandler, BlockingQueueHandler, getQueueListener, \
+    BatchingSocketHandler, BatchingDatagramHandler, readFrames, BufferedFileHandler, BufferedRotatingFileHandler
+
+
+# The queue of the ext:// reference in TestQueueListener.test_simple_queue
+SIMPLE_QUEUE = queue.SimpleQueue()
+
+
+def loggingConfig( folder: str, **options ) -> dict:
+    config = {
+        'version': 1,
+        'formatters': { 'plain': { 'format': '%(name)s %(levelname)s %(message)s' } },
+        'handlers': { 'file': { 'class': 'logging.FileHandler', 'formatter': 'plain',
+                                'filename': os.path.join( folder, 'app.log' ) },
+                      'errors': { 'class': 'logging.FileHandler', 'formatter': 'plain', 'level': 'ERROR',
+                                  'filename': os.path.join( folder, 'errors.log' ) } },
+        'loggers': { 'saiti.test': { 'level': 'DEBUG', 'handlers': [ 'file', 'errors' ], 'propagate': False } },
+        'root': { 'level': 'WARNING', 'handlers': [ 'errors' ] },
+    }
+    config.update( options )
+    return config
+
+
+class ShortTracebackFormatter( logging.Formatter ):
+    def __init__( self, fmt: str ):
+        logging.Formatter.__init__( self, fmt )
+        self.threads = []
+        return
+
+    def format( self, record: logging.LogRecord ) -> str:
+        self.threads.append( threading.current_thread() )
+        return logging.Formatter.format( self, record )
+
+    def formatException( self, exc_info: tuple ) -> str:
+        return "{}: {}".format( exc_info[ 0 ].__name__, exc_info[ 1 ] )
+
+
+class TestAsyncLogging( unittest.TestCase ):
+    def setUp( self ):
+        self.folder = tempfile.mkdtemp()
+        self.config = LoggingConfig( throw_exception = True )
+        return
+
+    def tearDown( self ):
+        self.config.shutdown()
+        logging.config.dictConfig( { 'version': 1 } )
+        shutil.rmtree( self.folder )
+        return
+
+    def read( self, filename: str ) -> list:
+        with open( os.path.join( self.folder, filename ), 'rt' ) as stream:
+            return stream.read().splitlines()
+
+    def test_records_handled_by_listener( self ):
+        self.config.ParseConfig( loggingConfig( self.folder, **{ 'async': True } ) )
+        self.assertTrue( self.config.asynchronous )
+        self.assertTrue( self.config.props()[ 'async' ] )
+        self.config.setConfig()
+        logger = logging.getLogger( 'saiti.test' )
+        self.assertTrue( all( isinstance( handler, QueueProxyHandler ) for handler in logger.handlers ) )
+        # the root logger and saiti.test share the proxy of 'errors'
+        self.assertIs( logging.getLogger().handlers[ 0 ], logger.handlers[ 1 ] )
+        threads = []
+        target = logger.handlers[ 0 ].target
+        emit = target.emit
+        target.emit = lambda record: threads.append( threading.current_thread() ) or emit( record )
+        logger.debug( 'first %s', 1 )
+        logger.error( 'second' )
+        logging.getLogger( 'other' ).error( 'third' )
+        self.config.shutdown()
+        self.assertIsNone( getQueueListener() )
+        self.assertEqual( self.read( 'app.log' ), [ 'saiti.test DEBUG first 1', 'saiti.test ERROR second' ] )
+        self.assertEqual( self.read( 'errors.log' ), [ 'saiti.test ERROR second', 'other ERROR third' ] )
+        self.assertEqual( len( threads ), 2 )
+        self.assertNotIn( threading.current_thread(), threads )
+        # after the shutdown the handlers are called directly
+        self.assertIs( logger.handlers[ 0 ], target )
+        return
+
+    def test_target_formatter( self ):
+        lines = {}
+        for asynchronous in ( False, True ):
+            self.config = LoggingConfig( throw_exception = True )
+            self.config.ParseConfig( loggingConfig( self.folder, **{ 'async': asynchronous } ) )
+            self.config.setConfig()
+            logger = logging.getLogger( 'saiti.test' )
+            target = getattr( logger.handlers[ 0 ], 'target', logger.handlers[ 0 ] )
+            formatter = ShortTracebackFormatter( '%(name)s %(levelname)s %(message)s' )
+            target.setFormatter( formatter )
+            try:
+                raise ValueError( 'broken' )
+
+            except ValueError:
+                logger.exception( 'failed %s', 'here' )
+
+            self.config.shutdown()
+            lines[ asynchronous ] = self.read( 'app.log' )
+            os.remove( os.path.join( self.folder, 'app.log' ) )
+
+        self.assertEqual( lines[ True ], [ 'saiti.test ERROR failed here', 'ValueError: broken' ] )
+        self.assertEqual( lines[ True ], lines[ False ] )
+        # formatted on the listener thread
+        self.assertNotIn( threading.current_thread(), formatter.threads )
+        return
+
+    def test_one_listener( self ):
+        self.config.ParseConfig( loggingConfig( self.folder, **{ 'async': True } ) )
+        self.config.setConfig()
+        first = getQueueListener()
+        self.config.setConfig()
+        self.assertIsNot( getQueueListener(), first )
+        self.assertIsNone( first._thread )
+        self.assertEqual( len( [ thread for thread in threading.enumerate()
+                                 if thread is getQueueListener()._thread ] ), 1 )
+        return
+
+    def test_synchronous( self ):
+        self.config.ParseConfig( loggingConfig( self.folder ) )
+        self.config.setConfig()
+        self.assertIsNone( getQueueListener() )
+        logging.getLogger( 'saiti.test' ).info( 'direct' )
+        self.assertEqual( self.read( 'app.log' ), [ 'saiti.test INFO direct' ] )
+        return
+
+
+class TestQueueListener( unittest.TestCase ):
+    def setUp( self ):
+        self.folder = tempfile.mkdtemp()
+        self.config = LoggingConfig( throw_exception = True )
+        return
+
+    def tearDown( self ):
+        self.config.shutdown()
+        logging.config.dictConfig( { 'version': 1 } )
+        shutil.rmtree( self.folder )
+        return
+
+    def read( self, filename: str ) -> list:
+        with open( os.path.join( self.folder, filename ), 'rt' ) as stream:
+            return stream.read().splitlines()
+
+    def listenerConfig( self, **options ) -> dict:
+        config = loggingConfig( self.folder )
+        config[ 'handlers' ][ 'queued' ] = dict( { 'class': 'logging.handlers.QueueListener',
+                                                   'handlers': [ 'file', 'errors' ] }, **options )
+        config[ 'loggers' ][ 'saiti.test' ][ 'handlers' ] = [ 'queued' ]
+        return config
+
+    def test_bounded_queue( self ):
+        self.config.ParseConfig( self.listenerConfig( queueSize = 2, respect_handler_level = True ) )
+        item = dict( self.config.handlers.configItems() )[ 'queued' ]
+        self.assertEqual( item.queueSize, 2 )
+        self.config.setConfig()
+        logger = logging.getLogger( 'saiti.test' )
+        self.assertIsInstance( logger.handlers[ 0 ], BlockingQueueHandler )
+        self.assertEqual( logger.handlers[ 0 ].queue.maxsize, 2 )
+        for index in range( 20 ):
+            logger.info( 'record %d', index )
+
+        logger.error( 'failed' )
+        self.config.flush()
+        lines = self.read( 'app.log' )
+        self.assertEqual( len( lines ), 21 )
+        self.assertEqual( lines[ 0 ], 'saiti.test INFO record 0' )
+        self.assertEqual( self.read( 'errors.log' ), [ 'saiti.test ERROR failed' ] )
+        self.assertTrue( item.isStarted() )
+        self.config.shutdown()
+        self.assertFalse( item.isStarted() )
+        # stopping again does nothing
+        item.stop()
+        return
+
+    def test_simple_queue( self ):
+        self.config.ParseConfig( self.listenerConfig( queue = 'ext://{}.SIMPLE_QUEUE'.format( __name__ ) ) )
+        self.config.setConfig()
+        logger = logging.getLogger( 'saiti.test' )
+        self.assertIs( logger.handlers[ 0 ].queue, SIMPLE_QUEUE )
+        for index in range( 20 ):
+            logger.info( 'record %d', index )
+
+        self.config.flush()
+        self.config.shutdown()
+        self.assertEqual( len( self.read( 'app.log' ) ), 20 )
+        return
+
+    def test_stop_with_reconfigure( self ):
+        self.config.ParseConfig( self.listenerConfig() )
+        self.config.setConfig()
+        item = dict( self.config.handlers.configItems() )[ 'queued' ]
+        first = item.getListener()
+        logging.getLogger( 'saiti.test' ).warning( 'before' )
+        self.config.setConfig()
+        self.assertIsNot( item.getListener(), first )
+        self.assertTrue( item.isStarted() )
+        self.assertEqual( self.read( 'app.log' ), [ 'saiti.test WARNING before' ] )
+        return
+
+    def test_invalid_queue( self ):
+        with self.assertRaises( ValueError ):
+            self.config.ParseConfig( self.listenerConfig( queueSize = -1 ) )
+
+        return
+
+
+class TestReconfigure( unittest.TestCase ):
+    def setUp( self ):
+        self.folder = tempfile.mkdtemp()
+        self.config = LoggingConfig( throw_exception = True )
+        self.config.ParseConfig( loggingConfig( self.folder ) )
+        self.config.setConfig()
+        return
+
+    def tearDown( self ):
+        self.config.shutdown()
+        logging.config.dictConfig( { 'version': 1 } )
+        shutil.rmtree( self.folder )
+        return
+
+    def read( self, filename: str ) -> list:
+        with open( os.path.join( self.folder, filename ), 'rt' ) as stream:
+            return stream.read().splitlines()
+
+    def reload( self, **options ) -> bool:
+        config = LoggingConfig( throw_exception = True )
+        config.ParseConfig( loggingConfig( self.folder, **options ) )
+        return config.reconfigure()
+
+    def test_levels_in_place( self ):
+        logger = logging.getLogger( 'saiti.test' )
+        handlers = list( logger.handlers )
+        stream = handlers[ 0 ].stream
+        self.assertTrue( self.reload( loggers = { 'saiti.test': { 'level': 'ERROR', 'handlers': [ 'file', 'errors' ] } } ) )
+        self.assertEqual( logger.level, logging.ERROR )
+        self.assertFalse( logger.propagate )
+        self.assertEqual( logger.handlers, handlers )
+        self.assertIs( logger.handlers[ 0 ].stream, stream )
+        self.assertFalse( stream.closed )
+        logger.warning( 'dropped' )
+        logger.error( 'kept' )
+        self.assertEqual( self.read( 'app.log' ), [ 'saiti.test ERROR kept' ] )
+        return
+
+    def test_changed_handler( self ):
+        logger = logging.getLogger( 'saiti.test' )
+        file, errors = logger.handlers
+        config = loggingConfig( self.folder )
+        config[ 'handlers' ][ 'errors' ][ 'filename' ] = os.path.join( self.folder, 'failures.log' )
+        config[ 'formatters' ][ 'plain' ][ 'format' ] = '%(levelname)s %(message)s'
+        self.config = LoggingConfig( throw_exception = True )
+        self.config.ParseConfig( config )
+        self.assertTrue( self.config.reconfigure() )
+        self.assertIs( logger.handlers[ 0 ], file )
+        self.assertIsNot( logger.handlers[ 1 ], errors )
+        self.assertIs( logging.getLogger().handlers[ 0 ], logger.handlers[ 1 ] )
+        self.assertIs( logging._handlers[ 'errors' ], logger.handlers[ 1 ] )
+        self.assertIsNone( errors.stream )
+        # the unchanged handler got the changed formatter
+        logger.error( 'failed' )
+        self.assertEqual( self.read( 'app.log' ), [ 'ERROR failed' ] )
+        self.assertEqual( self.read( 'failures.log' ), [ 'ERROR failed' ] )
+        return
+
+    def test_removed_logger( self ):
+        self.assertTrue( self.reload( loggers = {} ) )
+        logger = logging.getLogger( 'saiti.test' )
+        self.assertEqual( ( logger.level, logger.handlers, logger.propagate ), ( logging.NOTSET, [], True ) )
+        return
+
+    def test_full_configuration( self ):
+        self.assertFalse( self.reload( **{ 'async': True } ) )
+        self.assertIsNotNone( getQueueListener() )
+        self.assertTrue( self.reload( **{ 'async': True, 'root': { 'level': 'ERROR', 'handlers': [ 'errors' ] } } ) )
+        self.assertIsNotNone( getQueueListener() )
+        self.assertIsInstance( logging.getLogger().handlers[ 0 ], QueueProxyHandler )
+        self.assertEqual( logging.getLogger().level, logging.ERROR )
+        return
+
+
+class RecordReceiver( object ):
+    """Stands in for a log server, collects the records send over TCP or UDP
+    """
+    def __init__( self, kind: int = socket.SOCK_STREAM, port: int = 0 ):
+        self.records    = []
+        self.receives   = 0
+        self.__socket   = socket.socket( socket.AF_INET, kind )
+        self.__socket.setsockopt( socket.SOL_SOCKET, socket.SO_REUSEADDR, 1 )
+        self.__socket.bind( ( '127.0.0.1', port ) )
+        self.port       = self.__socket.getsockname()[ 1 ]
+        if kind == socket.SOCK_STREAM:
+            self.__socket.listen( 1 )
+            target = self.__stream
+
+        else:
+            target = self.__datagrams
+
+        self.__socket.settimeout( 0.1 )
+        self.__running  = True
+        self.__thread   = threading.Thread( target = target, daemon = True )
+        self.__thread.start()
+        return
+
+    def __stream( self ):
+        while self.__running:
+            try:
+                connection, address = self.__socket.accept()
+
+            except socket.timeout:
+                continue
+
+            connection.settimeout( 0.1 )
+            data = b''
+            while self.__running:
+                try:
+                    chunk = connection.recv( 65536 )
+
+                except socket.timeout:
+                    continue
+
+                if not chunk:
+                    break
+
+                records, data = readFrames( data + chunk )
+                self.records.extend( records )
+
+            connection.close()
+
+        return
+
+    def __datagrams( self ):
+        while self.__running:
+            try:
+                data = self.__socket.recv( 65536 )
+
+            except socket.timeout:
+                continue
+
+            # as the receivers of DatagramHandler: one record per datagram,
+            # the length prefix is skipped
+            self.receives += 1
+            self.records.append( logging.makeLogRecord( pickle.loads( data[ 4: ] ) ) )
+
+        return
+
+    def wait( self, count: int ) -> list:
+        deadline = time.monotonic() + 5
+        while len( self.records ) < count and time.monotonic() < deadline:
+            time.sleep( 0.01 )
+
+        return [ record.getMessage() for record in self.records ]
+
+    def close( self ):
+        self.__running = False
+        self.__thread.join()
+        self.__socket.close()
+        return
+
+
+def countBatches( handler: BatchingSocketHandler ) -> list:
+    batches = []
+    sendFrames = handler.sendFrames
+
+    def counted( frames ):
+        batches.append( len( frames ) )
+        return sendFrames( frames )
+
+    handler.sendFrames = counted
+    return batches
+
+
+class TestBatchingHandlers( unittest.TestCase ):
+    def setUp( self ):
+        self.logger = logging.getLogger( 'saiti.batching' )
+        # dictConfig() of the other tests disables the existing loggers
+        self.logger.disabled = False
+        self.logger.propagate = False
+        self.logger.setLevel( logging.INFO )
+        return
+
+    def tearDown( self ):
+        for handler in list( self.logger.handlers ):
+            self.logger.removeHandler( handler )
+            handler.close()
+
+        return
+
+    def test_socket_batches( self ):
+        receiver = RecordReceiver()
+        handler = BatchingSocketHandler( '127.0.0.1', receiver.port, batchSize = 10, flushInterval = 60 )
+        batches = countBatches( handler )
+        self.logger.addHandler( handler )
+        for index in range( 25 ):
+            self.logger.info( 'record %d', index )
+
+        handler.flush()
+        self.assertEqual( receiver.wait( 25 ), [ 'record {}'.format( index ) for index in range( 25 ) ] )
+        self.assertEqual( sum( batches ), 25 )
+        self.assertLessEqual( max( batches ), 10 )
+        self.assertLess( len( batches ), 25 )
+        receiver.close()
+        return
+
+    def test_flush_interval( self ):
+        receiver = RecordReceiver()
+        handler = BatchingSocketHandler( '127.0.0.1', receiver.port, batchSize = 100, flushInterval = 0.05 )
+        self.logger.addHandler( handler )
+        self.logger.info( 'alone' )
+        self.assertEqual( receiver.wait( 1 ), [ 'alone' ] )
+        receiver.close()
+        return
+
+    def test_reconnect( self ):
+        receiver = RecordReceiver()
+        port = receiver.port
+        receiver.close()
+        handler = BatchingSocketHandler( '127.0.0.1', port, batchSize = 5, flushInterval = 60,
+                                         maxBufferBytes = 4096 )
+        self.logger.addHandler( handler )
+        started = time.monotonic()
+        for index in range( 100 ):
+            self.logger.info( 'record %d', index )
+
+        # the logging calls do not wait for the receiver
+        self.assertLess( time.monotonic() - started, 1 )
+        handler.flush()
+        self.assertIsNotNone( handler.retryTime )
+        self.assertGreater( handler.dropped, 0 )
+        receiver = RecordReceiver( port = port )
+        handler.retryTime = None
+        handler.flush()
+        messages = receiver.wait( 100 - handler.dropped )
+        self.assertEqual( len( messages ), 100 - handler.dropped )
+        self.assertEqual( messages[ -1 ], 'record 99' )
+        receiver.close()
+        return
+
+    def test_datagram_per_record( self ):
+        receiver = RecordReceiver( socket.SOCK_DGRAM )
+        handler = BatchingDatagramHandler( '127.0.0.1', receiver.port, batchSize = 5, flushInterval = 60 )
+        self.logger.addHandler( handler )
+        for index in range( 12 ):
+            self.logger.info( 'record %d', index )
+
+        handler.close()
+        self.assertEqual( receiver.wait( 12 ), [ 'record {}'.format( index ) for index in range( 12 ) ] )
+        self.assertEqual( receiver.receives, 12 )
+        receiver.close()
+        return
+
+    def test_config( self ):
+        config = LoggingConfig( throw_exception = True )
+        handler = { 'class': 'logging.handlers.DatagramHandler', 'host': '127.0.0.1', 'port': 9021 }
+        config.ParseConfig( { 'version': 1, 'handlers': { 'udp': handler },
+                              'root': { 'handlers': [ 'udp' ] } } )
+        config.setConfig()
+        self.assertIs( type( logging.getLogger().handlers[ 0 ] ), logging.handlers.DatagramHandler )
+        config.ParseConfig( { 'version': 1, 'handlers': { 'udp': dict( handler, batchSize = 50, flushInterval = 0.5 ) },
+                              'root': { 'handlers': [ 'udp' ] } } )
+        config.setConfig()
+        batching = logging.getLogger().handlers[ 0 ]
+        self.assertIsInstance( batching, BatchingDatagramHandler )
+        self.assertEqual( ( batching.batchSize, batching.flushInterval ), ( 50, 0.5 ) )
+        logging.config.dictConfig( { 'version': 1 } )
+        with self.assertRaises( ValueError ):
+            config.ParseConfig( { 'handlers': { 'udp': dict( handler, batchSize = -1 ) } } )
+
+        return
+
+
+class TestBufferedFileHandlers( unittest.TestCase ):
+    def setUp( self ):
+        self.folder = tempfile.mkdtemp()
+        self.logger = logging.getLogger( 'saiti.buffered' )
+        self.logger.disabled = False
+        self.logger.propagate = False
+        self.logger.setLevel( logging.INFO )
+        return
+
+    def tearDown( self ):
+        for handler in list( self.logger.handlers ):
+            self.logger.removeHandler( handler )
+            handler.close()
+
+        shutil.rmtree( self.folder )
+        return
+
+    def read( self, filename: str ) -> list:
+        with open( os.path.join( self.folder, filename ), 'rt' ) as stream:
+            return stream.read().splitlines()
+
+    def addHandler( self, handler: logging.Handler ) -> logging.Handler:
+        handler.setFormatter( logging.Formatter( '%(levelname)s %(message)s' ) )
+        self.logger.addHandler( handler )
+        return handler
+
+    def test_flush_level( self ):
+        handler = self.addHandler( BufferedFileHandler( os.path.join( self.folder, 'app.log' ),
+                                                        bufferSize = 4096, flushInterval = 60 ) )
+        self.logger.info( 'first' )
+        self.logger.warning( 'second' )
+        self.assertEqual( self.read( 'app.log' ), [] )
+        self.logger.error( 'third' )
+        self.assertEqual( self.read( 'app.log' ), [ 'INFO first', 'WARNING second', 'ERROR third' ] )
+        self.logger.info( 'fourth' )
+        handler.close()
+        self.assertEqual( self.read( 'app.log' )[ -1 ], 'INFO fourth' )
+        return
+
+    def test_buffer_full( self ):
+        self.addHandler( BufferedFileHandler( os.path.join( self.folder, 'app.log' ),
+                                              bufferSize = 100, flushInterval = 60 ) )
+        for index in range( 10 ):
+            self.logger.info( 'record %d', index )
+
+        # flushed after 100 characters, 14 per record
+        self.assertEqual( len( self.read( 'app.log' ) ), 8 )
+        return
+
+    def test_flush_interval( self ):
+        self.addHandler( BufferedFileHandler( os.path.join( self.folder, 'app.log' ),
+                                              bufferSize = 4096, flushInterval = 0.05 ) )
+        self.logger.info( 'waiting' )
+        deadline = time.monotonic() + 5
+        while not self.read( 'app.log' ) and time.monotonic() < deadline:
+            time.sleep( 0.01 )
+
+        self.assertEqual( self.read( 'app.log' ), [ 'INFO waiting' ] )
+        return
+
+    def test_rollover( self ):
+        handler = self.addHandler( BufferedRotatingFileHandler( os.path.join( self.folder, 'app.log' ),
+                                                                maxBytes = 100, backupCount = 5,
+                                                                bufferSize = 4096, flushInterval = 60 ) )
+        for index in range( 20 ):
+            self.logger.info( 'record %02d', index )
+
+        handler.close()
+        names = sorted( os.listdir( self.folder ), reverse = True )
+        self.assertEqual( names, [ 'app.log.3', 'app.log.2', 'app.log.1', 'app.log' ] )
+        lines = [ line for name in names for line in self.read( name ) ]
+        self.assertEqual( lines, [ 'INFO record {:02d}'.format( index ) for index in range( 20 ) ] )
+        for name in names:
+            self.assertLessEqual( os.path.getsize( os.path.join( self.folder, name ) ), 100 )
+
+        return
+
+    def test_config( self ):
+        filename = os.path.join( self.folder, 'app.log' )
+        config = LoggingConfig( throw_exception = True )
+        handler = { 'class': 'logging.handlers.RotatingFileHandler', 'filename': filename }
+        config.ParseConfig( { 'version': 1, 'handlers': { 'file': handler },
+                              'root': { 'handlers': [ 'file' ] } } )
+        config.setConfig()
+        self.assertIs( type( logging.getLogger().handlers[ 0 ] ), logging.handlers.RotatingFileHandler )
+        config = LoggingConfig( throw_exception = True )
+        config.ParseConfig( { 'version': 1, 'handlers': { 'file': dict( handler, bufferSize = 8192, flushLevel = 'WARNING' ) },
+                              'root': { 'handlers': [ 'file' ] } } )
+        config.setConfig()
+        buffered = logging.getLogger().handlers[ 0 ]
+        self.assertIsInstance( buffered, BufferedRotatingFileHandler )
+        self.assertEqual( ( buffered.bufferSize, buffered.flushLevel ), ( 8192, logging.WARNING ) )
+        logging.getLogger().warning( 'written' )
+        self.assertEqual( len( self.read( 'app.log' ) ), 1 )
+        logging.config.dictConfig( { 'version': 1 } )
+        with self.assertRaises( ValueError ):
+            config.ParseConfig( { 'handlers': { 'file': dict( handler, flushLevel = 'LOUD' ) } } )
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from saiti import ConfigProcessor, ConfigProcessorList
+from saiti.pathindex import PathIndex
+from fixtures import WebConfig, SectionConfig
+
+
+class RootConfig( ConfigProcessor ):
+    def __init__( self, **kwargs ):
+        ConfigProcessor.__init__( self, 'root', **kwargs )
+        self.setWildcardObject( SectionConfig, **kwargs )
+        return
+
+
+class WebsConfig( ConfigProcessorList ):
+    def __init__( self, **kwargs ):
+        ConfigProcessorList.__init__( self, 'webs', **kwargs )
+        return
+
+    def newObject( self, name, obj ):
+        return WebConfig( name )
+
+
+class TestPathIndex( unittest.TestCase ):
+    def build( self, **kwargs ):
+        obj = RootConfig( **kwargs )
+        obj.ParseConfig( { 'common': { 'class': 'x', 'web': { 'port': 80 } },
+                           'mbertens': { 'web': { 'port': 8000, 'aliases': [ 'a' ] } } } )
+        return obj
+
+    def test_lookup( self ):
+        obj = self.build()
+        self.assertEqual( obj.getPathValue( 'common.class' ), 'x' )
+        self.assertEqual( obj.getPathValue( 'mbertens.web.port' ), 8000 )
+        self.assertEqual( obj.getPathValue( 'mbertens.web.aliases' ), [ 'a' ] )
+        self.assertIs( obj.getPathValue( 'common.web' ), obj.common.web )
+        self.assertIsNone( obj.getPathValue( 'common.unknown' ) )
+        with self.assertRaises( ValueError ):
+            self.build( throw_exception = True ).getPathValue( 'common.unknown' )
+
+        return
+
+    def test_prefix( self ):
+        obj = self.build()
+        self.assertEqual( obj.getPathValues( 'common.web' ), { 'common.web.aliases': [], 'common.web.interface': '',
+                                                               'common.web.port': 80, 'common.web.scheme': 'http' } )
+        self.assertEqual( list( obj.getPathValues( 'mbertens' ) ),
+                          [ 'mbertens.class', 'mbertens.debug', 'mbertens.web', 'mbertens.web.aliases',
+                            'mbertens.web.interface', 'mbertens.web.port', 'mbertens.web.scheme' ] )
+        self.assertEqual( obj.getPathValues( 'common.web.port' ), {} )
+        return
+
+    def test_setters_update( self ):
+        obj = self.build()
+        index = obj.getPathIndex()
+        obj.mbertens.web.port = 9000
+        self.assertEqual( obj.getPathValue( 'mbertens.web.port' ), 9000 )
+        obj.ParseConfig( { 'other': { 'web': { 'port': 1 } }, 'common': { 'web': { 'aliases': [ 'b' ] } } } )
+        self.assertEqual( obj.getPathValue( 'other.web.port' ), 1 )
+        self.assertEqual( obj.getPathValue( 'common.web.aliases' ), [ 'b' ] )
+        self.assertIs( obj.getPathIndex(), index )
+        return
+
+    def test_replace_object( self ):
+        obj = self.build()
+        obj.getPathIndex()
+        old = obj.common.web
+        obj.common.web = WebConfig()
+        obj.common.web.port = 443
+        self.assertEqual( obj.getPathValue( 'common.web.port' ), 443 )
+        old.port = 1
+        self.assertEqual( obj.getPathValue( 'common.web.port' ), 443 )
+        return
+
+    def test_list( self ):
+        webs = WebsConfig()
+        webs.ParseConfig( { 'one': { 'port': 1 } } )
+        self.assertEqual( webs.getPathValue( 'one.port' ), 1 )
+        webs.ParseConfig( { 'two': { 'port': 2 } } )
+        self.assertEqual( webs.getPathValues( 'two' ), { 'two.aliases': [], 'two.interface': '',
+                                                        'two.port': 2, 'two.scheme': 'http' } )
+        self.assertEqual( [ path for path in webs.getPathValues( '' ) if '.' not in path ], [ 'one', 'two' ] )
+        return
+
+    def test_built_on_load( self ):
+        obj = self.build( pathIndex = True )
+        index = obj._ConfigProcessor__index
+        self.assertIsInstance( index, PathIndex )
+        self.assertIs( obj.getPathIndex(), index )
+        self.assertIsNone( self.build()._ConfigProcessor__index )
+        return
+
+    def test_setter_touches_path( self ):
+        obj = self.build( pathIndex = True )
+        index = obj.getPathIndex()
+        refreshed = []
+        index.refresh = refreshed.append
+        for port in range( 10 ):
+            obj.mbertens.web.port = port
+
+        obj.common.cls = 'y'
+        self.assertEqual( refreshed, [] )
+        self.assertEqual( obj.getPathValue( 'mbertens.web.port' ), 9 )
+        self.assertEqual( obj.getPathValue( 'common.class' ), 'y' )
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
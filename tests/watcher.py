@@ -0,0 +1,159 @@
+import os
+import time
+import shutil
+import unittest
+import tempfile
+import threading
+from saiti import YamlConfigFile
+from saiti.watcher import ConfigWatcher, diffDocuments
+from fixtures import WebConfig, SectionConfig
+
+
+class AdminSectionConfig( SectionConfig ):
+    def __init__( self, name = 'common', **kwargs ):
+        SectionConfig.__init__( self, name, **kwargs )
+        self.__admin        = WebConfig( 'admin', **kwargs )
+        return
+
+    @property
+    def admin( self ) -> WebConfig:
+        return self.__admin
+
+
+class SectionsFile( YamlConfigFile ):
+    def __init__( self, filename: str, loadLater: bool = False, **kwargs ):
+        YamlConfigFile.__init__( self, filename, loadLater = True, **kwargs )
+        self.__common = AdminSectionConfig( **kwargs )
+        self.setWildcardObject( AdminSectionConfig, **kwargs )
+        if not loadLater:
+            self.Load()
+
+        return
+
+    @property
+    def common( self ) -> AdminSectionConfig:
+        return self.__common
+
+
+CONFIG = """
+common:
+  debug: false
+  web:
+    port: 8000
+  admin:
+    port: {admin}
+one:
+  web:
+    port: {one}
+two:
+  web:
+    port: 2
+"""
+
+
+class TestConfigWatcher( unittest.TestCase ):
+    def setUp( self ):
+        self.folder     = tempfile.mkdtemp()
+        self.filename   = os.path.join( self.folder, 'config.yaml' )
+        self.write( CONFIG.format( admin = 9000, one = 1 ) )
+        self.config     = SectionsFile( self.filename, throw_exception = True )
+        return
+
+    def tearDown( self ):
+        shutil.rmtree( self.folder )
+        return
+
+    def write( self, data ):
+        # write and rename like an editor does
+        with open( self.filename + '.new', 'wt' ) as stream:
+            stream.write( data )
+
+        os.replace( self.filename + '.new', self.filename )
+        return
+
+    def test_diff_documents( self ):
+        self.assertEqual( sorted( diffDocuments( { 'a': { 'b': 1, 'c': 2 } }, { 'a': { 'b': 1, 'c': 3 }, 'd': 1 } ) ),
+                          [ ( 'a', 'c' ), ( 'd', ) ] )
+        self.assertEqual( diffDocuments( { 'a': 1 }, { 'a': 1 } ), [] )
+        return
+
+    def test_reload( self ):
+        common      = self.config.common
+        web         = self.config.common.web
+        two         = self.config.two
+        watcher     = ConfigWatcher( self.config, throw_exception = True )
+        self.write( CONFIG.format( admin = 9001, one = 11 ) )
+        self.assertEqual( sorted( watcher.reload() ), [ ( 'common', 'admin', 'port' ), ( 'one', 'web', 'port' ) ] )
+        self.assertEqual( self.config.common.admin.port, 9001 )
+        self.assertEqual( self.config.one.web.port, 11 )
+        # unchanged sub-trees are shared, changed ones are new objects
+        self.assertIs( self.config.common.web, web )
+        self.assertIs( self.config.two, two )
+        self.assertIsNot( self.config.common, common )
+        # the old objects are not modified
+        self.assertEqual( common.admin.port, 9000 )
+        self.assertEqual( watcher.reload(), [] )
+        return
+
+    def test_invalid_reload( self ):
+        watcher = ConfigWatcher( self.config )
+        self.write( CONFIG.format( admin = 9001, one = 'true' ).replace( 'debug: false', 'unknown: 1' ) )
+        with self.assertRaises( ValueError ):
+            watcher.reload()
+
+        self.assertEqual( self.config.common.admin.port, 9000 )
+        self.assertEqual( self.config.one.web.port, 1 )
+        return
+
+    def test_invalid_reload_printing( self ):
+        # errors are not swapped in when the config prints them
+        self.config = SectionsFile( self.filename )
+        watcher     = ConfigWatcher( self.config )
+        self.write( CONFIG.format( admin = 9001, one = 1 ).replace( 'debug: false', 'unknown: 1' ) )
+        with self.assertRaises( ValueError ) as ctx:
+            watcher.reload()
+
+        self.assertIn( 'unknown', str( ctx.exception ) )
+        self.assertEqual( self.config.common.admin.port, 9000 )
+        return
+
+    def test_live_options( self ):
+        self.config = SectionsFile( self.filename, throw_exception = True, lazy = True, cache = True )
+        watcher     = ConfigWatcher( self.config )
+        self.write( CONFIG.format( admin = 9001, one = 1 ) )
+        watcher.reload()
+        self.assertTrue( self.config._throw_exception )
+        self.assertTrue( self.config._lazy )
+        self.assertIsNotNone( self.config.getOptions()[ 'cache' ] )
+        self.assertEqual( self.config.common.admin.port, 9001 )
+        return
+
+    def watch( self, polling ):
+        changed = threading.Event()
+        watcher = ConfigWatcher( self.config, debounce = 0.1, interval = 0.05, polling = polling,
+                                 callback = lambda config, changes: changed.set(),
+                                 throw_exception = True )
+        watcher.start()
+        try:
+            time.sleep( 0.1 )
+            self.write( CONFIG.format( admin = 9000, one = 111 ) )
+            self.assertTrue( changed.wait( 5 ) )
+
+        finally:
+            watcher.stop()
+
+        self.assertFalse( watcher.isWatching() )
+        self.assertEqual( self.config.one.web.port, 111 )
+        return
+
+    def test_watch_polling( self ):
+        self.watch( True )
+        return
+
+    def test_watch_inotify( self ):
+        self.watch( False )
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()